@@ -0,0 +1,328 @@
+"""
+Convert many Daz exports to Maya files with a pool of mayapy workers.
+
+USAGE: python batch_convert.py --mayapy <mayapy executable> [options] <export folder or glob> ...
+
+Each worker is a create_maya_file.py process in --worker mode with its own spool folder, so
+Maya starts once per worker instead of once per asset.  A job that runs past the timeout gets
+its worker killed and restarted, failed jobs are retried, and a manifest with the status,
+duration and output sizes of every job is written at the end.
+"""
+import sys
+import os
+import re
+import glob
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import subprocess
+
+from pathlib import Path
+script_dir = str(Path(__file__).parent.absolute())
+
+# seconds between two checks of the workers
+POLL_INTERVAL = 0.5
+# seconds given to a worker to exit once asked to stop
+STOP_TIMEOUT = 30
+
+
+def _log(message):
+    print("batch_convert: " + str(message))
+    sys.stdout.flush()
+
+
+def _find_export_dirs(patterns, list_file=""):
+    """
+    Export folders (folders holding a .dtu file) from folder paths, globs and a list file
+    """
+    if list_file != "":
+        with open(list_file, "r", encoding="utf-8") as file:
+            patterns = patterns + [line.strip() for line in file if line.strip() != ""]
+    export_dirs = []
+    for pattern in patterns:
+        for path in sorted(glob.glob(pattern)) or [pattern]:
+            path = os.path.abspath(path)
+            if not os.path.isdir(path):
+                _log("WARNING: skipping " + path + ", not a folder")
+            elif not glob.glob(os.path.join(path, "*.dtu")):
+                _log("WARNING: skipping " + path + ", no .dtu file")
+            elif path not in export_dirs:
+                export_dirs.append(path)
+    return export_dirs
+
+
+def _write_json(path, data):
+    # write then rename, so the worker never reads a partial file
+    temp_path = path + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as file:
+        json.dump(data, file, indent=4)
+    os.replace(temp_path, path)
+
+
+def _read_dtu(dtu_dir):
+    """
+    Contents of the .dtu file of an export folder, an empty dict if it can not be read
+    """
+    for dtu_path in sorted(glob.glob(os.path.join(dtu_dir, "*.dtu"))):
+        try:
+            with open(dtu_path, "r", encoding="utf-8") as file:
+                return json.load(file)
+        except Exception as e:
+            _log("WARNING: unable to read " + dtu_path + ": " + str(e))
+    return {}
+
+
+def _get_output_name(dtu_dir, dtu_dict):
+    """
+    Maya file name of an export: the Asset Name of the dtu, figures are all exported to FIG0
+    """
+    asset_name = str(dtu_dict.get("Asset Name", "")).strip()
+    if asset_name == "":
+        asset_name = os.path.basename(os.path.dirname(dtu_dir)) + "_" + os.path.basename(dtu_dir)
+    return re.sub(r"[^A-Za-z0-9_\-]", "_", asset_name)
+
+
+def _assign_output_paths(jobs):
+    """
+    Set the output path of every job and make them unique.  With an output folder the files are
+    named after the asset and clashing names get a number, else the dtu Output Maya Filepath is
+    used and a job writing the same file as an earlier one is failed before it runs.  Returns
+    the jobs to schedule.
+    """
+    taken_paths = set()
+    scheduled_jobs = []
+    for job in jobs:
+        dtu_dict = _read_dtu(job.dtu_dir)
+        output_folder = job.options.pop("Output Folder", "")
+        if output_folder != "":
+            output_name = _get_output_name(job.dtu_dir, dtu_dict)
+            output_path = os.path.join(output_folder, output_name + ".mb").replace("\\", "/")
+            count = 2
+            while output_path.lower() in taken_paths:
+                output_path = os.path.join(output_folder, "%s_%d.mb" % (output_name, count)).replace("\\", "/")
+                count += 1
+            if count > 2:
+                _log("WARNING: " + job.dtu_dir + " has the same asset name as another job, saving " + output_path)
+            job.options["Output Maya Filepath"] = output_path
+        else:
+            output_path = str(dtu_dict.get("Output Maya Filepath", "")).replace("\\", "/")
+            if output_path != "" and output_path.lower() in taken_paths:
+                job.status = "failed"
+                job.errors.append("output " + output_path + " is already written by another job")
+                _log("ERROR: " + job.dtu_dir + " writes the same output as another job: " + output_path)
+                continue
+        taken_paths.add(output_path.lower())
+        scheduled_jobs.append(job)
+    return scheduled_jobs
+
+
+class Job:
+    def __init__(self, index, dtu_dir, options):
+        self.index = index
+        self.dtu_dir = dtu_dir
+        self.options = options
+        self.attempts = 0
+        self.status = "pending"
+        self.duration = 0.0
+        self.outputs = {}
+        self.errors = []
+
+    def get_name(self):
+        return "%05d_%d" % (self.index, self.attempts)
+
+    def to_manifest(self):
+        return {
+            "DtuDir": self.dtu_dir,
+            "Status": self.status,
+            "Attempts": self.attempts,
+            "Duration": round(self.duration, 3),
+            "Outputs": self.outputs,
+            "Errors": self.errors,
+        }
+
+
+class Worker:
+    """
+    One mayapy process running create_maya_file.py --worker on its own spool folder
+    """
+
+    def __init__(self, worker_id, mayapy, script_path, spool_root, log_dir):
+        self.worker_id = worker_id
+        self.mayapy = mayapy
+        self.script_path = script_path
+        self.spool_dir = os.path.join(spool_root, "worker%02d" % worker_id)
+        self.log_path = os.path.join(log_dir, "worker%02d.log" % worker_id)
+        self.process = None
+        self.job = None
+        self.job_start = 0.0
+        os.makedirs(self.spool_dir, exist_ok=True)
+
+    def start(self):
+        with open(self.log_path, "a", encoding="utf-8") as log_file:
+            self.process = subprocess.Popen([self.mayapy, self.script_path, "--worker", self.spool_dir],
+                                            stdout=log_file, stderr=subprocess.STDOUT)
+        _log("worker %d started (pid %d)" % (self.worker_id, self.process.pid))
+
+    def is_alive(self):
+        return self.process is not None and self.process.poll() is None
+
+    def kill(self):
+        if self.is_alive():
+            self.process.kill()
+            self.process.wait()
+        # drop what the killed worker left behind
+        for name in os.listdir(self.spool_dir):
+            os.remove(os.path.join(self.spool_dir, name))
+
+    def submit(self, job):
+        job.attempts += 1
+        self.job = job
+        self.job_start = time.time()
+        job_data = {"DtuDir": job.dtu_dir, "Options": job.options}
+        _write_json(os.path.join(self.spool_dir, job.get_name() + ".job"), job_data)
+
+    def get_result(self):
+        """
+        The result of the running job once the worker wrote it, else None
+        """
+        result_path = os.path.join(self.spool_dir, self.job.get_name() + ".result")
+        if not os.path.exists(result_path):
+            return None
+        with open(result_path, "r", encoding="utf-8") as file:
+            result = json.load(file)
+        os.remove(result_path)
+        return result
+
+    def stop(self):
+        if not self.is_alive():
+            return
+        with open(os.path.join(self.spool_dir, "stop"), "w"):
+            pass
+        try:
+            self.process.wait(timeout=STOP_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            self.kill()
+
+
+def _finish_job(worker, job, status, error, outputs, pending, retries):
+    job.duration += time.time() - worker.job_start
+    worker.job = None
+    if status == "ok":
+        job.status = "ok"
+        job.outputs = outputs
+        _log("%s converted in %.1fs" % (job.dtu_dir, job.duration))
+        return
+    job.errors.append(error)
+    if job.attempts <= retries:
+        _log("%s %s (%s), retrying" % (job.dtu_dir, status, error))
+        pending.append(job)
+    else:
+        job.status = status
+        _log("%s %s after %d attempts (%s)" % (job.dtu_dir, status, job.attempts, error))
+
+
+def run_batch(export_dirs, mayapy, workers=4, timeout=600, retries=1, options=None,
+              script_path="", work_dir=""):
+    """
+    Convert the export folders across the workers, returns the manifest dictionary
+    """
+    if options is None:
+        options = {}
+    if script_path == "":
+        script_path = os.path.join(script_dir, "create_maya_file.py")
+    temp_root = work_dir == ""
+    if temp_root:
+        work_dir = tempfile.mkdtemp(prefix="dazToMayaBatch")
+    spool_root = os.path.join(work_dir, "spool")
+    os.makedirs(spool_root, exist_ok=True)
+
+    jobs = [Job(i, dtu_dir, dict(options)) for i, dtu_dir in enumerate(export_dirs)]
+    pending = _assign_output_paths(jobs)
+    worker_count = max(1, min(workers, len(pending)))
+    pool = [Worker(i, mayapy, script_path, spool_root, work_dir) for i in range(worker_count)]
+
+    start_time = time.time()
+    try:
+        for worker in pool:
+            worker.start()
+        while pending or any(worker.job is not None for worker in pool):
+            for worker in pool:
+                job = worker.job
+                if job is None:
+                    if pending:
+                        if not worker.is_alive():
+                            worker.kill()
+                            worker.start()
+                        worker.submit(pending.pop(0))
+                    continue
+                result = worker.get_result()
+                if result is not None:
+                    _finish_job(worker, job, result.get("Status", "failed"), result.get("Error", ""),
+                                result.get("Outputs", {}), pending, retries)
+                elif not worker.is_alive():
+                    _finish_job(worker, job, "failed", "worker exited with code " + str(worker.process.returncode),
+                                {}, pending, retries)
+                elif time.time() - worker.job_start > timeout:
+                    worker.kill()
+                    _finish_job(worker, job, "timeout", "no result after " + str(timeout) + "s", {}, pending, retries)
+            time.sleep(POLL_INTERVAL)
+    finally:
+        for worker in pool:
+            worker.stop()
+
+    manifest = {
+        "Workers": worker_count,
+        "Duration": round(time.time() - start_time, 3),
+        "Converted": len([job for job in jobs if job.status == "ok"]),
+        "Failed": len([job for job in jobs if job.status != "ok"]),
+        "Logs": work_dir,
+        "Jobs": [job.to_manifest() for job in jobs],
+    }
+    if temp_root:
+        # keep the worker logs, drop the spool folders
+        shutil.rmtree(spool_root, ignore_errors=True)
+    return manifest
+
+
+def _main(argv):
+    parser = argparse.ArgumentParser(description="Convert Daz exports to Maya files with a pool of mayapy workers.")
+    parser.add_argument("exports", nargs="*", help="export folders (holding a .dtu file) or glob patterns")
+    parser.add_argument("--list", default="", help="text file with one export folder or glob per line")
+    parser.add_argument("--mayapy", required=True, help="mayapy executable")
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count() or 1, help="number of mayapy workers")
+    parser.add_argument("--timeout", type=float, default=600, help="seconds before a job is killed, worker start up included")
+    parser.add_argument("--retries", type=int, default=1, help="retries of a failed or timed out job")
+    parser.add_argument("--output-folder", default="", help="save <asset name>.mb here instead of the dtu output path")
+    parser.add_argument("--shader-target", default="", choices=["", "arnold", "standard", "stingray"])
+    parser.add_argument("--generate-fbx", action="store_true", help="also export the final Fbx")
+    parser.add_argument("--work-folder", default="", help="folder for the spool and worker logs, a temp folder by default")
+    parser.add_argument("--manifest", default="batch_manifest.json", help="summary manifest path")
+    args = parser.parse_args(argv)
+
+    export_dirs = _find_export_dirs(args.exports, args.list)
+    if not export_dirs:
+        _log("ERROR: no export folders to convert")
+        return 1
+
+    options = {}
+    if args.output_folder != "":
+        os.makedirs(args.output_folder, exist_ok=True)
+        options["Output Folder"] = os.path.abspath(args.output_folder)
+    if args.shader_target != "":
+        options["Shader Target"] = args.shader_target
+    if args.generate_fbx:
+        options["Generate Final Fbx"] = True
+
+    _log("converting %d exports with %d workers" % (len(export_dirs), min(args.workers, len(export_dirs))))
+    manifest = run_batch(export_dirs, args.mayapy, args.workers, args.timeout, args.retries, options,
+                         work_dir=args.work_folder)
+    _write_json(args.manifest, manifest)
+    _log("%d converted, %d failed in %.1fs, manifest: %s" % (manifest["Converted"], manifest["Failed"],
+                                                           manifest["Duration"], args.manifest))
+    return 0 if manifest["Failed"] == 0 else 1
+
+
+if __name__ == '__main__':
+    sys.exit(_main(sys.argv[1:]))
@@ -9,8 +9,11 @@ except:
 
 import sys
 import os
+import json
+import time
 import tempfile
 import shutil
+import traceback
 maya_modules_path = os.path.expanduser("~/maya/modules")
 daz_to_maya_path = os.path.join(maya_modules_path, "DazToMaya").replace("\\", "/")
 
@@ -31,11 +34,14 @@ except:
 
 
 TEXTURE_ATLAS_SIZE_DEFAULT = 1024
+# seconds between two scans of the spool folder in worker mode
+WORKER_POLL_INTERVAL = 0.5
 
 g_logfile = ""
 
 def _print_usage():
-    print("\nUSAGE: mayapy.exe create_maya_file.py <fbx file>\n")
+    print("\nUSAGE: mayapy.exe create_maya_file.py <fbx file>")
+    print("       mayapy.exe create_maya_file.py --worker <spool folder>\n")
 
 def _add_to_log(message):
     if (g_logfile == ""):
@@ -47,28 +53,45 @@ def _add_to_log(message):
     with open(logfile, "a", encoding="utf-8") as file:
         file.write(str(message) + "\n")
 
-def _main(argv):
-    # try:
-    #     line = str(argv[-1])
-    # except:
-    #     _print_usage()
-    #     return
+def _prune_unused_morphs():
+    """
+    Remove zero weight blendshape targets with no driver and Morphs attributes that drive nothing
+    """
+    import blendshapes
+    import morphs
+    try:
+        removed_targets, bytes_saved = blendshapes.remove_unused_targets()
+        removed_attrs = morphs.remove_dead_morph_attrs()
+    except Exception as e:
+        _add_to_log("ERROR while pruning unused morphs: " + str(e))
+        return
+    for target in removed_targets:
+        _add_to_log("DEBUG: removed unused blendshape target: " + target)
+    for attr in removed_attrs:
+        _add_to_log("DEBUG: removed dead morph attribute: " + attr)
+    _add_to_log("Pruned " + str(len(removed_targets)) + " blendshape targets and " + str(len(removed_attrs)) +
+                " morph attributes, estimated " + str(bytes_saved) + " bytes saved")
 
-    # try:
-    #     start, stop = re.search("#([0-9]*)\.", line).span(0)
-    #     token_id = int(line[start+1:stop-1])
-    #     print(f"DEBUG: token_id={token_id}")
-    # except:
-    #     print(f"ERROR: unable to parse token_id from '{line}'")
-    #     token_id = 0
+def _initialize():
+    DazToMaya.d2m.initialize(headless=True)
+    # nobody animates the headless output, keep the HIK definition but skip the control rig
+    DazToMaya.d2m.hik_control_rig_mode = DazToMaya.d2m.HIK_RIG_SKIP
 
-    DazToMaya.d2m.initialize()
-    DazToMaya.d2m.auto_import_daz()
+def _convert(dtu_dir="", options=None):
+    """
+    Import the Daz export in dtu_dir into a new scene and save the Maya file, and the final Fbx
+    if asked.  options override the dtu settings ("Output Maya Filepath", "Generate Final Fbx",
+    "Shader Target", "Scale", "Apply Makeup").  Returns the written files, or None.
+    """
+    if options is None:
+        options = {}
+    # options come from the dtu file and the caller, never from the UI
+    import_profile = DazToMaya.d2m.ImportProfile.ImportProfile(headless=True, dtu_dir=dtu_dir)
 
     file_path = ""
     generate_final_fbx = False
     shader_target = None
-    dtu_dict = DazToMaya.d2m.global_current_dtu.get_dtu_dict()
+    dtu_dict = DazToMaya.d2m.DtuLoader.DtuLoader(import_profile.dtu_dir).get_dtu_dict()
     if "Output Maya Filepath" in dtu_dict:
         file_path = dtu_dict["Output Maya Filepath"]
     try:
@@ -77,20 +100,21 @@ def _main(argv):
     except Exception as e:
         _add_to_log("ERROR while querying values from dtu_dict")
         _add_to_log(str(e))
+    file_path = options.get("Output Maya Filepath", file_path)
+    generate_final_fbx = options.get("Generate Final Fbx", generate_final_fbx)
+    shader_target = options.get("Shader Target", shader_target)
+    import_profile.scale = options.get("Scale", import_profile.scale)
+    import_profile.apply_makeup = options.get("Apply Makeup", import_profile.apply_makeup)
 
     if shader_target:
-        import dazmaterials as dzm
-        if shader_target == "arnold":
-            _add_to_log("DEBUG: converting to arnold")
-            dzm.DazMaterials(False).convert_to_arnold()
-        elif shader_target == "standard":
-            _add_to_log("DEBUG: converting to standard")
-            dzm.DazMaterials(False).convert_to_standard_surface()
-        elif shader_target == "stingray":
-            _add_to_log("DEBUG: converting to stingray")
-            dzm.DazMaterials(False).convert_to_stingray_pbs()         
-
-    # Delete unused nodes
+        _add_to_log("DEBUG: converting to " + str(shader_target))
+        import_profile.shader_target = shader_target
+    if not DazToMaya.d2m.auto_import_daz(import_profile):
+        _add_to_log("ERROR: nothing imported from " + import_profile.dtu_dir)
+        return None
+
+    # Remove unused morph data, then delete unused nodes
+    _prune_unused_morphs()
     mel.eval('MLdeleteUnused()')
 
     # Save Textures
@@ -151,6 +175,7 @@ def _main(argv):
             cmds.file(save=True, type="mayaBinary")
         _add_to_log("Moving temp file to: " + file_path)
         shutil.move(temp_file_path, file_path)
+    output_files = [file_path]
 
     if generate_final_fbx:
         # Generate FBX
@@ -165,13 +190,129 @@ def _main(argv):
         mel.eval("FBXExportEmbeddedTextures -v true;")
         # file -force -options "" -type "FBX export" -pr -ea "C:/Users/dbui2/Documents/__Ultra_Tests/maya-phong.fbx";
         cmds.file(fbx_file_path, force=True, options="", type="FBX export", pr=True, exportAll=True)
+        output_files.append(fbx_file_path)
 
     print("Done.")
+    return output_files
+
+def _main(argv):
+    # try:
+    #     line = str(argv[-1])
+    # except:
+    #     _print_usage()
+    #     return
+
+    # try:
+    #     start, stop = re.search("#([0-9]*)\.", line).span(0)
+    #     token_id = int(line[start+1:stop-1])
+    #     print(f"DEBUG: token_id={token_id}")
+    # except:
+    #     print(f"ERROR: unable to parse token_id from '{line}'")
+    #     token_id = 0
+
+    _initialize()
+    _convert()
+
+def _write_json(path, data):
+    # write then rename, so readers never see a partial file
+    temp_path = path + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as file:
+        json.dump(data, file, indent=4)
+    os.replace(temp_path, path)
+
+def _claim_next_job(spool_dir):
+    """
+    Rename the first <name>.job file (by name) of the spool folder to <name>.running and return its path.
+    The rename is atomic, so several workers can share a spool folder.
+    """
+    job_names = sorted(name for name in os.listdir(spool_dir) if name.endswith(".job"))
+    for job_name in job_names:
+        job_path = os.path.join(spool_dir, job_name)
+        running_path = job_path[:-len(".job")] + ".running"
+        try:
+            os.rename(job_path, running_path)
+        except OSError:
+            # taken by another worker
+            continue
+        return running_path
+    return None
+
+def _run_job(running_path):
+    """
+    Run one claimed job and write <name>.result next to it.  Returns False for a stop job.
+    Job file: {"DtuDir": "...", "Options": {...}} or {"Command": "stop"}
+    """
+    job_name = os.path.basename(running_path)[:-len(".running")]
+    result_path = running_path[:-len(".running")] + ".result"
+    result = {"Job": job_name, "Status": "failed", "Outputs": {}, "Error": ""}
+    keep_running = True
+    start_time = time.time()
+    try:
+        with open(running_path, "r", encoding="utf-8") as file:
+            job = json.load(file)
+        if job.get("Command", "") == "stop":
+            result["Status"] = "stopped"
+            keep_running = False
+        else:
+            _add_to_log("Worker: starting job " + job_name)
+            DazToMaya.d2m.reset_import_state()
+            output_files = _convert(job.get("DtuDir", ""), job.get("Options", {}))
+            if output_files:
+                result["Status"] = "ok"
+                for output_file in output_files:
+                    if os.path.exists(output_file):
+                        result["Outputs"][output_file] = os.path.getsize(output_file)
+            else:
+                result["Error"] = "nothing was imported"
+    except Exception as e:
+        result["Error"] = str(e)
+        _add_to_log("ERROR: worker job " + job_name + " failed: " + str(e))
+        _add_to_log(traceback.format_exc())
+    result["Duration"] = round(time.time() - start_time, 3)
+    _write_json(result_path, result)
+    try:
+        os.remove(running_path)
+    except OSError:
+        pass
+    _add_to_log("Worker: job " + job_name + " " + result["Status"] + " in " + str(result["Duration"]) + "s")
+    return keep_running
+
+def _remove_stop_file(stop_path):
+    try:
+        os.remove(stop_path)
+    except OSError:
+        pass
+
+def _run_worker(spool_dir):
+    """
+    Long-lived conversion worker: Maya and the DazToMaya modules are initialized once, then
+    every <name>.job file dropped in spool_dir is converted in a new scene and answered with a
+    <name>.result file, until a stop job arrives or a file named "stop" is created.
+    """
+    if not os.path.exists(spool_dir):
+        os.makedirs(spool_dir)
+    stop_path = os.path.join(spool_dir, "stop")
+    # a stop file left by a previous worker of this spool folder would stop this one right away
+    _remove_stop_file(stop_path)
+    _initialize()
+    _add_to_log("Worker: waiting for jobs in " + spool_dir)
+    while not os.path.exists(stop_path):
+        running_path = _claim_next_job(spool_dir)
+        if running_path is None:
+            time.sleep(WORKER_POLL_INTERVAL)
+            continue
+        if not _run_job(running_path):
+            break
+    _remove_stop_file(stop_path)
+    _add_to_log("Worker: stopped")
 
 # Execute main()
 if __name__=='__main__':
     print("Starting script...")
     _add_to_log("Starting script... DEBUG: sys.argv=" + str(sys.argv))
-    _main(sys.argv[4:])
+    if "--worker" in sys.argv and sys.argv.index("--worker") + 1 < len(sys.argv):
+        _run_worker(sys.argv[sys.argv.index("--worker") + 1])
+    else:
+        _main(sys.argv[4:])
     print("script completed.")
     exit(0)
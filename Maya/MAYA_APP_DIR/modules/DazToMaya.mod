@@ -1,5 +1,4 @@
 + DazToMaya 1.0 ./
 MAYA_SHELF_PATH +:= ./DazToMaya/shelves
 scripts: ./DazToMaya/scripts
-icons: ./DazToMaya/icons
-MAYA_CUSTOM_TEMPLATE_PATH +:= DazToMaya/Scripts/AETemplates
\ No newline at end of file
+icons: ./DazToMaya/icons
\ No newline at end of file
@@ -11,6 +11,10 @@ if os.path.exists(testFile) == False:
 else:
     module_script_dir = os.path.dirname(testFile)
 DAZTOMAYA_MODULE_DIR = os.path.dirname(module_script_dir).replace("\\", "/")
+# Per-generation rest pose tables applied by d2m.apply_pose_preset()
+POSES_DIR = os.path.join(module_script_dir, "poses").replace("\\", "/")
+# Per-generation HumanIK definition templates applied by d2m.apply_hik_template()
+HIK_TEMPLATES_DIR = os.path.join(module_script_dir, "hik").replace("\\", "/")
 
 MAYA_VERSION = int(cmds.about(v=True))
 
@@ -39,3 +43,9 @@ else:
 
 ROOT_DIR = os.path.join(HOME_DIR, "DAZ 3D", "Bridges", "Daz To Maya")
 EXPORT_DIR = os.path.join(ROOT_DIR, "Exports").replace("\\","/")
+
+# Per-asset Attribute Editor templates are written here instead of the module folder
+AE_TEMPLATES_DIR = os.path.join(ROOT_DIR, "AETemplates").replace("\\","/")
+
+# Delta caches of morph targets that are not kept live in the scene (lazy morphs)
+MORPH_CACHE_DIR = os.path.join(ROOT_DIR, "MorphCache").replace("\\","/")
@@ -15,6 +15,7 @@ class DtuLoader:
     morph_links_dict = dict()
     joint_orientation_dict = dict()
     asset_name = ""
+    figure_root_name = ""
     fbx_path = ""
     subdivsion_level = ""
     materials_list = []
@@ -63,7 +64,7 @@ class DtuLoader:
         self.fbx_path = os.path.abspath(dtu_dict["FBX File"])
 
     def get_fbx_path(self):
-        if self.asset_name == "":
+        if self.fbx_path == "":
             self.load_fbx_path()
         return self.fbx_path
 
@@ -117,6 +118,7 @@ class DtuLoader:
         data = dtu_dict["PoseData"]
         for key in data:
             if key.startswith("Genesis"):
+                self.figure_root_name = key
                 new_key = "root"
                 data[key]["Name"] = new_key
                 data[key]["Object Type"] = "BONE"
@@ -131,6 +133,14 @@ class DtuLoader:
             self.load_pose_data_dict()
         return self.pose_data_dict
 
+    def get_figure_root_name(self):
+        """
+        Name of the Genesis root bone in PoseData, e.g. "Genesis8Female", or "" if there is none
+        """
+        if self.figure_root_name == "" and "PoseData" in self.get_dtu_dict():
+            self.get_pose_data_dict()
+        return self.figure_root_name
+
     def load_materials_list(self):
         dtu_dict = self.get_dtu_dict()
         if "Materials" in dtu_dict:
@@ -0,0 +1,136 @@
+import re
+
+# Skeleton signatures: joints that must all be present, and joints that must be absent
+SKELETON_SIGNATURES = [
+    ("Genesis9", {"hip", "pelvis",
+                  "spine1", "spine2", "spine3", "spine4",
+                  "l_thigh", "l_shin", "l_foot", "l_toes",
+                  "l_pectoral",
+                  "l_shoulder", "l_upperarm", "l_forearm", "l_hand",
+                  "l_forearmtwist1", "l_forearmtwist2"}, set()),
+    ("Genesis3_8", {"hip", "pelvis",
+                    "abdomenLower", "abdomenUpper", "chestLower", "chestUpper",
+                    "lThighBend", "lShin", "lFoot", "lToe",
+                    "lCollar", "lShldrBend", "lForearmBend", "lHand",
+                    "lForearmTwist"}, set()),
+    ("Genesis2", {"hip", "pelvis",
+                  "abdomen", "abdomen2", "chest",
+                  "lThigh", "lShin", "lFoot", "lToe",
+                  "lCollar", "lShldr", "lForeArm", "lHand"}, {"lForearmTwist"}),
+]
+
+# Figure root names, e.g. Genesis8_1Female, Genesis3Male, Genesis9
+ROOT_NAME_PATTERN = re.compile(r"Genesis(8_1|[1-9])?(Female|Male)?")
+
+# Generation -> pose preset, HIK template and material fixes
+GENERATION_FIXES = {
+    "Genesis1": {"PosePreset": "genesis1", "HikTemplate": "genesis", "MaterialFixes": []},
+    "Genesis2": {"PosePreset": "genesis2", "HikTemplate": "genesis", "MaterialFixes": []},
+    "Genesis3": {"PosePreset": "genesis3", "HikTemplate": "genesis", "MaterialFixes": []},
+    "Sentinel": {"PosePreset": "sentinel", "HikTemplate": "sentinel", "MaterialFixes": []},
+    "Genesis8": {"PosePreset": "genesis8", "HikTemplate": "genesis", "MaterialFixes": ["gen8"]},
+    "Genesis8_1": {"PosePreset": "genesis8", "HikTemplate": "genesis", "MaterialFixes": ["gen8"]},
+    "Genesis9": {"PosePreset": "genesis9", "HikTemplate": "genesis9", "MaterialFixes": ["gen8", "gen9"]},
+}
+
+
+class FigureProfile:
+    """
+    What was imported, worked out once per import from the joint set and the DTU data
+    """
+
+    generation = "Not Detected"
+    gender = ""
+    root_joint = ""
+    skeleton = ""
+    pose_preset = ""
+    hik_template = ""
+    material_fixes = []
+
+    def __init__(self, generation="Not Detected", gender="", root_joint="", skeleton=""):
+        self.generation = generation
+        self.gender = gender
+        self.root_joint = root_joint
+        self.skeleton = skeleton
+        fixes = GENERATION_FIXES.get(generation, {})
+        self.pose_preset = fixes.get("PosePreset", "")
+        self.hik_template = fixes.get("HikTemplate", "")
+        self.material_fixes = fixes.get("MaterialFixes", [])
+
+    def is_detected(self):
+        return self.generation != "Not Detected"
+
+    def is_humanoid(self):
+        """
+        True for the skeletons group_props() and auto_ik() can handle
+        """
+        return self.skeleton != ""
+
+    def __repr__(self):
+        return "FigureProfile(generation=%s, gender=%s, root_joint=%s, skeleton=%s)" % (
+            self.generation, self.gender, self.root_joint, self.skeleton)
+
+
+def match_skeleton(joint_set):
+    for skeleton, required_joints, excluded_joints in SKELETON_SIGNATURES:
+        if required_joints.issubset(joint_set) and excluded_joints.isdisjoint(joint_set):
+            return skeleton
+    return ""
+
+
+def parse_root_name(root_name):
+    """
+    Return (generation, gender) from a figure root name, generation is "" if it is not a Genesis root
+    """
+    match = ROOT_NAME_PATTERN.search(root_name)
+    if match is None:
+        return "", ""
+    version = match.group(1)
+    generation = "Genesis1" if version is None else "Genesis" + version
+    return generation, match.group(2) or ""
+
+
+def get_generation_from_joints(joints):
+    """
+    Generation from the first figure root found in joint order, as the old auto_ik name loop did
+    """
+    generation = "Not Detected"
+    root_joint = ""
+    if "Genesis" in joints:
+        generation = "Genesis1"
+        root_joint = "Genesis"
+    for joint in joints:
+        if "SENTINEL" in joint:
+            return "Sentinel", joint
+        if "Genesis" not in joint or joint == "Genesis":
+            continue
+        joint_generation, _ = parse_root_name(joint)
+        if joint_generation in ("Genesis2", "Genesis3", "Genesis8", "Genesis8_1", "Genesis9"):
+            return joint_generation, joint
+    return generation, root_joint
+
+
+def classify_figure(joints, dtu_loader=None):
+    """
+    Build the FigureProfile of the imported figure from the ordered joint list and the DTU
+    metadata (the PoseData root name) when present.
+    """
+    joint_set = set(joints)
+    skeleton = match_skeleton(joint_set)
+
+    generation, root_joint = get_generation_from_joints(joints)
+    gender = ""
+    if dtu_loader is not None:
+        try:
+            dtu_root_name = dtu_loader.get_figure_root_name()
+        except Exception:
+            dtu_root_name = ""
+        dtu_generation, gender = parse_root_name(dtu_root_name)
+        if dtu_generation != "" and generation != "Sentinel":
+            generation = dtu_generation
+            if dtu_root_name in joint_set:
+                root_joint = dtu_root_name
+    if gender == "" and root_joint != "":
+        gender = parse_root_name(root_joint)[1]
+
+    return FigureProfile(generation, gender, root_joint, skeleton)
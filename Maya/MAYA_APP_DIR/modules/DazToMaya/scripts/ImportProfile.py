@@ -0,0 +1,54 @@
+import os
+
+import Definitions
+
+# Scale menu entries -> FBXImportConvertUnitString unit
+SCALE_UNITS = {
+    "Automatic": "cm",
+    "x10 (biger)": "mm",
+    "x1 (default)": "cm",
+    "x0.1 (small)": "dm",
+    "x0.01 (smaller)": "m",
+}
+
+
+class ImportProfile:
+    """
+    Options of one Auto-Import, passed as data instead of read from the UI widgets.  A headless
+    profile also skips every window, dialog and viewport step, for mayapy runs.
+    """
+
+    headless = False
+    dtu_dir = ""
+    scale = "Automatic"
+    merge = False
+    # True or False to apply HD makeup or not, None to ask the user
+    apply_makeup = None
+    # "arnold", "standard", "stingray" or None to keep the phong materials
+    shader_target = None
+    ask_to_save = False
+
+    def __init__(self, headless=False, dtu_dir="", scale="Automatic", merge=False,
+                 apply_makeup=None, shader_target=None, ask_to_save=False):
+        self.headless = headless
+        self.dtu_dir = dtu_dir
+        if self.dtu_dir == "":
+            # Importing only first figure for now
+            self.dtu_dir = os.path.abspath(Definitions.EXPORT_DIR + "/FIG/FIG0")
+        self.scale = scale
+        self.merge = merge
+        self.apply_makeup = apply_makeup
+        if self.headless and self.apply_makeup is None:
+            self.apply_makeup = False
+        self.shader_target = shader_target
+        self.ask_to_save = ask_to_save and not headless
+
+    def get_fbx_path(self):
+        return os.path.join(self.dtu_dir, "B_FIG.fbx")
+
+    def get_scale_unit(self):
+        return SCALE_UNITS.get(self.scale, "cm")
+
+    def __repr__(self):
+        return "ImportProfile(headless=%s, dtu_dir=%s, scale=%s, merge=%s, apply_makeup=%s, shader_target=%s)" % (
+            self.headless, self.dtu_dir, self.scale, self.merge, self.apply_makeup, self.shader_target)
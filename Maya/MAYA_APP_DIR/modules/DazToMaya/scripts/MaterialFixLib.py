@@ -0,0 +1,96 @@
+import re
+
+# Material fix rules: renderer -> fix set -> rules, applied in order (later edits win).
+#   "Pattern": regular expression searched in the node name
+#   "Type": node type to match, "" for any material
+#   "Input": optional, edit the node connected into this attribute instead (e.g. a file texture)
+#   "Disconnect": optional, attributes whose incoming connection is broken before the edits
+#   "DisconnectSource": optional, only break connections from nodes of this "Type" whose name
+#       matches this "Pattern"
+#   "Edits": attribute -> value, lists are set as double3
+moisture_edits = {
+    "transparency": [1, 1, 1],
+    "specularColor": [0.279221, 0.279221, 0.279221],
+    "cosinePower": 91.727273,
+    "color": [1, 1, 1],
+}
+
+cornea_edits = {
+    "cosinePower": 64.36364,
+    "specularColor": [0.75974, 0.75974, 0.75974],
+    "transparency": [1, 1, 1],
+}
+
+lash_texture_edits = {
+    "alphaGain": 1.7,
+    "invert": 0,
+    "alphaIsLuminance": 0,
+}
+
+material_fix_rules = {
+    "phong": {
+        "lashes": [
+            {"Pattern": "lash", "Type": "phong", "Disconnect": ["color"],
+             "Edits": {"color": [0.051, 0.051, 0.051]}},
+            {"Pattern": "^Eyelashes$", "Type": "phong", "Disconnect": ["color"],
+             "Edits": {"color": [0, 0, 0]}},
+        ],
+        "gen8": [
+            {"Pattern": "^EyeMoisture$", "Type": "", "Edits": moisture_edits},
+            {"Pattern": "^Tear$", "Type": "", "Input": "transparency", "Edits": {"alphaGain": 0.25}},
+            {"Pattern": "^Cornea$", "Type": "", "Edits": cornea_edits},
+        ],
+        "gen9": [
+            {"Pattern": "^EyeMoisture_(Left|Right)$", "Type": "", "Edits": moisture_edits},
+        ],
+        # every phong, eye materials included: the gen8 fix run after the import sets the
+        # Cornea specular again
+        "transparency": [
+            {"Pattern": "", "Type": "phong",
+             "Edits": {"specularColor": [0, 0, 0], "reflectivity": 0}},
+        ],
+        "extras": [
+            {"Pattern": "^Scalp$", "Type": "",
+             "Edits": {"cosinePower": 2, "specularColor": [0, 0, 0], "reflectivity": 0}},
+            {"Pattern": "^SummerLash_1006$", "Type": "file",
+             "Edits": {"alphaGain": 1.5, "invert": 0, "alphaIsLuminance": 0}},
+            {"Pattern": "^ncl1$", "Type": "",
+             "Edits": {"transparency": [0.993007, 0.993007, 0.993007], "cosinePower": 44.48951,
+                       "specularColor": [0.013986, 0.013986, 0.013986]}},
+        ],
+    },
+    "vray": {
+        "eyes": [
+            {"Pattern": "^EyeMoisture$", "Type": "", "Disconnect": ["transparency"], "Edits": moisture_edits},
+            {"Pattern": "^Cornea$", "Type": "", "Edits": cornea_edits},
+            {"Pattern": "lashes|Lash", "Type": "file", "Edits": lash_texture_edits},
+        ],
+    },
+    "arnold": {
+        "eyes": [
+            {"Pattern": "", "Type": "aiStandard",
+             "Edits": {"Ks": 0.045, "KsColor": [0.077, 0.077, 0.077]}},
+            {"Pattern": "lashes|Lashes", "Type": "aiStandard", "Disconnect": ["color"],
+             "DisconnectSource": {"Type": "file", "Pattern": "Lashes|lash"}, "Edits": {}},
+            {"Pattern": "Cornea", "Type": "aiStandard",
+             "Edits": {"KtColor": [1, 1, 1], "opacity": [0.0324675, 0.0324675, 0.0324675],
+                       "specularRoughness": 0.00649351}},
+            {"Pattern": "Reflection", "Type": "aiStandard",
+             "Edits": {"color": [0, 0, 0], "opacity": [0.0779221, 0.0779221, 0.0779221],
+                       "specularRoughness": 0.0324675, "Ks": 0.746753}},
+            {"Pattern": "Moisture|EyeLights|Tear", "Type": "aiStandard",
+             "Edits": {"opacity": [0, 0, 0]}},
+        ],
+    },
+}
+
+# (renderer, fix set) -> [(compiled pattern, rule)]
+compiled_rules = {}
+
+
+def get_compiled_rules(renderer, fix_name):
+    key = (renderer, fix_name)
+    if key not in compiled_rules:
+        rules = material_fix_rules.get(renderer, {}).get(fix_name, [])
+        compiled_rules[key] = [(re.compile(rule["Pattern"]), rule) for rule in rules]
+    return compiled_rules[key]
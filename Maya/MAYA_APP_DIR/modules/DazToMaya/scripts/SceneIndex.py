@@ -0,0 +1,73 @@
+import maya.cmds as cmds
+
+
+class SceneIndex:
+    """
+    Snapshot of the scene names and types, built once and shared by the import fixes instead of
+    running a full scene ls in each of them.  Operations that add, delete or rename nodes must
+    call d2m.invalidate_scene_index() so the next query rebuilds it.
+    """
+
+    node_types = dict()
+    joints = []
+    joint_set = set()
+    materials = set()
+    shape_transforms = dict()
+    cache = dict()
+
+    def __init__(self):
+        self.build()
+
+    def build(self):
+        nodes_and_types = cmds.ls(showType=True) or []
+        # names are in ls order, dicts keep insertion order
+        self.node_types = dict(zip(nodes_and_types[0::2], nodes_and_types[1::2]))
+        self.joints = cmds.ls(type="joint") or []
+        self.joint_set = set(self.joints)
+        self.materials = set(cmds.ls(materials=True) or [])
+        self.shape_transforms = dict()
+        for shape in cmds.ls(shapes=True, long=True) or []:
+            self.shape_transforms[shape] = shape.rsplit("|", 1)[0]
+        # results derived from the index by other stages, dropped with it
+        self.cache = dict()
+
+    def get_nodes(self):
+        return list(self.node_types.keys())
+
+    def get_nodes_of_type(self, node_type):
+        return [node for node, node_t in self.node_types.items() if node_t == node_type]
+
+    def get_type(self, node):
+        return self.node_types.get(node, None)
+
+    def has_node(self, node):
+        return node in self.node_types
+
+    def get_joints(self):
+        return self.joints
+
+    def has_joint(self, joint):
+        return joint in self.joint_set
+
+    def has_joints(self, joints):
+        return self.joint_set.issuperset(joints)
+
+    def get_materials(self):
+        return self.materials
+
+    def get_transform(self, shape_long_name):
+        return self.shape_transforms.get(shape_long_name, None)
+
+    def get_long_names(self):
+        if "long_names" not in self.cache:
+            self.cache["long_names"] = cmds.ls(long=True) or []
+        return self.cache["long_names"]
+
+    def get_dag_nodes(self):
+        """
+        (long name, type) of every DAG node, parents before children
+        """
+        if "dag_nodes" not in self.cache:
+            names_and_types = cmds.ls(long=True, dag=True, showType=True) or []
+            self.cache["dag_nodes"] = list(zip(names_and_types[0::2], names_and_types[1::2]))
+        return self.cache["dag_nodes"]
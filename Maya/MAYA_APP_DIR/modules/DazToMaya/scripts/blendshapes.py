@@ -0,0 +1,480 @@
+import os
+import json
+import hashlib
+
+import maya.cmds as cmds
+import maya.mel as mel
+import maya.api.OpenMaya as om2
+
+import Definitions
+
+try:
+    import numpy as np
+except Exception as e:
+    print("DazToMaya WARNING: numpy could not be loaded, blendshape delta tools are disabled: " + str(e))
+    np = None
+
+# inputTargetItem index of a target at full weight (5000 + 1000 * weight)
+TARGET_ITEM_INDEX = 6000
+
+# Deltas shorter than this (in scene units) are dropped by prune_sparse_targets()
+prune_tolerance = 0.0001
+
+
+def has_numpy(feature_name):
+    """
+    Check numpy is available, printing an error for the calling feature if it is not
+    """
+    if np is None:
+        print("DazToMaya ERROR: " + feature_name + " requires numpy, which is not available in this Maya installation.")
+        return False
+    return True
+
+
+def get_plug(attr_name):
+    """
+    Get an MPlug from a node.attribute string
+    """
+    selection = om2.MSelectionList()
+    selection.add(attr_name)
+    return selection.getPlug(0)
+
+
+def get_target_item_attr(blendshape, target_index, geometry_index=0):
+    return "%s.inputTarget[%d].inputTargetGroup[%d].inputTargetItem[%d]" % (blendshape, geometry_index, target_index, TARGET_ITEM_INDEX)
+
+
+def get_target_aliases(blendshape):
+    """
+    Return a dict of target index -> target alias for a blendShape node
+    """
+    aliases = {}
+    alias_list = cmds.aliasAttr(blendshape, query=True)
+    if alias_list is None:
+        return aliases
+    for i in range(0, len(alias_list), 2):
+        weight_attr = alias_list[i + 1]
+        if weight_attr.startswith("weight["):
+            aliases[int(weight_attr[len("weight["):-1])] = alias_list[i]
+    return aliases
+
+
+def get_base_mesh(blendshape, geometry_index=0):
+    """
+    Return the deformed mesh shape of a blendShape node
+    """
+    geometry = cmds.blendShape(blendshape, query=True, geometry=True)
+    if geometry is None or len(geometry) <= geometry_index:
+        return None
+    return geometry[geometry_index]
+
+
+def get_next_target_index(blendshape):
+    indices = cmds.getAttr(blendshape + ".weight", multiIndices=True)
+    if not indices:
+        return 0
+    return max(indices) + 1
+
+
+def read_target_deltas(blendshape, target_index, geometry_index=0):
+    """
+    Read the stored deltas of a blendShape target in bulk.
+    Returns (vertex indices as int array, deltas as float array of shape (n, 3)).
+    """
+    item_attr = get_target_item_attr(blendshape, target_index, geometry_index)
+
+    vertex_indices = np.zeros(0, dtype=np.int32)
+    components_obj = get_plug(item_attr + ".inputComponentsTarget").asMObject()
+    if not components_obj.isNull():
+        component_list = om2.MFnComponentListData(components_obj)
+        index_arrays = [np.array(om2.MFnSingleIndexedComponent(component_list.get(i)).getElements(), dtype=np.int32)
+                        for i in range(component_list.length())]
+        if index_arrays:
+            vertex_indices = np.concatenate(index_arrays)
+
+    deltas = np.zeros((0, 3), dtype=np.float32)
+    points_obj = get_plug(item_attr + ".inputPointsTarget").asMObject()
+    if not points_obj.isNull():
+        # MPoints convert to rows of x, y, z, w
+        deltas = np.array(om2.MFnPointArrayData(points_obj).array(), dtype=np.float32).reshape(-1, 4)[:, :3]
+
+    if len(vertex_indices) != len(deltas):
+        # no component list means the points are stored for every vertex
+        vertex_indices = np.arange(len(deltas), dtype=np.int32)
+
+    return vertex_indices, np.ascontiguousarray(deltas)
+
+
+def get_index_runs(indices):
+    """
+    Split sorted indices into arrays of consecutive indices
+    """
+    indices = np.asarray(indices)
+    if len(indices) == 0:
+        return []
+    return np.split(indices, np.flatnonzero(np.diff(indices) != 1) + 1)
+
+
+def write_target_deltas_undoable(item_attr, vertex_indices, deltas):
+    """
+    Same as write_target_deltas(), with setAttr so the edit goes to the undo queue
+    """
+    order = np.argsort(vertex_indices, kind="stable")
+    vertex_indices = np.asarray(vertex_indices)[order]
+    deltas = np.asarray(deltas).reshape(-1, 3)[order]
+    components = ['"vtx[%d:%d]"' % (run[0], run[-1]) for run in get_index_runs(vertex_indices)]
+    points = np.hstack([deltas, np.ones((len(deltas), 1))])
+    mel.eval('setAttr "%s.inputComponentsTarget" -type "componentList" %d %s;\n'
+             'setAttr "%s.inputPointsTarget" -type "pointArray" %d %s;'
+             % (item_attr, len(components), " ".join(components),
+                item_attr, len(points), " ".join(repr(float(v)) for v in points.ravel())))
+
+
+def write_target_deltas(blendshape, target_index, vertex_indices, deltas, geometry_index=0):
+    """
+    Write sparse deltas to a blendShape target as inputPointsTarget/inputComponentsTarget.  The
+    plugs are set directly through OpenMaya when the undo queue is off (headless imports), else
+    with setAttr so the edit can be undone.
+    """
+    item_attr = get_target_item_attr(blendshape, target_index, geometry_index)
+    if cmds.undoInfo(query=True, state=True):
+        write_target_deltas_undoable(item_attr, vertex_indices, deltas)
+        return
+
+    component_fn = om2.MFnSingleIndexedComponent()
+    component_obj = component_fn.create(om2.MFn.kMeshVertComponent)
+    component_fn.addElements(np.asarray(vertex_indices, dtype=np.int32).tolist())
+    component_list = om2.MFnComponentListData()
+    component_list_obj = component_list.create()
+    component_list.add(component_obj)
+
+    deltas = np.asarray(deltas, dtype=np.float64).reshape(-1, 3)
+    points = om2.MPointArray(np.hstack([deltas, np.ones((len(deltas), 1))]).tolist())
+    points_obj = om2.MFnPointArrayData().create(points)
+
+    # set the components first, the points are matched to them by order
+    get_plug(item_attr + ".inputComponentsTarget").setMObject(component_list_obj)
+    get_plug(item_attr + ".inputPointsTarget").setMObject(points_obj)
+
+
+def add_target(blendshape, target_name, vertex_indices, deltas, geometry_index=0):
+    """
+    Add a new target to a blendShape node from stored deltas, without a target mesh.
+    Returns the new target index.
+    """
+    target_index = get_next_target_index(blendshape)
+    cmds.setAttr("%s.weight[%d]" % (blendshape, target_index), 0)
+    cmds.aliasAttr(target_name, "%s.weight[%d]" % (blendshape, target_index))
+    write_target_deltas(blendshape, target_index, vertex_indices, deltas, geometry_index)
+    return target_index
+
+
+def remove_target(blendshape, target_index):
+    """
+    Remove a target, its weight and its alias from a blendShape node
+    """
+    aliases = get_target_aliases(blendshape)
+    if target_index in aliases:
+        cmds.aliasAttr(blendshape + "." + aliases[target_index], remove=True)
+    geometry_indices = cmds.getAttr(blendshape + ".inputTarget", multiIndices=True) or [0]
+    for geometry_index in geometry_indices:
+        target_group = "%s.inputTarget[%d].inputTargetGroup[%d]" % (blendshape, geometry_index, target_index)
+        if cmds.objExists(target_group):
+            cmds.removeMultiInstance(target_group, b=True)
+    cmds.removeMultiInstance("%s.weight[%d]" % (blendshape, target_index), b=True)
+
+
+def get_file_hash(file_path):
+    """
+    md5 of a file, read in chunks so large Fbx files do not have to fit in memory
+    """
+    file_hash = hashlib.md5()
+    with open(file_path, "rb") as data:
+        for chunk in iter(lambda: data.read(1024 * 1024), b""):
+            file_hash.update(chunk)
+    return file_hash.hexdigest()
+
+
+def get_delta_key(mesh_name, target_name):
+    return mesh_name + "|" + target_name
+
+
+def save_delta_cache(cache_path, delta_dict, metadata=None):
+    """
+    Save a dict of delta key -> (vertex indices, deltas) to a .npz file, with optional json metadata
+    """
+    arrays = {}
+    if metadata is not None:
+        arrays["__metadata__"] = np.array(json.dumps(metadata))
+    for key, (vertex_indices, deltas) in delta_dict.items():
+        arrays[key + "|indices"] = np.asarray(vertex_indices, dtype=np.int32)
+        arrays[key + "|deltas"] = np.asarray(deltas, dtype=np.float32)
+    cache_dir = os.path.dirname(cache_path)
+    if cache_dir != "" and not os.path.exists(cache_dir):
+        os.makedirs(cache_dir)
+    with open(cache_path, "wb") as cache_file:
+        np.savez(cache_file, **arrays)
+
+
+def load_delta_cache(cache_path):
+    """
+    Load a .npz delta cache saved by save_delta_cache(), returns a dict of delta key -> (vertex indices, deltas)
+    """
+    delta_dict = {}
+    with np.load(cache_path) as arrays:
+        for array_name in arrays.files:
+            if array_name.endswith("|indices"):
+                key = array_name[:-len("|indices")]
+                delta_dict[key] = (arrays[array_name], arrays[key + "|deltas"])
+    return delta_dict
+
+
+def load_delta_cache_metadata(cache_path):
+    with np.load(cache_path) as arrays:
+        if "__metadata__" not in arrays.files:
+            return None
+        return json.loads(str(arrays["__metadata__"]))
+
+
+def has_target_geometry(blendshape, target_index, geometry_index=0):
+    """
+    True if the target is driven by a live target mesh, its stored deltas are then recomputed by Maya
+    """
+    item_attr = get_target_item_attr(blendshape, target_index, geometry_index)
+    return cmds.listConnections(item_attr + ".inputGeomTarget", source=True, destination=False) is not None
+
+
+def prune_target_deltas(blendshape, tolerance=0.0001):
+    """
+    Drop the deltas shorter than the tolerance from every target of a blendShape node and
+    remove the targets that are entirely zero.  Returns (pruned target count, removed target names).
+    """
+    pruned_count = 0
+    removed_targets = []
+    for target_index, target_name in get_target_aliases(blendshape).items():
+        if has_target_geometry(blendshape, target_index):
+            continue
+        vertex_indices, deltas = read_target_deltas(blendshape, target_index)
+        keep = np.einsum("ij,ij->i", deltas, deltas) > tolerance * tolerance
+        if not keep.any():
+            remove_target(blendshape, target_index)
+            removed_targets.append(target_name)
+        elif not keep.all():
+            write_target_deltas(blendshape, target_index, vertex_indices[keep], deltas[keep])
+            pruned_count += 1
+    return pruned_count, removed_targets
+
+
+def get_target_size(blendshape, target_index, geometry_index=0):
+    """
+    Estimated stored size in bytes of a target: a float3 point plus a component index per delta
+    """
+    item_attr = get_target_item_attr(blendshape, target_index, geometry_index)
+    points_obj = get_plug(item_attr + ".inputPointsTarget").asMObject()
+    if points_obj.isNull():
+        return 0
+    return om2.MFnPointArrayData(points_obj).length() * (3 * 8 + 4)
+
+
+def remove_unused_targets():
+    """
+    Remove the targets that have zero weight and nothing driving their weight.
+    Returns (list of removed blendShape.target names, estimated bytes saved).
+    """
+    removed_targets = []
+    bytes_saved = 0
+    for blendshape in cmds.ls(type="blendShape"):
+        for target_index, target_name in get_target_aliases(blendshape).items():
+            weight_attr = "%s.weight[%d]" % (blendshape, target_index)
+            if cmds.getAttr(weight_attr) != 0:
+                continue
+            if cmds.listConnections(weight_attr, source=True, destination=False) is not None:
+                continue
+            bytes_saved += get_target_size(blendshape, target_index)
+            remove_target(blendshape, target_index)
+            removed_targets.append(blendshape + "." + target_name)
+    return removed_targets, bytes_saved
+
+
+def prune_sparse_targets(tolerance=None):
+    """
+    Rewrite the dense per-vertex targets coming from Fbx as sparse targets on every blendShape node
+    """
+    if not has_numpy("Blendshape delta pruning"):
+        return
+    if tolerance is None:
+        tolerance = prune_tolerance
+    pruned_count = 0
+    removed_count = 0
+    for blendshape in cmds.ls(type="blendShape"):
+        pruned, removed_targets = prune_target_deltas(blendshape, tolerance)
+        pruned_count += pruned
+        removed_count += len(removed_targets)
+        for target_name in removed_targets:
+            print("DazToMaya: removed empty target " + blendshape + "." + target_name)
+    print("DazToMaya: " + str(pruned_count) + " blendshape targets made sparse, " + str(removed_count) + " empty targets removed.")
+
+
+def get_mesh_fn(mesh_name):
+    selection = om2.MSelectionList()
+    selection.add(mesh_name)
+    return om2.MFnMesh(selection.getDagPath(0))
+
+
+def get_original_mesh(blendshape, geometry_index=0):
+    """
+    Return the intermediate (Orig) shape feeding a blendShape node, this holds the undeformed points
+    """
+    mesh = get_base_mesh(blendshape, geometry_index)
+    if mesh is None:
+        return None
+    original = cmds.deformableShape(mesh, originalGeometry=True)
+    if not original or original[0] == "":
+        return mesh
+    return original[0].split(".")[0]
+
+
+def get_mesh_points(mesh_name, space=om2.MSpace.kObject):
+    """
+    Points of a mesh as a float array of shape (n, 3), object space unless another MSpace is given
+    """
+    points = get_mesh_fn(mesh_name).getPoints(space)
+    return np.array(points, dtype=np.float64).reshape(-1, 4)[:, :3].copy()
+
+
+def get_point_tweaks(mesh_name, point_count):
+    """
+    The .pnts tweaks of a mesh as a float array of shape (point_count, 3)
+    """
+    tweaks = np.zeros((point_count, 3), dtype=np.float64)
+    plug = get_plug(mesh_name + ".pnts")
+    for i in range(plug.numElements()):
+        element = plug.elementByPhysicalIndex(i)
+        if element.logicalIndex() < point_count:
+            tweaks[element.logicalIndex()] = [element.child(j).asFloat() for j in range(3)]
+    return tweaks
+
+
+def set_mesh_points(mesh_name, points):
+    """
+    Move the points of a mesh to the given object space positions through its .pnts tweaks, so
+    the edit is undoable.  Only the moved points are written, one setAttr per run of
+    consecutive vertices, all in one mel call.
+    """
+    current = get_mesh_points(mesh_name)
+    offsets = np.asarray(points, dtype=np.float64) - current
+    moved = np.flatnonzero(np.abs(offsets).max(axis=1) > 0)
+    if len(moved) == 0:
+        return
+    tweaks = get_point_tweaks(mesh_name, len(current)) + offsets
+    set_attr_cmds = []
+    for run in get_index_runs(moved):
+        values = " ".join(repr(float(v)) for v in tweaks[run].ravel())
+        set_attr_cmds.append('setAttr "%s.pnts[%d:%d]" -type "float3" %s;' % (mesh_name, run[0], run[-1], values))
+    mel.eval("\n".join(set_attr_cmds))
+
+
+def is_jcm_target(blendshape, target_index):
+    """
+    True if the target weight is driven by a joint (through the setRange node made by morphs.create_autojcm_node)
+    """
+    sources = cmds.listConnections("%s.weight[%d]" % (blendshape, target_index), source=True, destination=False, skipConversionNodes=True)
+    if sources is None:
+        return False
+    return any(cmds.nodeType(source) == "setRange" for source in sources)
+
+
+def get_sidecar_path(fbx_path):
+    """
+    Morph delta sidecar of an Fbx file, keyed by the file hash so a re-export gets a new sidecar
+    """
+    fbx_name = os.path.splitext(os.path.basename(fbx_path))[0]
+    return Definitions.MORPH_CACHE_DIR + "/" + fbx_name + "_" + get_file_hash(fbx_path) + ".sidecar.npz"
+
+
+def get_imported_root(long_name, root_nodes):
+    """
+    Imported top level node holding a DAG node, or None
+    """
+    for root in root_nodes:
+        if long_name.startswith(root + "|"):
+            return root
+    return None
+
+
+def resolve_imported_mesh(entry, root_nodes):
+    """
+    Long name of the mesh of a sidecar entry under the imported top level nodes, or None.  The
+    root saved in the entry wins, else the only root holding the relative path is used.
+    """
+    candidates = [root + entry["Mesh"] for root in root_nodes if cmds.objExists(root + entry["Mesh"])]
+    for candidate in candidates:
+        if candidate.split("|")[1] == entry["Root"]:
+            return candidate
+    if len(candidates) == 1:
+        return candidates[0]
+    return None
+
+
+def save_sidecar(sidecar_path, blendshape_nodes, root_nodes, tolerance=None):
+    """
+    Save the given blendShape nodes (the ones of one Fbx import), with their targets in index
+    order, to a sidecar file.  Meshes are recorded relative to the imported top level node
+    holding them, so the sidecar still matches when the import gets renamed (merge suffixes,
+    scene_renamer).  Deltas shorter than the tolerance are not stored.
+    """
+    if tolerance is None:
+        tolerance = prune_tolerance
+    metadata = []
+    delta_dict = {}
+    for blendshape in blendshape_nodes:
+        mesh = get_base_mesh(blendshape)
+        if mesh is None:
+            continue
+        mesh = cmds.ls(mesh, long=True)[0]
+        root = get_imported_root(mesh, root_nodes)
+        if root is None:
+            continue
+        relative_mesh = mesh[len(root):]
+        aliases = get_target_aliases(blendshape)
+        target_names = [aliases[target_index] for target_index in sorted(aliases.keys())]
+        for target_index in sorted(aliases.keys()):
+            vertex_indices, deltas = read_target_deltas(blendshape, target_index)
+            keep = np.einsum("ij,ij->i", deltas, deltas) > tolerance * tolerance
+            delta_dict[get_delta_key(relative_mesh, aliases[target_index])] = (vertex_indices[keep], deltas[keep])
+        metadata.append({"BlendShape": blendshape, "Root": root.split("|")[-1], "Mesh": relative_mesh,
+                         "Targets": target_names})
+    save_delta_cache(sidecar_path, delta_dict, metadata)
+    print("DazToMaya: saved " + str(len(delta_dict)) + " morph targets to " + sidecar_path)
+
+
+def load_sidecar(sidecar_path, root_nodes):
+    """
+    Re-create the blendShape nodes and targets saved by save_sidecar() on the meshes of the
+    given imported top level nodes, imported without shapes.  Nothing is created if any mesh of
+    the sidecar can not be found: the sidecar is removed and False returned.
+    """
+    metadata = load_delta_cache_metadata(sidecar_path)
+    if metadata is None or any("Root" not in entry for entry in metadata):
+        print("DazToMaya ERROR: " + sidecar_path + " is not a morph sidecar file")
+        return False
+
+    meshes = []
+    for entry in metadata:
+        mesh = resolve_imported_mesh(entry, root_nodes)
+        if mesh is None:
+            print("DazToMaya ERROR: mesh " + entry["Root"] + entry["Mesh"] + " from morph sidecar not found in the import, removing " + sidecar_path)
+            os.remove(sidecar_path)
+            return False
+        meshes.append(mesh)
+
+    delta_dict = load_delta_cache(sidecar_path)
+    target_count = 0
+    for entry, mesh in zip(metadata, meshes):
+        blendshape = cmds.blendShape(mesh, name=entry["BlendShape"], frontOfChain=True)[0]
+        for target_name in entry["Targets"]:
+            vertex_indices, deltas = delta_dict[get_delta_key(entry["Mesh"], target_name)]
+            add_target(blendshape, target_name, vertex_indices, deltas)
+            target_count += 1
+    print("DazToMaya: loaded " + str(target_count) + " morph targets from " + sidecar_path)
+    return True
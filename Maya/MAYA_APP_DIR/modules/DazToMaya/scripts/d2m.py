@@ -21,13 +21,17 @@ DZBRIDGE_VERSION_STRING = "v%s.%s.%s.%s" % (DZBRIDGE_VERSION_MAJOR, DZBRIDGE_VER
 ##
 import sys
 import os
+import re
+import json
 import math
 import traceback
 import webbrowser
 import importlib
+import contextlib
 
 import maya.mel as mel
 import maya.cmds as cmds
+import maya.api.OpenMaya as om2
 
 try:
     import pymel.core as pm
@@ -53,6 +57,12 @@ from shutil import copyfile
 import Definitions
 import DtuLoader
 import morphs
+import blendshapes
+import tpose
+import SceneIndex
+import FigureProfile
+import ImportProfile
+import MaterialFixLib
 import dazmaterials as dzm
 import TextureLib
 
@@ -60,12 +70,24 @@ if Definitions.MAYA_VERSION > 2020:
     import importlib
     importlib.reload(Definitions)
     importlib.reload(DtuLoader)
+    importlib.reload(blendshapes)
+    importlib.reload(tpose)
+    importlib.reload(SceneIndex)
+    importlib.reload(FigureProfile)
+    importlib.reload(ImportProfile)
+    importlib.reload(MaterialFixLib)
     importlib.reload(morphs)
     importlib.reload(dzm)
     importlib.reload(TextureLib)
 else:
     reload(Definitions)
     reload(DtuLoader)
+    reload(blendshapes)
+    reload(tpose)
+    reload(SceneIndex)
+    reload(FigureProfile)
+    reload(ImportProfile)
+    reload(MaterialFixLib)
     reload(morphs)
     reload(dzm)
     reload(TextureLib)
@@ -107,6 +129,44 @@ figure = ""
 check_box_save = 0
 check_box_merge = 0
 check_box_keep_phong = 0
+# Cache morph deltas in MorphCache so re-imports of the same Fbx skip the shape channels
+use_morph_sidecar = False
+# pose name -> pose table loaded from the poses folder
+pose_preset_cache = {}
+# template name -> HumanIK definition template loaded from the hik folder
+hik_template_cache = {}
+# HumanIK control rig: created at import, the first time the HIK panel is shown, or never.
+# The HIK definition is always created.
+HIK_RIG_CREATE = "Create"
+HIK_RIG_ON_DEMAND = "On Demand"
+HIK_RIG_SKIP = "Skip"
+hik_control_rig_mode = HIK_RIG_CREATE
+hik_dock_control_name = "hikCharacterControlsDock"
+# bool attribute of the HIK characters waiting for their control rig until the HIK panel is shown
+# (HIK_RIG_ON_DEMAND), saved with the scene so merged imports and reopened files keep it
+HIK_PENDING_RIG_ATTR = "dazToMayaPendingControlRig"
+# Joint rotation limits: cleared, set from the DTU LimitData, or kept as imported
+JOINT_LIMITS_CLEAR = "Clear"
+JOINT_LIMITS_DTU = "From Daz"
+JOINT_LIMITS_KEEP = "Keep"
+# Maya rotate orders, the DTU LimitData rotation orders are mapped to these
+ROTATE_ORDERS = ("xyz", "yzx", "zxy", "xzy", "yxz", "zyx")
+ROTATE_ATTRS = ("rotateX", "rotateY", "rotateZ")
+# degrees under which a pose value is taken as already set
+POSE_TOLERANCE = 1e-6
+joint_limits_policy = JOINT_LIMITS_CLEAR
+# T-pose figures from the DTU HeadTailData and JointOrientation, the pose presets are then only
+# the fallback for exports without the data.  Off until the result is checked against the
+# presets on Genesis 3, 8 and 9.
+use_dtu_rest_pose = False
+# Run Auto-Import with the viewport, autosave and evaluation manager suspended, as one undo step
+use_fast_import = True
+# shared SceneIndex, see get_scene_index()
+scene_index = None
+# FigureProfile of the current import, see get_figure_profile()
+figure_profile = None
+# ImportProfile of the running Auto-Import, see get_import_profile()
+import_profile = None
 cfg_settings = ""
 window_daz_main = ""
 window_name = "DazToMayaMain12225"
@@ -114,98 +174,178 @@ ask_to_save_window_name = "AskToSaveWindow5"
 
 global_current_dtu = None
 
-def config_ask_to_save(value):
-    with open(txtConf, 'wt') as output:
-        output.write('askToSaveSceneWithTextures=' + str(value))
+def get_scene_index():
+    """
+    Return the shared scene index, building it on first use.  It is only rebuilt after
+    invalidate_scene_index(), scene edits made elsewhere do not refresh it.
+    """
+    global scene_index
+    if scene_index is None:
+        scene_index = SceneIndex.SceneIndex()
+    return scene_index
 
 
-# ------------ VRAY FIXES-----------------------------
-def vray_eye_fix():
-    try:
-        mel.eval('setAttr "EyeMoisture.transparency" -type double3 1 1 1')
-    except:
-        pass
-    try:
-        mel.eval(
-            'setAttr "EyeMoisture.specularColor" -type double3 0.279221 0.279221 0.279221')
-    except:
-        pass
-    try:
-        mel.eval('setAttr "EyeMoisture.cosinePower" 91.727273')
-    except:
-        pass
-    try:
-        mel.eval('setAttr "EyeMoisture.color" -type double3 1 1 1')
-    except:
-        pass
-    try:
-        mel.eval('setAttr "Cornea.cosinePower" 64.36364')
-    except:
-        pass
-    try:
-        mel.eval(
-            'setAttr "Cornea.specularColor" -type double3 0.75974 0.75974 0.75974')
-    except:
-        pass
-    try:
-        mel.eval('setAttr "Cornea.transparency" -type double3 1 1 1')
-    except:
-        pass
+def invalidate_scene_index():
+    """
+    Call after adding, deleting or renaming nodes
+    """
+    global scene_index
+    scene_index = None
 
 
-def vray_eyelashes_fix():
-    caca = cmds.ls()
-    for m in caca:
-        if "lashes" in m:
-            try:
-                cmds.setAttr(m + ".alphaGain", 1.7)
-                cmds.setAttr(m + ".invert", 0)
-                cmds.setAttr(m + ".alphaIsLuminance", 0)
-            except:
-                pass
-        if "Lash" in m:
-            try:
-                cmds.setAttr(m + ".alphaGain", 1.7)
-                cmds.setAttr(m + ".invert", 0)
-                cmds.setAttr(m + ".alphaIsLuminance", 0)
-            except:
-                pass
+def get_figure_profile():
+    """
+    Return the cached FigureProfile of the imported figure, classifying the skeleton on first use
+    """
+    global figure_profile
+    if figure_profile is None:
+        figure_profile = FigureProfile.classify_figure(get_scene_index().get_joints(), global_current_dtu)
+    return figure_profile
 
 
-def break_transparency():
-    try:
-        connections = cmds.listConnections("EyeMoisture", d=0, s=1, c=1, p=1)
-    except:
-        pass
+def invalidate_figure_profile():
+    global figure_profile
+    figure_profile = None
+
+
+def reset_import_state():
+    """
+    Forget everything kept from the previous import, for processes that convert one asset after
+    another (the create_maya_file.py worker).  The pose and HIK template caches stay loaded.
+    """
+    global scene_index
+    global figure_profile
+    global import_profile
+    global global_current_dtu
+    scene_index = None
+    figure_profile = None
+    import_profile = None
+    global_current_dtu = None
+    morphs.dtu_loader = None
+    morphs.loaded_delta_caches.clear()
+    dzm.DazMaterials.material_dict.clear()
+
+
+def get_import_profile():
+    """
+    Options of the running Auto-Import, a default interactive profile outside of one
+    """
+    global import_profile
+    if import_profile is None:
+        import_profile = ImportProfile.ImportProfile()
+    return import_profile
+
+
+def get_ui_import_profile():
+    """
+    Build the ImportProfile from the main window widgets
+    """
+    return ImportProfile.ImportProfile(
+        scale=cmds.optionMenu("scaleMenu", query=True, value=True),
+        merge=cmds.checkBox(check_box_merge, query=True, value=True),
+        ask_to_save=cmds.checkBox(check_box_save, query=True, value=True))
+
+
+def config_ask_to_save(value):
+    with open(txtConf, 'wt') as output:
+        output.write('askToSaveSceneWithTextures=' + str(value))
+
+
+# ------------ MATERIAL FIXES--------------------------
+def get_material_fix_edits(renderer, fix_name):
+    """
+    Match the rules of a fix set from MaterialFixLib once against the scene nodes, returns
+    node -> ([(attribute to disconnect, DisconnectSource or None)], {attribute: value}) with the
+    edits of later rules winning
+    """
+    index = get_scene_index()
+    candidates = dict()
+    node_edits = dict()
+    for pattern, rule in MaterialFixLib.get_compiled_rules(renderer, fix_name):
+        node_type = rule["Type"]
+        if node_type not in candidates:
+            if node_type == "":
+                candidates[node_type] = sorted(index.get_materials())
+            else:
+                candidates[node_type] = index.get_nodes_of_type(node_type)
+        for node in candidates[node_type]:
+            if pattern.search(node) is None:
+                continue
+            target = node
+            if "Input" in rule:
+                node_fn = om2.MFnDependencyNode(get_dependency_node(node))
+                if not node_fn.hasAttribute(rule["Input"]):
+                    continue
+                plug = node_fn.findPlug(rule["Input"], False)
+                if not plug.isDestination:
+                    continue
+                target = om2.MFnDependencyNode(plug.source().node()).name()
+            disconnect_attrs, edits = node_edits.setdefault(target, ([], dict()))
+            disconnect_attrs.extend((attr, rule.get("DisconnectSource")) for attr in rule.get("Disconnect", []))
+            edits.update(rule["Edits"])
+    return node_edits
+
+
+def get_dependency_node(node):
+    selection = om2.MSelectionList()
+    selection.add(node)
+    return selection.getDependNode(0)
+
+
+def format_set_attr(node, attr, value):
+    if isinstance(value, (list, tuple)):
+        values = " ".join(repr(float(v)) for v in value)
+        return 'setAttr "%s.%s" -type double3 %s;' % (node, attr, values)
+    return 'setAttr "%s.%s" %s;' % (node, attr, repr(value))
+
+
+def apply_material_fixes(renderer, fix_name):
+    """
+    Apply a fix set of MaterialFixLib in one mel call.  Edits of missing, locked or connected
+    attributes are skipped up front, unless the rule disconnects them first.
+    """
+    node_edits = get_material_fix_edits(renderer, fix_name)
+    fix_cmds = []
+    for node, (disconnect_attrs, edits) in node_edits.items():
+        node_fn = om2.MFnDependencyNode(get_dependency_node(node))
+        disconnected_attrs = set()
+        for attr, disconnect_source in disconnect_attrs:
+            if attr in disconnected_attrs or not node_fn.hasAttribute(attr):
+                continue
+            plug = node_fn.findPlug(attr, False)
+            if not plug.isDestination:
+                continue
+            if disconnect_source is not None:
+                source_fn = om2.MFnDependencyNode(plug.source().node())
+                if source_fn.typeName != disconnect_source["Type"] or re.search(disconnect_source["Pattern"], source_fn.name()) is None:
+                    continue
+            fix_cmds.append('disconnectAttr "%s" "%s";' % (plug.source().name(), plug.name()))
+            disconnected_attrs.add(attr)
+        for attr, value in edits.items():
+            if not node_fn.hasAttribute(attr):
+                continue
+            plug = node_fn.findPlug(attr, False)
+            if plug.isLocked or (plug.isDestination and attr not in disconnected_attrs):
+                continue
+            fix_cmds.append(format_set_attr(node, attr, value))
+    if not fix_cmds:
+        return
     try:
-        for c in connections:
-            if ".transparency" in c:
-                cAttribute = c
-            if ".outTransparency" in c:
-                cNode = c
-        cmds.disconnectAttr(cNode, cAttribute)
-    except:
-        pass
+        mel.eval("\n".join(fix_cmds))
+    except Exception as e:
+        print("DazToMaya WARNING: batched " + renderer + " " + fix_name + " material fixes failed (" + str(e) + "), applying one at a time...")
+        for fix_cmd in fix_cmds:
+            try:
+                mel.eval(fix_cmd)
+            except Exception as e:
+                print("DazToMaya WARNING: " + fix_cmd + " failed: " + str(e))
 
 
 def vray_fixes():
-    break_transparency()
-    vray_eye_fix()
-    vray_eyelashes_fix()
+    apply_material_fixes("vray", "eyes")
 # --------------------------------------------------------------------------
 
 
-def mat_refresh_fix():
-    mats = mel.eval('ls -type "phong"')
-    if mats != None:
-        for m in mats:
-            old = m
-            new = mel.eval('createNode phong')
-            mel.eval('replaceNode %s %s' % (old, new))
-            cmds.delete(old)
-            cmds.rename(new, m)
-
-
 def parent_ar(source, target):
     # Parentar------------------------------------------
     mel.eval('select -r %s' % target)
@@ -218,8 +358,7 @@ def parent_ar(source, target):
 
 
 def unir_bones(source, target):
-    joints_list = mel.eval('ls -type joint')
-    if source in joints_list:
+    if get_scene_index().has_joint(source):
         target_pConst = target + "_pointConstraint1"
         # Poner en misma ubicacion-------------------------
         #mel.eval('select -r %s' %source)
@@ -570,20 +709,6 @@ def convert_all_phong_to_arnold():
     setup_opacities()
 
 
-def break_lash_connection(mat):
-    file_list = cmds.ls(type='file')
-    for file_text in file_list:
-        if "Lashes" in file_text or "lash" in file_text:
-            try:
-                texture_file = cmds.getAttr(file_text + '.fileTextureName')
-                try:
-                    mel.eval('disconnectAttr %s.outColor %s.color' % (file_text, mat))
-                except:
-                    print("breakCon skiped")
-            except:
-                print("File Text.Error")
-
-
 def convert_all_to_arnold_daz_fixes():
     convert_all_phong_to_arnold()
     # Make all geometry opaque
@@ -597,65 +722,8 @@ def convert_all_to_arnold_daz_fixes():
             except:
                 print("no obj")
 
-        i = 0
-        mats = mel.eval('ls -type "aiStandard"')
-
-        if (mats == None):
-            return
-
-        for mat in mats:
-            try:
-                mel.eval('setAttr "%s.Ks" 0.045' % mat)
-                mel.eval(
-                    'setAttr "%s.KsColor" -type double3 0.077 0.077 0.077' % mat)
-            except:
-                print("no phong")
-
-            if "lashes" in mats[i] or "Lashes" in mats[i]:
-                break_lash_connection(mats[i])
-
-            if "Cornea" in mats[i]:
-                try:
-                    mel.eval(
-                        'setAttr "%s.KtColor" -type double3 1 1 1' % mats[i])
-                    mel.eval(
-                        'setAttr "%s.opacity" -type double3 0.0324675 0.0324675 0.0324675' % mats[i])
-                    mel.eval(
-                        'setAttr "%s.specularRoughness" 0.00649351' % mats[i])
-                    mel.eval('setAttr "%s." 0.25974' % mats[i])
-                except:
-                    print("matchange skiped")
-            if "Reflection" in mats[i]:
-                try:
-                    mel.eval(
-                        'setAttr "%s.color" -type double3 0 0 0' % mats[i])
-                    mel.eval(
-                        'setAttr "%s.opacity" -type double3 0.0779221 0.0779221 0.0779221' % mats[i])
-                    mel.eval(
-                        'setAttr "%s.specularRoughness" 0.0324675' % mats[i])
-                    mel.eval('setAttr "%s.Ks" 0.746753' % mats[i])
-                except:
-                    print("matchange skiped")
-            if "Moisture" in mats[i]:
-                try:
-                    mel.eval(
-                        'setAttr "%s.opacity" -type double3 0 0 0' % mats[i])
-                except:
-                    print("matchange skiped")
-            if "EyeLights" in mats[i]:
-                try:
-                    mel.eval(
-                        'setAttr "%s.opacity" -type double3 0 0 0' % mats[i])
-                except:
-                    print("matchange skiped")
-            if "Tear" in mats[i]:
-                try:
-                    mel.eval(
-                        'setAttr "%s.opacity" -type double3 0 0 0' % mats[i])
-                except:
-                    print("matchange skiped")
-
-            i = i + 1
+        invalidate_scene_index()
+        apply_material_fixes("arnold", "eyes")
 
 
 # ==========================================================================
@@ -681,35 +749,6 @@ def maya2018_fix():
     mel.eval('select -cl')
 
 
-def gen8_lagrimal_fix():
-    try:
-        mel.eval(
-            'setAttr "ncl1.transparency" -type double3 0.993007 0.993007 0.993007')
-        mel.eval('setAttr "ncl1.cosinePower" 44.48951')
-        mel.eval(
-            'setAttr "ncl1.specularColor" -type double3 0.013986 0.013986 0.013986')
-    except:
-        pass
-
-
-def lash_fix_2():
-    try:
-        mel.eval('setAttr "SummerLash_1006.alphaGain" 1.5')
-        mel.eval('setAttr "SummerLash_1006.invert" 0')
-        mel.eval('setAttr "SummerLash_1006.alphaIsLuminance" 0')
-    except:
-        pass
-
-
-def scalp_fix():
-    try:
-        mel.eval('setAttr "Scalp.cosinePower" 2')
-        mel.eval('setAttr "Scalp.specularColor" -type double3 0 0 0')
-        mel.eval('setAttr "Scalp.reflectivity" 0')
-    except:
-        pass
-
-
 def hide_bone(target):
     target = target + ".drawStyle"
     cmds.setAttr('%s' % target, 2)
@@ -730,6 +769,121 @@ def print_HIKNodeName_Lookup_Table():
     # 23=Spine1
     # 32=Neck1
 
+def load_hik_template(template_name):
+    """
+    Load a HumanIK definition template from the hik folder
+    """
+    if template_name not in hik_template_cache:
+        template_path = os.path.join(Definitions.HIK_TEMPLATES_DIR, template_name + ".json")
+        with open(template_path, "r") as template_file:
+            hik_template_cache[template_name] = json.load(template_file)
+    return hik_template_cache[template_name]
+
+
+def apply_hik_template(template_name):
+    """
+    Map the skeleton to the HumanIK character of a template in one mel call.  The template
+    "Mapping" is an ordered list of [joint, HIK node id] (see print_HIKNodeName_Lookup_Table),
+    a later entry for the same HIK node wins.  Returns False if required joints are missing.
+    """
+    template = load_hik_template(template_name)
+    joints = get_scene_index().joint_set
+
+    missing_joints = set(template["Required"]) - joints
+    if missing_joints:
+        print("DazToMaya ERROR: skeleton does not match HIK template " + template_name + ", missing joints: " + ", ".join(sorted(missing_joints)))
+
+    character = template["Character"]
+    set_character_cmds = []
+    for joint, hik_id in template["Mapping"]:
+        if joint in joints:
+            set_character_cmds.append('setCharacterObject("%s","%s",%d,0);' % (joint, character, hik_id))
+    if set_character_cmds:
+        mel.eval("\n".join(set_character_cmds))
+    return len(missing_joints) == 0
+
+
+def is_hik_panel_visible():
+    try:
+        if cmds.workspaceControl(hik_dock_control_name, exists=True):
+            return cmds.workspaceControl(hik_dock_control_name, query=True, visible=True)
+    except:
+        pass
+    return False
+
+
+def get_pending_control_rig_characters():
+    """
+    HIK characters of the scene still waiting for their control rig
+    """
+    characters = cmds.ls(type="HIKCharacterNode") or []
+    return [character for character in characters
+            if cmds.attributeQuery(HIK_PENDING_RIG_ATTR, node=character, exists=True)
+            and cmds.getAttr(character + "." + HIK_PENDING_RIG_ATTR)]
+
+
+def watch_hik_panel():
+    """
+    Create the pending control rigs the next time the HIK panel is shown, also called when a
+    scene is opened.  Returns False if there is no panel to watch.
+    """
+    if not get_pending_control_rig_characters():
+        return False
+    if not cmds.workspaceControl(hik_dock_control_name, exists=True):
+        return False
+    cmds.workspaceControl(hik_dock_control_name, edit=True, visibleChangeCommand=lambda *args: create_deferred_hik_control_rig())
+    return True
+
+
+def defer_hik_control_rig():
+    """
+    Mark the imported character as waiting for its control rig, close the HIK panel opened for
+    the definition and create the rig the first time the panel is shown again
+    """
+    character = mel.eval('hikGetCurrentCharacter()')
+    if not character:
+        return
+    if not cmds.attributeQuery(HIK_PENDING_RIG_ATTR, node=character, exists=True):
+        cmds.addAttr(character, longName=HIK_PENDING_RIG_ATTR, attributeType="bool")
+    cmds.setAttr(character + "." + HIK_PENDING_RIG_ATTR, True)
+    if cmds.about(batch=True):
+        # no panel to watch, the rig is created once the saved file is opened in Maya
+        return
+    try:
+        if cmds.workspaceControl(hik_dock_control_name, exists=True):
+            cmds.workspaceControl(hik_dock_control_name, edit=True, close=True)
+            if watch_hik_panel():
+                return
+    except Exception as e:
+        print("DazToMaya WARNING: unable to watch the HIK panel (" + str(e) + "), creating the control rig now")
+    create_deferred_hik_control_rig(force=True)
+
+
+def clear_hik_panel_command():
+    if cmds.workspaceControl(hik_dock_control_name, exists=True):
+        cmds.workspaceControl(hik_dock_control_name, edit=True, visibleChangeCommand="")
+
+
+def create_deferred_hik_control_rig(force=False):
+    """
+    Create the pending control rigs once the HIK panel is visible, or right away if force is set
+    """
+    characters = get_pending_control_rig_characters()
+    if not characters:
+        return
+    if not force and not is_hik_panel_visible():
+        return
+    # the panel keeps its visibleChangeCommand, clear it once the callback returns
+    cmds.evalDeferred(clear_hik_panel_command)
+    for character in characters:
+        cmds.deleteAttr(character + "." + HIK_PENDING_RIG_ATTR)
+        try:
+            mel.eval('hikSetCurrentCharacter("%s")' % character)
+            mel.eval('hikCreateControlRig')
+        except Exception as e:
+            print("DazToMaya ERROR: unable to create the HIK control rig of " + character + ": " + str(e))
+
+
 def daz_to_ik():
     # print_HIKNodeName_Lookup_Table()
 
@@ -744,177 +898,13 @@ def daz_to_ik():
         None
 
     # unirBones(DazBone,HumanIkBone) -------------------------------------
-    joints_list = mel.eval('ls -type joint')
-
-    if "hip" in joints_list:
-        mel.eval('setCharacterObject("hip","Character1",1,0)')
-    # if "pelvis" in jointsList:
-        # unirBones("pelvis","Character1_Hips")
-
-    # if "spine" in jointsList:
-    #	unirBones("spine","Character1_Spine")
-
-    if "abdomen" in joints_list:
-        mel.eval('setCharacterObject("abdomen","Character1",8,0)')
-
-    if "abdomenLower" in joints_list:
-        mel.eval('setCharacterObject("abdomenLower","Character1",8,0)')
-
-    if "abdomenUpper" in joints_list:
-        mel.eval('setCharacterObject("abdomenUpper","Character1",23,0)')
-
-    if "abdomen2" in joints_list:
-        mel.eval('setCharacterObject("abdomen2","Character1",23,0)')
-    if "chestLower" in joints_list:
-        mel.eval('setCharacterObject("chestLower","Character1",24,0)')
-
-    if "chestUpper" in joints_list:
-        mel.eval('setCharacterObject("chestUpper","Character1",25,0)')
-    if "chest" in joints_list:
-        # mel.eval('setCharacterObject("chest","Character1",24,0)')
-        mel.eval('setCharacterObject("chest","Character1",23,0)')
-
-    if "neckLower" in joints_list:
-        mel.eval('setCharacterObject("neckLower","Character1",20,0)')
-    if "neckUpper" in joints_list:
-        mel.eval('setCharacterObject("neckUpper","Character1",32,0)')
-    if "neck" in joints_list:
-        mel.eval('setCharacterObject("neck","Character1",20,0)')
-
-    mel.eval('setCharacterObject("head","Character1",15,0)')
-
-    if "abdomen" in joints_list and "chest" in joints_list:  # Sentinel, etc fix
-        if "abdomenLower" not in joints_list:
-            if "abdomenUpper" not in joints_list:
-                if "abdomen2" not in joints_list:
-                    if "chestLower" not in joints_list:
-                        mel.eval(
-                            'setCharacterObject("abdomen","Character1",8,0)')
-                        mel.eval(
-                            'setCharacterObject("chest","Character1",23,0)')
-
-    # Left
-    if "lThighBend" in joints_list:
-        mel.eval('setCharacterObject("lThighBend","Character1",2,0)')
-    if "lThigh" in joints_list:
-        mel.eval('setCharacterObject("lThigh","Character1",2,0)')
-
-    mel.eval('setCharacterObject("lShin","Character1",3,0)')
-    mel.eval('setCharacterObject("lFoot","Character1",4,0)')
-
-    if cmds.objExists('lToe'):
-        mel.eval('setCharacterObject("lToe","Character1",16,0)')
-
-    if "lCollar" in joints_list:
-        mel.eval('setCharacterObject("lCollar","Character1",18,0)')
-    # if "lShldr" in jointsList:
-        # unirBones("lShldr","Character1_LeftShoulder")
-
-    if "lShldrBend" in joints_list:
-        mel.eval('setCharacterObject("lShldrBend","Character1",9,0)')
-    if "lShldr" in joints_list:
-        mel.eval('setCharacterObject("lShldr","Character1",9,0)')
-
-    if "lForearmBend" in joints_list:
-        mel.eval('setCharacterObject("lForearmBend","Character1",10,0)')
-    if "lForeArm" in joints_list:
-        mel.eval('setCharacterObject("lForeArm","Character1",10,0)')
-
-    mel.eval('setCharacterObject("lHand","Character1",11,0)')
-    if cmds.objExists('lThumb1'):
-        mel.eval('setCharacterObject("lThumb1","Character1",50,0)')
-        mel.eval('setCharacterObject("lThumb2","Character1",51,0)')
-        mel.eval('setCharacterObject("lThumb3","Character1",52,0)')
-    sentinel = 0
-    for joint in joints_list:
-        if "SENTINEL" in joint:
-            sentinel = sentinel + 1
-    if sentinel >= 1:
-        print("Sentinel Detected")
-    else:
-        if cmds.objExists('lThumb4'):
-            mel.eval('setCharacterObject("lThumb4","Character1",53,0)')
-    if cmds.objExists('lIndex1'):
-        mel.eval('setCharacterObject("lIndex1","Character1",54,0)')
-        mel.eval('setCharacterObject("lIndex2","Character1",55,0)')
-        mel.eval('setCharacterObject("lIndex3","Character1",56,0)')
-        mel.eval('setCharacterObject("lIndex4","Character1",57,0)')
-    if cmds.objExists('lMid1'):
-        mel.eval('setCharacterObject("lMid1","Character1",58,0)')
-        mel.eval('setCharacterObject("lMid2","Character1",59,0)')
-        mel.eval('setCharacterObject("lMid3","Character1",60,0)')
-        mel.eval('setCharacterObject("lMid4","Character1",61,0)')
-    if cmds.objExists('lRing1'):
-        mel.eval('setCharacterObject("lRing1","Character1",62,0)')
-        mel.eval('setCharacterObject("lRing2","Character1",63,0)')
-        mel.eval('setCharacterObject("lRing3","Character1",64,0)')
-        mel.eval('setCharacterObject("lRing4","Character1",65,0)')
-    if cmds.objExists('lPinky1'):
-        mel.eval('setCharacterObject("lPinky1","Character1",66,0)')
-        mel.eval('setCharacterObject("lPinky2","Character1",67,0)')
-        mel.eval('setCharacterObject("lPinky3","Character1",68,0)')
-        mel.eval('setCharacterObject("lPinky4","Character1",69,0)')
-
-    # Right
-    if "rThighBend" in joints_list:
-        mel.eval('setCharacterObject("rThighBend","Character1",5,0)')
-    if "rThigh" in joints_list:
-        mel.eval('setCharacterObject("rThigh","Character1",5,0)')
-
-    mel.eval('setCharacterObject("rShin","Character1",6,0)')
-    mel.eval('setCharacterObject("rFoot","Character1",7,0)')
-
-    if cmds.objExists('rToe'):
-        mel.eval('setCharacterObject("rToe","Character1",17,0)')
-
-    if "rCollar" in joints_list:
-        mel.eval('setCharacterObject("rCollar","Character1",19,0)')
-    # if "rShldr" in jointsList:
-        # unirBones("rShldr","Character1_RightShoulder")
-
-    if "rShldrBend" in joints_list:
-        mel.eval('setCharacterObject("rShldrBend","Character1",12,0)')
-    if "rShldr" in joints_list:
-        mel.eval('setCharacterObject("rShldr","Character1",12,0)')
-
-    if "rForearmBend" in joints_list:
-        mel.eval('setCharacterObject("rForearmBend","Character1",13,0)')
-    if "rForeArm" in joints_list:
-        mel.eval('setCharacterObject("rForeArm","Character1",13,0)')
-
-    mel.eval('setCharacterObject("rHand","Character1",14,0)')
-    if cmds.objExists('rThumb1'):
-        mel.eval('setCharacterObject("rThumb1","Character1",74,0)')
-        mel.eval('setCharacterObject("rThumb2","Character1",75,0)')
-        mel.eval('setCharacterObject("rThumb3","Character1",76,0)')
-    sentinel = 0
-    for joint in joints_list:
-        if "SENTINEL" in joint:
-            sentinel = sentinel + 1
-    if sentinel >= 1:
+    joints_list = get_scene_index().joint_set
+
+    if get_figure_profile().generation == "Sentinel":
         print("Sentinel Detected")
+        apply_hik_template("sentinel")
     else:
-        mel.eval('setCharacterObject("rThumb4","Character1",77,0)')
-
-    mel.eval('setCharacterObject("rIndex1","Character1",78,0)')
-    mel.eval('setCharacterObject("rIndex2","Character1",79,0)')
-    mel.eval('setCharacterObject("rIndex3","Character1",80,0)')
-    mel.eval('setCharacterObject("rIndex4","Character1",81,0)')
-
-    mel.eval('setCharacterObject("rMid1","Character1",82,0)')
-    mel.eval('setCharacterObject("rMid2","Character1",83,0)')
-    mel.eval('setCharacterObject("rMid3","Character1",84,0)')
-    mel.eval('setCharacterObject("rMid4","Character1",85,0)')
-
-    mel.eval('setCharacterObject("rRing1","Character1",86,0)')
-    mel.eval('setCharacterObject("rRing2","Character1",87,0)')
-    mel.eval('setCharacterObject("rRing3","Character1",88,0)')
-    mel.eval('setCharacterObject("rRing4","Character1",89,0)')
-
-    mel.eval('setCharacterObject("rPinky1","Character1",90,0)')
-    mel.eval('setCharacterObject("rPinky2","Character1",91,0)')
-    mel.eval('setCharacterObject("rPinky3","Character1",92,0)')
-    mel.eval('setCharacterObject("rPinky4","Character1",93,0)')
+        apply_hik_template("genesis")
 
     # GENESIS 3 - FIXES ---------------------------------------------------------
     # ---------------------------------------------------------
@@ -924,15 +914,6 @@ def daz_to_ik():
         mel.eval('setAttr "head.visibility" 0')
     except:
         pass
-    if "lForearmTwist" in joints_list:
-        mel.eval('setCharacterObject("lForearmTwist","Character1",177,0)')
-        mel.eval('setCharacterObject("lShldrTwist","Character1",176,0)')
-        mel.eval('setCharacterObject("lThighTwist","Character1",172,0)')
-        # parentar("lMetatarsals","Character1_LeftFoot")
-        mel.eval('setCharacterObject("rForearmTwist","Character1",179,0)')
-        mel.eval('setCharacterObject("rShldrTwist","Character1",178,0)')
-        mel.eval('setCharacterObject("rThighTwist","Character1",174,0)')
-        # parentar("rMetatarsals","Character1_RightFoot")
 
     toe_bones_left = ("lBigToe", "lSmallToe1", "lSmallToe2",
                     "lSmallToe3", "lSmallToe4")
@@ -947,79 +928,106 @@ def daz_to_ik():
             parent_ar(toe_bone_right, "rToe")
 
 
+def get_skinned_meshes():
+    """
+    Mesh shapes deformed by a skinCluster, i.e. the figure meshes, without props and environments
+    """
+    index = get_scene_index()
+    if "skinned_meshes" not in index.cache:
+        meshes = set()
+        for skin_cluster in index.get_nodes_of_type("skinCluster"):
+            for geometry in cmds.skinCluster(skin_cluster, query=True, geometry=True) or []:
+                if cmds.nodeType(geometry) == "mesh":
+                    meshes.add(geometry)
+        index.cache["skinned_meshes"] = sorted(meshes)
+    return index.cache["skinned_meshes"]
+
+
 def min_y_in_scene():
     """
-    Find the min y of bounding box from all the shapes
+    Find the min y (never above 0) of the world space points of the skinned meshes, the points
+    of each mesh are fetched in one call.  The result is kept in the scene index cache.
     """
+    index = get_scene_index()
+    if "min_y" in index.cache:
+        return index.cache["min_y"]
     try:
-        shapes = cmds.ls(type='geometryShape')
-        bound_box_min_y = 0
-        bound_box_min_y_all = 0
-        for shape in shapes:
-            bound_box_min_y = cmds.polyEvaluate(shape, b=True)[1][0]
-            if bound_box_min_y < bound_box_min_y_all:
-                bound_box_min_y_all = bound_box_min_y
-        return bound_box_min_y_all
+        min_y_all = 0
+        meshes = get_skinned_meshes()
+        if meshes and blendshapes.np is not None:
+            for mesh in meshes:
+                points = blendshapes.get_mesh_points(mesh, om2.MSpace.kWorld)
+                if len(points) > 0:
+                    min_y_all = min(min_y_all, float(points[:, 1].min()))
+        elif meshes:
+            # one combined bounding box query without numpy
+            min_y_all = min(min_y_all, cmds.exactWorldBoundingBox(meshes)[1])
+        index.cache["min_y"] = min_y_all
+        return min_y_all
     except:
         pass
 
 
 def compensate_hip():
     """
-    Adjust hip position based on the min possible y of all shapes in the scene
+    Adjust hip position based on the min possible y of the skinned meshes in the scene
     """
     try:
         min_y = min_y_in_scene()
         hip_y = cmds.getAttr("hip.translateY")
         cmds.setAttr('hip.translateY', hip_y + (min_y*-1))
+        # the figure now stands on the ground
+        get_scene_index().cache["min_y"] = 0
     except:
         pass
 
 
-def extend_finger(base_scale_bone, end_bone, new_bone, scale=2, rotation=0):
-    mel.eval('select -r %s' % base_scale_bone)
-
-    mel.eval('rotate -r -os -fo 0 0 %s' % rotation)
-    mel.eval('scale -a %s %s %s' % (scale, scale, scale))
-    mel.eval('select -r %s' % end_bone)
-    caca = mel.eval('xform -q -t -ws')
-    mel.eval('select -r %s' % base_scale_bone)
-    mel.eval('scale -a 1 1 1')
-    rotation = rotation * -1
-    mel.eval('rotate -r -os -fo 0 0 %s' % rotation)
-    mel.eval('select -r %s' % end_bone)
-    cmds.joint(name=new_bone, p=(caca))
+def get_finger_tip_position(base_scale_bone, end_bone, scale=2, rotation=0):
+    """
+    World position end_bone would have if base_scale_bone was scaled by scale and turned by
+    rotation degrees around its local Z, worked out from the world matrices without editing them
+    """
+    base_matrix = tpose.get_world_matrix(base_scale_bone)
+    end_matrix = tpose.get_world_matrix(end_bone)
+    base = om2.MVector(base_matrix.getElement(3, 0), base_matrix.getElement(3, 1), base_matrix.getElement(3, 2))
+    end = om2.MVector(end_matrix.getElement(3, 0), end_matrix.getElement(3, 1), end_matrix.getElement(3, 2))
+    offset = (end - base) * scale
+    if rotation != 0:
+        axis = om2.MVector(base_matrix.getElement(2, 0), base_matrix.getElement(2, 1), base_matrix.getElement(2, 2))
+        offset = offset.rotateBy(om2.MQuaternion(math.radians(rotation), axis.normalize()))
+    return base + offset
+
+
+def extend_fingers(fingers):
+    """
+    Create the finger tip joints in one mel call, each as a child of its end bone.
+    fingers is a list of (base_scale_bone, end_bone, new_bone, scale, rotation)
+    """
+    index = get_scene_index()
+    joint_cmds = []
+    for base_scale_bone, end_bone, new_bone, scale, rotation in fingers:
+        if not index.has_joints([base_scale_bone, end_bone]) or index.has_node(new_bone):
+            continue
+        tip = get_finger_tip_position(base_scale_bone, end_bone, scale, rotation)
+        joint_cmds.append('createNode joint -n "%s" -p "%s";' % (new_bone, end_bone))
+        joint_cmds.append('xform -ws -t %s %s %s "%s";' % (repr(tip.x), repr(tip.y), repr(tip.z), new_bone))
+    if joint_cmds:
+        mel.eval("\n".join(joint_cmds))
 
 
 def extend_hand_fingers():
-    joints_list = mel.eval('ls -type joint')
-    done = 0
+    joints_list = get_scene_index().joint_set
+    fingers = []
     if "lIndex3" in joints_list:
-        extend_finger("lIndex2", "lIndex3", "lIndex4", 2, 0)
-        extend_finger("lMid2", "lMid3", "lMid4", 2, 0)
-        extend_finger("lRing2", "lRing3", "lRing4", 2, 0)
-        extend_finger("lPinky2", "lPinky3", "lPinky4", 2, 0)
-        extend_finger("lThumb2", "lThumb3", "lThumb4", 2, 0)
-
-        extend_finger("rIndex2", "rIndex3", "rIndex4", 2, 0)
-        extend_finger("rMid2", "rMid3", "rMid4", 2, 0)
-        extend_finger("rRing2", "rRing3", "rRing4", 2, 0)
-        extend_finger("rPinky2", "rPinky3", "rPinky4", 2, 0)
-        extend_finger("rThumb2", "rThumb3", "rThumb4", 2, 0)
-        done = 1
-    if "lIndex2" in joints_list:
-        if "lIndex3" not in joints_list:
-            extend_finger("lIndex2", "lIndex2", "lIndex3")
-            extend_finger("lMid2", "lMid2", "lMid3")
-            extend_finger("lRing2", "lRing2", "lRing3")
-            extend_finger("lPinky2", "lPinky2", "lPinky3")
-            extend_finger("lThumb2", "lThumb2", "lThumb3", 2)
-
-            extend_finger("rIndex2", "rIndex2", "rIndex3")
-            extend_finger("rMid2", "rMid2", "rMid3")
-            extend_finger("rRing2", "rRing2", "rRing3")
-            extend_finger("rPinky2", "rPinky2", "rPinky3")
-            extend_finger("rThumb2", "rThumb2", "rThumb3", 2)
+        for side in ("l", "r"):
+            for finger in ("Index", "Mid", "Ring", "Pinky", "Thumb"):
+                fingers.append((side + finger + "2", side + finger + "3", side + finger + "4", 2, 0))
+    elif "lIndex2" in joints_list:
+        for side in ("l", "r"):
+            for finger in ("Index", "Mid", "Ring", "Pinky", "Thumb"):
+                fingers.append((side + finger + "2", side + finger + "2", side + finger + "3", 2, 0))
+    extend_fingers(fingers)
+    invalidate_scene_index()
 
 
 def sentinel_remove_finger():
@@ -1030,51 +1038,61 @@ def sentinel_remove_finger():
         mel.eval('doDelete')
     except:
         print("Sentinel Finger Fix")
+    invalidate_scene_index()
+
+
+def get_hidden_dag_nodes():
+    """
+    Long names of the top-most hidden DAG nodes, cameras and default nodes excluded.  Children
+    of a hidden node are not listed, deleting the node removes them.
+    """
+    hidden_nodes = []
+    dag_iter = om2.MItDag(om2.MItDag.kDepthFirst)
+    while not dag_iter.isDone():
+        dag_path = dag_iter.getPath()
+        if dag_path.length() == 0:
+            # world
+            dag_iter.next()
+            continue
+        dag_node = om2.MFnDagNode(dag_path)
+        # hasFn also matches a transform whose shape is a camera
+        if dag_node.isDefaultNode or dag_path.hasFn(om2.MFn.kCamera):
+            dag_iter.next()
+            continue
+        if not dag_node.findPlug("visibility", False).asBool():
+            hidden_nodes.append(dag_path.fullPathName())
+            dag_iter.prune()
+        dag_iter.next()
+    return hidden_nodes
 
 
 def remove_hidden_objs():
-    camera_list = cmds.ls(cameras=1)
-    obj_list = cmds.ls()
-    i = 0
-    for obj in obj_list:
+    hidden_nodes = get_hidden_dag_nodes()
+    if hidden_nodes:
         try:
-            visibility = cmds.getAttr(obj_list[i] + ".visibility")
-            if visibility == False:
-                if obj not in camera_list:
-                    mel.eval('delete %s' % obj_list[i])
+            cmds.delete(hidden_nodes)
         except:
-            None
-        i = i + 1
+            # one undeletable node fails the whole command, retry them one by one
+            for node in hidden_nodes:
+                try:
+                    cmds.delete(node)
+                except:
+                    None
+    invalidate_scene_index()
 
 
 def scene_modified_check():
     """
     Check and exit if scene modified
     """
-    objs = mel.eval('ls')
-    for obj in objs:
-        if cmds.objectType(obj) == "locator":
+    for obj, obj_type in get_scene_index().node_types.items():
+        if obj_type == "locator":
             if obj.find("Character1_Reference") == 0:
                 print("\n"*10)
                 print("Scene already modified")
                 sys.exit()  # ABOUR SCRIPT IF SCENE NOT READY!!
 
 
-def transparency_fix():
-    shader_type = "phong"
-    mat_list = cmds.ls(exactType=shader_type)
-    skip_mats = ["Pupils", "Cornea", "Irises", "nails", "Eye"]
-
-    for mat in mat_list:
-        for skip_mat in skip_mats:
-            if skip_mat not in mat:
-                try:
-                    mel.eval('setAttr "%s.specularColor" -type double3 0 0 0' % mat)
-                    mel.eval('setAttr "%s.reflectivity" 0' % mat)
-                except:
-                    pass
-
-
 def clamp_textures():
     try:
         mel.eval('setAttr "hardwareRenderingGlobals.enableTextureMaxRes" 1')
@@ -1083,986 +1101,83 @@ def clamp_textures():
         print("No Text Clamp")
 
 
-# TODO: Remove hardocing
-def sentinel_rotations_fix():
-    try:
-        mel.eval('setAttr "lShldr.rotateX" 0.54')
-        mel.eval('setAttr "lShldr.rotateY" 3.88')
-        mel.eval('setAttr "lShldr.rotateZ" 7.05')
-
-        mel.eval('setAttr "rShldr.rotateX" 0.54')
-        mel.eval('setAttr "rShldr.rotateY" -3.88')
-        mel.eval('setAttr "rShldr.rotateZ" -7.05')
-
-        mel.eval('setAttr "lForeArm.rotateX" -0.26')
-        mel.eval('setAttr "lForeArm.rotateY" 9.49')
-        mel.eval('setAttr "lForeArm.rotateZ" -0.13')
-
-        mel.eval('setAttr "rForeArm.rotateX" -0.26')
-        mel.eval('setAttr "rForeArm.rotateY" -9.49')
-        mel.eval('setAttr "rForeArm.rotateZ" 0.13')
-
-        mel.eval('setAttr "lHand.rotateX" 16.88')
-        mel.eval('setAttr "lHand.rotateY" -1.91')
-        mel.eval('setAttr "lHand.rotateZ" -0.71')
-
-        mel.eval('setAttr "rHand.rotateX" 16.88')
-        mel.eval('setAttr "rHand.rotateY" 1.91')
-        mel.eval('setAttr "rHand.rotateZ" 0.71')
-
-        mel.eval('setAttr "lThumb1.rotateX" -9.98')
-        mel.eval('setAttr "lThumb1.rotateY" -9.51')
-        mel.eval('setAttr "lThumb1.rotateZ" 5.4')
-
-        mel.eval('setAttr "rThumb1.rotateX" -9.98')
-        mel.eval('setAttr "rThumb1.rotateY" 9.51')
-        mel.eval('setAttr "rThumb1.rotateZ" -5.4')
-
-        mel.eval('setAttr "lThumb2.rotateX" -0.6')
-        mel.eval('setAttr "lThumb2.rotateY" -12.73')
-        mel.eval('setAttr "lThumb2.rotateZ" 0.27')
-
-        mel.eval('setAttr "rThumb2.rotateX" -0.6')
-        mel.eval('setAttr "rThumb2.rotateY" 12.73')
-        mel.eval('setAttr "rThumb2.rotateZ" -0.27')
-
-        mel.eval('setAttr "lThumb3.rotateX" -0.6')
-        mel.eval('setAttr "lThumb3.rotateY" -12.73')
-        mel.eval('setAttr "lThumb3.rotateZ" 0.27')
-
-        mel.eval('setAttr "rThumb3.rotateX" -0.6')
-        mel.eval('setAttr "rThumb3.rotateY" 12.73')
-        mel.eval('setAttr "rThumb3.rotateZ" -0.27')
-
-        mel.eval('setAttr "lIndex1.rotateX" -6.65')
-        mel.eval('setAttr "lIndex1.rotateY" -7.61')
-        mel.eval('setAttr "lIndex1.rotateZ" 5.69')
-
-        mel.eval('setAttr "rIndex1.rotateX" -6.65')
-        mel.eval('setAttr "rIndex1.rotateY" 7.61')
-        mel.eval('setAttr "rIndex1.rotateZ" -5.69')
-
-        mel.eval('setAttr "lIndex2.rotateX" 3.39')
-        mel.eval('setAttr "lIndex2.rotateY" -1.2')
-        mel.eval('setAttr "lIndex2.rotateZ" 21.0')
-
-        mel.eval('setAttr "rIndex2.rotateX" 3.39')
-        mel.eval('setAttr "rIndex2.rotateY" 1.2')
-        mel.eval('setAttr "rIndex2.rotateZ" -21.0')
-
-        mel.eval('setAttr "lIndex3.rotateX" -0.0')
-        mel.eval('setAttr "lIndex3.rotateY" -0.0')
-        mel.eval('setAttr "lIndex3.rotateZ" 0.0')
-
-        mel.eval('setAttr "rIndex3.rotateX" -0.0')
-        mel.eval('setAttr "rIndex3.rotateY" 0.0')
-        mel.eval('setAttr "rIndex3.rotateZ" -0.0')
-
-        mel.eval('setAttr "lMid1.rotateX" 1.02')
-        mel.eval('setAttr "lMid1.rotateY" -13.59')
-        mel.eval('setAttr "lMid1.rotateZ" 14.46')
-
-        mel.eval('setAttr "rMid1.rotateX" 1.02')
-        mel.eval('setAttr "rMid1.rotateY" 13.59')
-        mel.eval('setAttr "rMid1.rotateZ" -14.46')
-
-        mel.eval('setAttr "lMid2.rotateX" 0.12')
-        mel.eval('setAttr "lMid2.rotateY" -4.91')
-        mel.eval('setAttr "lMid2.rotateZ" 20.86')
-
-        mel.eval('setAttr "rMid2.rotateX" 0.12')
-        mel.eval('setAttr "rMid2.rotateY" 4.91')
-        mel.eval('setAttr "rMid2.rotateZ" -20.86')
-
-        mel.eval('setAttr "lMid3.rotateX" 0.31')
-        mel.eval('setAttr "lMid3.rotateY" -1.98')
-        mel.eval('setAttr "lMid3.rotateZ" -2.4')
-
-        mel.eval('setAttr "rMid3.rotateX" 0.31')
-        mel.eval('setAttr "rMid3.rotateY" 1.98')
-        mel.eval('setAttr "rMid3.rotateZ" 2.4')
-
-        mel.eval('setAttr "lRing1.rotateX" -2.7')
-        mel.eval('setAttr "lRing1.rotateY" -16.45')
-        mel.eval('setAttr "lRing1.rotateZ" 26.89')
-
-        mel.eval('setAttr "rRing1.rotateX" -2.7')
-        mel.eval('setAttr "rRing1.rotateY" 16.45')
-        mel.eval('setAttr "rRing1.rotateZ" -26.89')
-
-        mel.eval('setAttr "lRing2.rotateX" -1.93')
-        mel.eval('setAttr "lRing2.rotateY" -5.11')
-        mel.eval('setAttr "lRing2.rotateZ" 12.0')
-
-        mel.eval('setAttr "rRing2.rotateX" -1.93')
-        mel.eval('setAttr "rRing2.rotateY" 5.11')
-        mel.eval('setAttr "rRing2.rotateZ" -12.0')
-
-        mel.eval('setAttr "lRing3.rotateX" 0.0')
-        mel.eval('setAttr "lRing3.rotateY" -0.0')
-        mel.eval('setAttr "lRing3.rotateZ" 0.0')
-
-        mel.eval('setAttr "rRing3.rotateX" 0.0')
-        mel.eval('setAttr "rRing3.rotateY" 0.0')
-        mel.eval('setAttr "rRing3.rotateZ" -0.0')
-
-        mel.eval('setAttr "lPinky1.rotateX" -2.24')
-        mel.eval('setAttr "lPinky1.rotateY" -18.15')
-        mel.eval('setAttr "lPinky1.rotateZ" 18.9')
-
-        mel.eval('setAttr "rPinky1.rotateX" -2.24')
-        mel.eval('setAttr "rPinky1.rotateY" 18.15')
-        mel.eval('setAttr "rPinky1.rotateZ" -18.9')
-
-        mel.eval('setAttr "lPinky2.rotateX" 3.15')
-        mel.eval('setAttr "lPinky2.rotateY" -6.07')
-        mel.eval('setAttr "lPinky2.rotateZ" 23.72')
-
-        mel.eval('setAttr "rPinky2.rotateX" 3.15')
-        mel.eval('setAttr "rPinky2.rotateY" 6.07')
-        mel.eval('setAttr "rPinky2.rotateZ" -23.72')
-
-        mel.eval('setAttr "lPinky3.rotateX" 5.42')
-        mel.eval('setAttr "lPinky3.rotateY" 7.35')
-        mel.eval('setAttr "lPinky3.rotateZ" 2.93')
-
-        mel.eval('setAttr "rPinky3.rotateX" 5.42')
-        mel.eval('setAttr "rPinky3.rotateY" -7.35')
-        mel.eval('setAttr "rPinky3.rotateZ" -2.93')
-
-        mel.eval('setAttr "lThigh.rotateX" -0.37')
-        mel.eval('setAttr "lThigh.rotateY" -0.45')
-        mel.eval('setAttr "lThigh.rotateZ" -4.37')
-
-        mel.eval('setAttr "rThigh.rotateX" -0.37')
-        mel.eval('setAttr "rThigh.rotateY" 0.45')
-        mel.eval('setAttr "rThigh.rotateZ" 4.37')
-
-        mel.eval('setAttr "lFoot.rotateX" -0.57')
-        mel.eval('setAttr "lFoot.rotateY" -6.61')
-        mel.eval('setAttr "lFoot.rotateZ" -3.66')
-
-        mel.eval('setAttr "rFoot.rotateX" -0.57')
-        mel.eval('setAttr "rFoot.rotateY" 6.61')
-        mel.eval('setAttr "rFoot.rotateZ" 3.66')
-    except:
-        print("Sentinel fix")
+def load_pose_preset(pose_name):
+    """
+    Load a pose table from the poses folder: joint name -> {attribute: value}
+    """
+    if pose_name not in pose_preset_cache:
+        pose_path = os.path.join(Definitions.POSES_DIR, pose_name + ".json")
+        with open(pose_path, "r") as pose_file:
+            pose_preset_cache[pose_name] = json.load(pose_file)
+    return pose_preset_cache[pose_name]
 
 
-# TODO: Remove hardocing
-def gen1_rotations_fix():
+def apply_pose_preset(pose_name):
+    """
+    Apply a pose table in a single mel call, leaving out the attributes already at their value.
+    The rotations are read with one getAttr per joint.  Missing joints are reported once.
+    """
     try:
-        mel.eval('setAttr "lShldr.rotateX" -0.0')
-        mel.eval('setAttr "lShldr.rotateY" 5.7')
-        mel.eval('setAttr "lShldr.rotateZ" 2.73')
-
-        mel.eval('setAttr "rShldr.rotateX" -0.0')
-        mel.eval('setAttr "rShldr.rotateY" -5.7')
-        mel.eval('setAttr "rShldr.rotateZ" -2.73')
-
-        mel.eval('setAttr "lForeArm.rotateX" 0.0')
-        mel.eval('setAttr "lForeArm.rotateY" 20.0')
-        mel.eval('setAttr "lForeArm.rotateZ" -1.78')
-
-        mel.eval('setAttr "rForeArm.rotateX" 0.0')
-        mel.eval('setAttr "rForeArm.rotateY" -20.0')
-        mel.eval('setAttr "rForeArm.rotateZ" 1.78')
-
-        mel.eval('setAttr "lHand.rotateX" -0.0')
-        mel.eval('setAttr "lHand.rotateY" -0.0')
-        mel.eval('setAttr "lHand.rotateZ" 0.0')
-
-        mel.eval('setAttr "rHand.rotateX" -0.0')
-        mel.eval('setAttr "rHand.rotateY" 0.0')
-        mel.eval('setAttr "rHand.rotateZ" -0.0')
-
-        mel.eval('setAttr "lThumb1.rotateX" 0.0')
-        mel.eval('setAttr "lThumb1.rotateY" 0.0')
-        mel.eval('setAttr "lThumb1.rotateZ" 2.94')
-
-        mel.eval('setAttr "rThumb1.rotateX" 0.0')
-        mel.eval('setAttr "rThumb1.rotateY" -0.0')
-        mel.eval('setAttr "rThumb1.rotateZ" -2.94')
-
-        mel.eval('setAttr "lThumb2.rotateX" 0.0')
-        mel.eval('setAttr "lThumb2.rotateY" -0.0')
-        mel.eval('setAttr "lThumb2.rotateZ" 0.0')
-
-        mel.eval('setAttr "rThumb2.rotateX" 0.0')
-        mel.eval('setAttr "rThumb2.rotateY" 0.0')
-        mel.eval('setAttr "rThumb2.rotateZ" -0.0')
-
-        mel.eval('setAttr "lThumb3.rotateX" 0.0')
-        mel.eval('setAttr "lThumb3.rotateY" -0.0')
-        mel.eval('setAttr "lThumb3.rotateZ" 0.0')
-
-        mel.eval('setAttr "rThumb3.rotateX" 0.0')
-        mel.eval('setAttr "rThumb3.rotateY" 0.0')
-        mel.eval('setAttr "rThumb3.rotateZ" -0.0')
-
-        mel.eval('setAttr "lCarpal1.rotateX" -0.0')
-        mel.eval('setAttr "lCarpal1.rotateY" -0.0')
-        mel.eval('setAttr "lCarpal1.rotateZ" 0.0')
-
-        mel.eval('setAttr "rCarpal1.rotateX" -0.0')
-        mel.eval('setAttr "rCarpal1.rotateY" 0.0')
-        mel.eval('setAttr "rCarpal1.rotateZ" -0.0')
-
-        mel.eval('setAttr "lIndex1.rotateX" -5.14')
-        mel.eval('setAttr "lIndex1.rotateY" 12.62')
-        mel.eval('setAttr "lIndex1.rotateZ" 16.12')
-
-        mel.eval('setAttr "rIndex1.rotateX" -5.14')
-        mel.eval('setAttr "rIndex1.rotateY" -12.62')
-        mel.eval('setAttr "rIndex1.rotateZ" -16.12')
-
-        mel.eval('setAttr "lIndex2.rotateX" 7.45')
-        mel.eval('setAttr "lIndex2.rotateY" -3.01')
-        mel.eval('setAttr "lIndex2.rotateZ" 27.34')
-
-        mel.eval('setAttr "rIndex2.rotateX" 7.45')
-        mel.eval('setAttr "rIndex2.rotateY" 3.01')
-        mel.eval('setAttr "rIndex2.rotateZ" -27.34')
-
-        mel.eval('setAttr "lIndex3.rotateX" 4.44')
-        mel.eval('setAttr "lIndex3.rotateY" -0.0')
-        mel.eval('setAttr "lIndex3.rotateZ" 12.1')
-
-        mel.eval('setAttr "rIndex3.rotateX" 4.44')
-        mel.eval('setAttr "rIndex3.rotateY" 0.0')
-        mel.eval('setAttr "rIndex3.rotateZ" -12.1')
-
-        mel.eval('setAttr "lMid1.rotateX" 5.49')
-        mel.eval('setAttr "lMid1.rotateY" 3.03')
-        mel.eval('setAttr "lMid1.rotateZ" 17.56')
-
-        mel.eval('setAttr "rMid1.rotateX" 5.49')
-        mel.eval('setAttr "rMid1.rotateY" -3.03')
-        mel.eval('setAttr "rMid1.rotateZ" -17.56')
-
-        mel.eval('setAttr "lMid2.rotateX" -0.62')
-        mel.eval('setAttr "lMid2.rotateY" 0.01')
-        mel.eval('setAttr "lMid2.rotateZ" 32.07')
-
-        mel.eval('setAttr "rMid2.rotateX" -0.62')
-        mel.eval('setAttr "rMid2.rotateY" -0.01')
-        mel.eval('setAttr "rMid2.rotateZ" -32.07')
-
-        mel.eval('setAttr "lMid3.rotateX" 5.7')
-        mel.eval('setAttr "lMid3.rotateY" 0.01')
-        mel.eval('setAttr "lMid3.rotateZ" 16.17')
-
-        mel.eval('setAttr "rMid3.rotateX" 5.7')
-        mel.eval('setAttr "rMid3.rotateY" -0.01')
-        mel.eval('setAttr "rMid3.rotateZ" -16.17')
-
-        mel.eval('setAttr "lCarpal2.rotateX" -0.0')
-        mel.eval('setAttr "lCarpal2.rotateY" -0.0')
-        mel.eval('setAttr "lCarpal2.rotateZ" 0.0')
-
-        mel.eval('setAttr "rCarpal2.rotateX" -0.0')
-        mel.eval('setAttr "rCarpal2.rotateY" 0.0')
-        mel.eval('setAttr "rCarpal2.rotateZ" -0.0')
-
-        mel.eval('setAttr "lRing1.rotateX" 4.68')
-        mel.eval('setAttr "lRing1.rotateY" -3.36')
-        mel.eval('setAttr "lRing1.rotateZ" 19.99')
-
-        mel.eval('setAttr "rRing1.rotateX" 4.68')
-        mel.eval('setAttr "rRing1.rotateY" 3.36')
-        mel.eval('setAttr "rRing1.rotateZ" -19.99')
-
-        mel.eval('setAttr "lRing2.rotateX" 3.19')
-        mel.eval('setAttr "lRing2.rotateY" 1.4')
-        mel.eval('setAttr "lRing2.rotateZ" 32.05')
-
-        mel.eval('setAttr "rRing2.rotateX" 3.19')
-        mel.eval('setAttr "rRing2.rotateY" -1.4')
-        mel.eval('setAttr "rRing2.rotateZ" -32.05')
-
-        mel.eval('setAttr "lRing3.rotateX" 4.9')
-        mel.eval('setAttr "lRing3.rotateY" 0.17')
-        mel.eval('setAttr "lRing3.rotateZ" 5.06')
-
-        mel.eval('setAttr "rRing3.rotateX" 4.9')
-        mel.eval('setAttr "rRing3.rotateY" -0.17')
-        mel.eval('setAttr "rRing3.rotateZ" -5.06')
-
-        mel.eval('setAttr "lPinky1.rotateX" 6.72')
-        mel.eval('setAttr "lPinky1.rotateY" -12.44')
-        mel.eval('setAttr "lPinky1.rotateZ" 23.36')
-
-        mel.eval('setAttr "rPinky1.rotateX" 6.72')
-        mel.eval('setAttr "rPinky1.rotateY" 12.44')
-        mel.eval('setAttr "rPinky1.rotateZ" -23.36')
+        pose = load_pose_preset(pose_name)
+    except Exception as e:
+        print("DazToMaya ERROR: unable to load pose preset " + pose_name + ": " + str(e))
+        return
 
-        mel.eval('setAttr "lPinky2.rotateX" 7.11')
-        mel.eval('setAttr "lPinky2.rotateY" 6.24')
-        mel.eval('setAttr "lPinky2.rotateZ" 38.7')
+    joints = list(pose.keys())
+    existing_joints = get_scene_index().joint_set
+    missing_joints = [joint for joint in joints if joint not in existing_joints]
+    if missing_joints:
+        print("DazToMaya WARNING: pose preset " + pose_name + " skipped missing joints: " + ", ".join(missing_joints))
+
+    rotations = get_joint_rotations([joint for joint in joints if joint in existing_joints])
+    set_attr_cmds = []
+    for joint, rotation in rotations.items():
+        for attr, value in pose[joint].items():
+            if attr in ROTATE_ATTRS:
+                current_value = rotation[ROTATE_ATTRS.index(attr)]
+            else:
+                current_value = cmds.getAttr(joint + "." + attr)
+            if abs(current_value - float(value)) < POSE_TOLERANCE:
+                continue
+            set_attr_cmds.append('setAttr "%s.%s" %s;' % (joint, attr, repr(float(value))))
+    run_mel_batch(set_attr_cmds, "pose " + pose_name)
 
-        mel.eval('setAttr "rPinky2.rotateX" 7.11')
-        mel.eval('setAttr "rPinky2.rotateY" -6.24')
-        mel.eval('setAttr "rPinky2.rotateZ" -38.7')
 
-        mel.eval('setAttr "lPinky3.rotateX" 0.0')
-        mel.eval('setAttr "lPinky3.rotateY" 0.0')
-        mel.eval('setAttr "lPinky3.rotateZ" -0.0')
+def apply_rest_pose(pose_name):
+    """
+    T-pose the figure from the DTU data if it has it, else apply the pose preset of its generation
+    """
+    if use_dtu_rest_pose:
+        try:
+            if tpose.apply_dtu_t_pose(global_current_dtu, get_figure_profile().root_joint):
+                return
+        except Exception as e:
+            print("DazToMaya WARNING: T-pose from DTU data failed (" + str(e) + "), using pose preset " + pose_name)
+    apply_pose_preset(pose_name)
 
-        mel.eval('setAttr "rPinky3.rotateX" 0.0')
-        mel.eval('setAttr "rPinky3.rotateY" -0.0')
-        mel.eval('setAttr "rPinky3.rotateZ" 0.0')
 
-        mel.eval('setAttr "lFoot.rotateX" -0.1')
-        mel.eval('setAttr "lFoot.rotateY" -11.32')
-        mel.eval('setAttr "lFoot.rotateZ" 3.78')
+def sentinel_rotations_fix():
+    apply_rest_pose("sentinel")
 
-        mel.eval('setAttr "rFoot.rotateX" -0.1')
-        mel.eval('setAttr "rFoot.rotateY" 11.32')
-        mel.eval('setAttr "rFoot.rotateZ" -3.78')
 
-    except:
-        print("Gen1RotsFix...")
+def gen1_rotations_fix():
+    apply_rest_pose("genesis1")
 
 
-# TODO: Remove hardocing
 def gen2_rotations_fix():
-    try:
-        mel.eval('setAttr "lShldr.rotateX" -0.0')
-        mel.eval('setAttr "lShldr.rotateY" 5.44')
-        mel.eval('setAttr "lShldr.rotateZ" 1.87')
-
-        mel.eval('setAttr "rShldr.rotateX" -0.0')
-        mel.eval('setAttr "rShldr.rotateY" -5.44')
-        mel.eval('setAttr "rShldr.rotateZ" -1.87')
-
-        mel.eval('setAttr "lForeArm.rotateX" 0.62')
-        mel.eval('setAttr "lForeArm.rotateY" 20.19')
-        mel.eval('setAttr "lForeArm.rotateZ" -1.69')
-
-        mel.eval('setAttr "rForeArm.rotateX" 0.62')
-        mel.eval('setAttr "rForeArm.rotateY" -20.19')
-        mel.eval('setAttr "rForeArm.rotateZ" 1.69')
-
-        mel.eval('setAttr "lHand.rotateX" 15.11')
-        mel.eval('setAttr "lHand.rotateY" -0.28')
-        mel.eval('setAttr "lHand.rotateZ" -0.59')
-
-        mel.eval('setAttr "rHand.rotateX" 15.11')
-        mel.eval('setAttr "rHand.rotateY" 0.28')
-        mel.eval('setAttr "rHand.rotateZ" 0.59')
-
-        mel.eval('setAttr "lThumb1.rotateX" -0.0')
-        mel.eval('setAttr "lThumb1.rotateY" -0.0')
-        mel.eval('setAttr "lThumb1.rotateZ" 0.0')
-
-        mel.eval('setAttr "rThumb1.rotateX" -0.0')
-        mel.eval('setAttr "rThumb1.rotateY" 0.0')
-        mel.eval('setAttr "rThumb1.rotateZ" -0.0')
-
-        mel.eval('setAttr "lThumb2.rotateX" -0.0')
-        mel.eval('setAttr "lThumb2.rotateY" -0.0')
-        mel.eval('setAttr "lThumb2.rotateZ" -0.0')
-
-        mel.eval('setAttr "rThumb2.rotateX" -0.0')
-        mel.eval('setAttr "rThumb2.rotateY" 0.0')
-        mel.eval('setAttr "rThumb2.rotateZ" 0.0')
-
-        mel.eval('setAttr "lThumb3.rotateX" 0.0')
-        mel.eval('setAttr "lThumb3.rotateY" -0.0')
-        mel.eval('setAttr "lThumb3.rotateZ" -0.0')
-
-        mel.eval('setAttr "rThumb3.rotateX" 0.0')
-        mel.eval('setAttr "rThumb3.rotateY" 0.0')
-        mel.eval('setAttr "rThumb3.rotateZ" 0.0')
-
-        mel.eval('setAttr "lCarpal1.rotateX" -0.29')
-        mel.eval('setAttr "lCarpal1.rotateY" -0.4')
-        mel.eval('setAttr "lCarpal1.rotateZ" -2.3')
-
-        mel.eval('setAttr "rCarpal1.rotateX" -0.29')
-        mel.eval('setAttr "rCarpal1.rotateY" 0.4')
-        mel.eval('setAttr "rCarpal1.rotateZ" 2.3')
-
-        mel.eval('setAttr "lIndex1.rotateX" 0.15')
-        mel.eval('setAttr "lIndex1.rotateY" 10.31')
-        mel.eval('setAttr "lIndex1.rotateZ" 0.16')
-
-        mel.eval('setAttr "rIndex1.rotateX" 0.15')
-        mel.eval('setAttr "rIndex1.rotateY" -10.31')
-        mel.eval('setAttr "rIndex1.rotateZ" -0.16')
-
-        mel.eval('setAttr "lIndex2.rotateX" -1.01')
-        mel.eval('setAttr "lIndex2.rotateY" -0.08')
-        mel.eval('setAttr "lIndex2.rotateZ" 13.96')
+    apply_rest_pose("genesis2")
 
-        mel.eval('setAttr "rIndex2.rotateX" -1.01')
-        mel.eval('setAttr "rIndex2.rotateY" 0.08')
-        mel.eval('setAttr "rIndex2.rotateZ" -13.96')
 
-        mel.eval('setAttr "lIndex3.rotateX" -0.0')
-        mel.eval('setAttr "lIndex3.rotateY" 0.0')
-        mel.eval('setAttr "lIndex3.rotateZ" 0.0')
-
-        mel.eval('setAttr "rIndex3.rotateX" -0.0')
-        mel.eval('setAttr "rIndex3.rotateY" -0.0')
-        mel.eval('setAttr "rIndex3.rotateZ" -0.0')
-
-        mel.eval('setAttr "lMid1.rotateX" 5.85')
-        mel.eval('setAttr "lMid1.rotateY" 2.88')
-        mel.eval('setAttr "lMid1.rotateZ" -0.0')
-
-        mel.eval('setAttr "rMid1.rotateX" 5.85')
-        mel.eval('setAttr "rMid1.rotateY" -2.88')
-        mel.eval('setAttr "rMid1.rotateZ" 0.0')
-
-        mel.eval('setAttr "lMid2.rotateX" 0.0')
-        mel.eval('setAttr "lMid2.rotateY" 0.0')
-        mel.eval('setAttr "lMid2.rotateZ" 9.13')
-
-        mel.eval('setAttr "rMid2.rotateX" 0.0')
-        mel.eval('setAttr "rMid2.rotateY" -0.0')
-        mel.eval('setAttr "rMid2.rotateZ" -9.13')
-
-        mel.eval('setAttr "lMid3.rotateX" -0.0')
-        mel.eval('setAttr "lMid3.rotateY" 0.0')
-        mel.eval('setAttr "lMid3.rotateZ" 0.0')
-
-        mel.eval('setAttr "rMid3.rotateX" -0.0')
-        mel.eval('setAttr "rMid3.rotateY" -0.0')
-        mel.eval('setAttr "rMid3.rotateZ" -0.0')
-
-        mel.eval('setAttr "lCarpal2.rotateX" 0.11')
-        mel.eval('setAttr "lCarpal2.rotateY" 0.02')
-        mel.eval('setAttr "lCarpal2.rotateZ" -0.72')
-
-        mel.eval('setAttr "rCarpal2.rotateX" 0.11')
-        mel.eval('setAttr "rCarpal2.rotateY" -0.02')
-        mel.eval('setAttr "rCarpal2.rotateZ" 0.72')
-
-        mel.eval('setAttr "lRing1.rotateX" 2.91')
-        mel.eval('setAttr "lRing1.rotateY" -4.8')
-        mel.eval('setAttr "lRing1.rotateZ" -0.0')
-
-        mel.eval('setAttr "rRing1.rotateX" 2.91')
-        mel.eval('setAttr "rRing1.rotateY" 4.8')
-        mel.eval('setAttr "rRing1.rotateZ" 0.0')
-
-        mel.eval('setAttr "lRing2.rotateX" 12.88')
-        mel.eval('setAttr "lRing2.rotateY" 1.94')
-        mel.eval('setAttr "lRing2.rotateZ" 7.8')
-
-        mel.eval('setAttr "rRing2.rotateX" 12.88')
-        mel.eval('setAttr "rRing2.rotateY" -1.94')
-        mel.eval('setAttr "rRing2.rotateZ" -7.8')
-
-        mel.eval('setAttr "lRing3.rotateX" 0.0')
-        mel.eval('setAttr "lRing3.rotateY" -0.0')
-        mel.eval('setAttr "lRing3.rotateZ" 0.0')
-
-        mel.eval('setAttr "rRing3.rotateX" 0.0')
-        mel.eval('setAttr "rRing3.rotateY" 0.0')
-        mel.eval('setAttr "rRing3.rotateZ" -0.0')
-
-        mel.eval('setAttr "lPinky1.rotateX" 0.0')
-        mel.eval('setAttr "lPinky1.rotateY" -6.84')
-        mel.eval('setAttr "lPinky1.rotateZ" 0.0')
-
-        mel.eval('setAttr "rPinky1.rotateX" 0.0')
-        mel.eval('setAttr "rPinky1.rotateY" 6.84')
-        mel.eval('setAttr "rPinky1.rotateZ" -0.0')
-
-        mel.eval('setAttr "lPinky2.rotateX" 0.0')
-        mel.eval('setAttr "lPinky2.rotateY" 0.0')
-        mel.eval('setAttr "lPinky2.rotateZ" 10.86')
-
-        mel.eval('setAttr "rPinky2.rotateX" 0.0')
-        mel.eval('setAttr "rPinky2.rotateY" -0.0')
-        mel.eval('setAttr "rPinky2.rotateZ" -10.86')
-
-        mel.eval('setAttr "lPinky3.rotateX" -0.0')
-        mel.eval('setAttr "lPinky3.rotateY" -0.0')
-        mel.eval('setAttr "lPinky3.rotateZ" 0.0')
-
-        mel.eval('setAttr "rPinky3.rotateX" -0.0')
-        mel.eval('setAttr "rPinky3.rotateY" 0.0')
-        mel.eval('setAttr "rPinky3.rotateZ" -0.0')
-    except:
-        print("Gen2RotsFix...")
-
-
-# TODO: Remove hardocing
 def gen3_rotations_fix():
-    # ---------------------------------------------------------
-    try:
-        mel.eval('setAttr "lShldrBend.rotateX" 0.11')
-        mel.eval('setAttr "lShldrBend.rotateY" 2.52')
-        mel.eval('setAttr "lShldrBend.rotateZ" 3.86')
-
-        mel.eval('setAttr "rShldrBend.rotateX" 0.11')
-        mel.eval('setAttr "rShldrBend.rotateY" -2.52')
-        mel.eval('setAttr "rShldrBend.rotateZ" -3.86')
-
-        mel.eval('setAttr "lForearmBend.rotateX" -0.29')
-        mel.eval('setAttr "lForearmBend.rotateY" 12.71')
-        mel.eval('setAttr "lForearmBend.rotateZ" -3.95')
-
-        mel.eval('setAttr "rForearmBend.rotateX" -0.29')
-        mel.eval('setAttr "rForearmBend.rotateY" -12.71')
-        mel.eval('setAttr "rForearmBend.rotateZ" 3.95')
-
-        mel.eval('setAttr "lHand.rotateX" 0.03')
-        mel.eval('setAttr "lHand.rotateY" -14.23')
-        mel.eval('setAttr "lHand.rotateZ" 1.77')
-
-        mel.eval('setAttr "rHand.rotateX" 0.03')
-        mel.eval('setAttr "rHand.rotateY" 14.23')
-        mel.eval('setAttr "rHand.rotateZ" -1.77')
-
-        mel.eval('setAttr "lThumb1.rotateX" 0.0')
-        mel.eval('setAttr "lThumb1.rotateY" 0.0')
-        mel.eval('setAttr "lThumb1.rotateZ" -0.0')
-
-        mel.eval('setAttr "rThumb1.rotateX" 0.0')
-        mel.eval('setAttr "rThumb1.rotateY" -0.0')
-        mel.eval('setAttr "rThumb1.rotateZ" 0.0')
-
-        mel.eval('setAttr "lThumb2.rotateX" 0.0')
-        mel.eval('setAttr "lThumb2.rotateY" -0.0')
-        mel.eval('setAttr "lThumb2.rotateZ" 0.0')
-
-        mel.eval('setAttr "rThumb2.rotateX" 0.0')
-        mel.eval('setAttr "rThumb2.rotateY" 0.0')
-        mel.eval('setAttr "rThumb2.rotateZ" -0.0')
-
-        mel.eval('setAttr "lThumb3.rotateX" -0.0')
-        mel.eval('setAttr "lThumb3.rotateY" -0.0')
-        mel.eval('setAttr "lThumb3.rotateZ" -0.0')
-
-        mel.eval('setAttr "rThumb3.rotateX" -0.0')
-        mel.eval('setAttr "rThumb3.rotateY" 0.0')
-        mel.eval('setAttr "rThumb3.rotateZ" 0.0')
-
-        mel.eval('setAttr "lCarpal1.rotateX" 0.0')
-        mel.eval('setAttr "lCarpal1.rotateY" -0.0')
-        mel.eval('setAttr "lCarpal1.rotateZ" -0.0')
-
-        mel.eval('setAttr "rCarpal1.rotateX" 0.0')
-        mel.eval('setAttr "rCarpal1.rotateY" 0.0')
-        mel.eval('setAttr "rCarpal1.rotateZ" 0.0')
-
-        mel.eval('setAttr "lIndex1.rotateX" -2.07')
-        mel.eval('setAttr "lIndex1.rotateY" 12.03')
-        mel.eval('setAttr "lIndex1.rotateZ" 2.8')
-
-        mel.eval('setAttr "rIndex1.rotateX" -2.07')
-        mel.eval('setAttr "rIndex1.rotateY" -12.03')
-        mel.eval('setAttr "rIndex1.rotateZ" -2.8')
-
-        mel.eval('setAttr "lIndex2.rotateX" 0.31')
-        mel.eval('setAttr "lIndex2.rotateY" -4.02')
-        mel.eval('setAttr "lIndex2.rotateZ" 1.4')
-
-        mel.eval('setAttr "rIndex2.rotateX" 0.31')
-        mel.eval('setAttr "rIndex2.rotateY" 4.02')
-        mel.eval('setAttr "rIndex2.rotateZ" -1.4')
-
-        mel.eval('setAttr "lIndex3.rotateX" 2.13')
-        mel.eval('setAttr "lIndex3.rotateY" -2.89')
-        mel.eval('setAttr "lIndex3.rotateZ" 0.5')
-
-        mel.eval('setAttr "rIndex3.rotateX" 2.13')
-        mel.eval('setAttr "rIndex3.rotateY" 2.89')
-        mel.eval('setAttr "rIndex3.rotateZ" -0.5')
-
-        mel.eval('setAttr "lCarpal2.rotateX" 0.0')
-        mel.eval('setAttr "lCarpal2.rotateY" -0.0')
-        mel.eval('setAttr "lCarpal2.rotateZ" -0.0')
-
-        mel.eval('setAttr "rCarpal2.rotateX" 0.0')
-        mel.eval('setAttr "rCarpal2.rotateY" 0.0')
-        mel.eval('setAttr "rCarpal2.rotateZ" 0.0')
-
-        mel.eval('setAttr "lMid1.rotateX" -0.08')
-        mel.eval('setAttr "lMid1.rotateY" 4.74')
-        mel.eval('setAttr "lMid1.rotateZ" -1.14')
-
-        mel.eval('setAttr "rMid1.rotateX" -0.08')
-        mel.eval('setAttr "rMid1.rotateY" -4.74')
-        mel.eval('setAttr "rMid1.rotateZ" 1.14')
-
-        mel.eval('setAttr "lMid2.rotateX" 0.23')
-        mel.eval('setAttr "lMid2.rotateY" 3.23')
-        mel.eval('setAttr "lMid2.rotateZ" 7.72')
-
-        mel.eval('setAttr "rMid2.rotateX" 0.23')
-        mel.eval('setAttr "rMid2.rotateY" -3.23')
-        mel.eval('setAttr "rMid2.rotateZ" -7.72')
-
-        mel.eval('setAttr "lMid3.rotateX" 0.0')
-        mel.eval('setAttr "lMid3.rotateY" -6.76')
-        mel.eval('setAttr "lMid3.rotateZ" -6.91')
-
-        mel.eval('setAttr "rMid3.rotateX" 0.0')
-        mel.eval('setAttr "rMid3.rotateY" 6.76')
-        mel.eval('setAttr "rMid3.rotateZ" 6.91')
-
-        mel.eval('setAttr "lCarpal3.rotateX" 0.0')
-        mel.eval('setAttr "lCarpal3.rotateY" -0.0')
-        mel.eval('setAttr "lCarpal3.rotateZ" 0.0')
-
-        mel.eval('setAttr "rCarpal3.rotateX" 0.0')
-        mel.eval('setAttr "rCarpal3.rotateY" 0.0')
-        mel.eval('setAttr "rCarpal3.rotateZ" -0.0')
-
-        mel.eval('setAttr "lRing1.rotateX" -0.12')
-        mel.eval('setAttr "lRing1.rotateY" 0.03')
-        mel.eval('setAttr "lRing1.rotateZ" 2.52')
-
-        mel.eval('setAttr "rRing1.rotateX" -0.12')
-        mel.eval('setAttr "rRing1.rotateY" -0.03')
-        mel.eval('setAttr "rRing1.rotateZ" -2.52')
-
-        mel.eval('setAttr "lRing2.rotateX" -3.68')
-        mel.eval('setAttr "lRing2.rotateY" 0.14')
-        mel.eval('setAttr "lRing2.rotateZ" 3.24')
-
-        mel.eval('setAttr "rRing2.rotateX" -3.68')
-        mel.eval('setAttr "rRing2.rotateY" -0.14')
-        mel.eval('setAttr "rRing2.rotateZ" -3.24')
-
-        mel.eval('setAttr "lRing3.rotateX" 0.07')
-        mel.eval('setAttr "lRing3.rotateY" -1.88')
-        mel.eval('setAttr "lRing3.rotateZ" -2.16')
-
-        mel.eval('setAttr "rRing3.rotateX" 0.07')
-        mel.eval('setAttr "rRing3.rotateY" 1.88')
-        mel.eval('setAttr "rRing3.rotateZ" 2.16')
-
-        mel.eval('setAttr "lCarpal4.rotateX" 0.0')
-        mel.eval('setAttr "lCarpal4.rotateY" 0.0')
-        mel.eval('setAttr "lCarpal4.rotateZ" 6.12')
-
-        mel.eval('setAttr "rCarpal4.rotateX" 0.0')
-        mel.eval('setAttr "rCarpal4.rotateY" -0.0')
-        mel.eval('setAttr "rCarpal4.rotateZ" -6.12')
-
-        mel.eval('setAttr "lPinky1.rotateX" -0.47')
-        mel.eval('setAttr "lPinky1.rotateY" -3.69')
-        mel.eval('setAttr "lPinky1.rotateZ" -3.95')
-
-        mel.eval('setAttr "rPinky1.rotateX" -0.47')
-        mel.eval('setAttr "rPinky1.rotateY" 3.69')
-        mel.eval('setAttr "rPinky1.rotateZ" 3.95')
-
-        mel.eval('setAttr "lPinky2.rotateX" 4.06')
-        mel.eval('setAttr "lPinky2.rotateY" 0.44')
-        mel.eval('setAttr "lPinky2.rotateZ" 0.13')
-
-        mel.eval('setAttr "rPinky2.rotateX" 4.06')
-        mel.eval('setAttr "rPinky2.rotateY" -0.44')
-        mel.eval('setAttr "rPinky2.rotateZ" -0.13')
-
-        mel.eval('setAttr "lPinky3.rotateX" 0.0')
-        mel.eval('setAttr "lPinky3.rotateY" -1.88')
-        mel.eval('setAttr "lPinky3.rotateZ" 0.0')
-
-        mel.eval('setAttr "rPinky3.rotateX" 0.0')
-        mel.eval('setAttr "rPinky3.rotateY" 1.88')
-        mel.eval('setAttr "rPinky3.rotateZ" -0.0')
-        '''
-        mel.eval('setAttr "lFoot.rotateX" 0.64')
-        mel.eval('setAttr "lFoot.rotateY" -12.87')
-        mel.eval('setAttr "lFoot.rotateZ" 5.7')
-
-        mel.eval('setAttr "rFoot.rotateX" 0.64')
-        mel.eval('setAttr "rFoot.rotateY" 12.87')
-        mel.eval('setAttr "rFoot.rotateZ" -5.7')
-        '''
-    except:
-        print("Gen3RotsFix...")
-
-
-# TODO: Remove hardocing
-def gen8_rotations_fix():
-    global global_current_dtu
-    if global_current_dtu is None or global_current_dtu.hasAnimation():
-        return
-    # ---------------------------------------------------------
-    try:
-        mel.eval('setAttr "lShldrBend.rotateX" 0.0')
-        mel.eval('setAttr "lShldrBend.rotateY" 0.0')
-        mel.eval('setAttr "lShldrBend.rotateZ" 48.24')
-        # 45.75
-
-        mel.eval('setAttr "rShldrBend.rotateX" 0.0')
-        mel.eval('setAttr "rShldrBend.rotateY" -0.0')
-        mel.eval('setAttr "rShldrBend.rotateZ" -48.24')
-
-        mel.eval('setAttr "lForearmBend.rotateX" 1.16')
-        mel.eval('setAttr "lForearmBend.rotateY" 15.49')
-        mel.eval('setAttr "lForearmBend.rotateZ" -4.2')
-
-        mel.eval('setAttr "rForearmBend.rotateX" 1.16')
-        mel.eval('setAttr "rForearmBend.rotateY" -15.49')
-        mel.eval('setAttr "rForearmBend.rotateZ" 4.2')
-
-        mel.eval('setAttr "lHand.rotateX" 0.0')
-        mel.eval('setAttr "lHand.rotateY" -13.76')
-        mel.eval('setAttr "lHand.rotateZ" 0.0')
-
-        mel.eval('setAttr "rHand.rotateX" 0.0')
-        mel.eval('setAttr "rHand.rotateY" 13.76')
-        mel.eval('setAttr "rHand.rotateZ" -0.0')
-
-        mel.eval('setAttr "lThumb1.rotateX" -0.0')
-        mel.eval('setAttr "lThumb1.rotateY" -0.0')
-        mel.eval('setAttr "lThumb1.rotateZ" -0.0')
-
-        mel.eval('setAttr "rThumb1.rotateX" -0.0')
-        mel.eval('setAttr "rThumb1.rotateY" 0.0')
-        mel.eval('setAttr "rThumb1.rotateZ" 0.0')
-
-        mel.eval('setAttr "lThumb2.rotateX" -0.0')
-        mel.eval('setAttr "lThumb2.rotateY" -0.0')
-        mel.eval('setAttr "lThumb2.rotateZ" -0.0')
-
-        mel.eval('setAttr "rThumb2.rotateX" -0.0')
-        mel.eval('setAttr "rThumb2.rotateY" 0.0')
-        mel.eval('setAttr "rThumb2.rotateZ" 0.0')
-
-        mel.eval('setAttr "lThumb3.rotateX" -0.0')
-        mel.eval('setAttr "lThumb3.rotateY" -0.0')
-        mel.eval('setAttr "lThumb3.rotateZ" -0.0')
-
-        mel.eval('setAttr "rThumb3.rotateX" -0.0')
-        mel.eval('setAttr "rThumb3.rotateY" 0.0')
-        mel.eval('setAttr "rThumb3.rotateZ" 0.0')
-
-        mel.eval('setAttr "lCarpal1.rotateX" -0.0')
-        mel.eval('setAttr "lCarpal1.rotateY" -0.0')
-        mel.eval('setAttr "lCarpal1.rotateZ" -0.0')
-
-        mel.eval('setAttr "rCarpal1.rotateX" -0.0')
-        mel.eval('setAttr "rCarpal1.rotateY" 0.0')
-        mel.eval('setAttr "rCarpal1.rotateZ" 0.0')
-
-        mel.eval('setAttr "lIndex1.rotateX" -0.0')
-        mel.eval('setAttr "lIndex1.rotateY" 0.0')
-        mel.eval('setAttr "lIndex1.rotateZ" -0.0')
-
-        mel.eval('setAttr "rIndex1.rotateX" -0.0')
-        mel.eval('setAttr "rIndex1.rotateY" -0.0')
-        mel.eval('setAttr "rIndex1.rotateZ" 0.0')
-
-        mel.eval('setAttr "lIndex2.rotateX" -0.0')
-        mel.eval('setAttr "lIndex2.rotateY" -0.0')
-        mel.eval('setAttr "lIndex2.rotateZ" -0.0')
-
-        mel.eval('setAttr "rIndex2.rotateX" -0.0')
-        mel.eval('setAttr "rIndex2.rotateY" 0.0')
-        mel.eval('setAttr "rIndex2.rotateZ" 0.0')
-
-        mel.eval('setAttr "lIndex3.rotateX" -0.0')
-        mel.eval('setAttr "lIndex3.rotateY" -0.0')
-        mel.eval('setAttr "lIndex3.rotateZ" -0.0')
-
-        mel.eval('setAttr "rIndex3.rotateX" -0.0')
-        mel.eval('setAttr "rIndex3.rotateY" 0.0')
-        mel.eval('setAttr "rIndex3.rotateZ" 0.0')
-
-        mel.eval('setAttr "lCarpal2.rotateX" -0.0')
-        mel.eval('setAttr "lCarpal2.rotateY" 0.0')
-        mel.eval('setAttr "lCarpal2.rotateZ" -0.0')
-
-        mel.eval('setAttr "rCarpal2.rotateX" -0.0')
-        mel.eval('setAttr "rCarpal2.rotateY" -0.0')
-        mel.eval('setAttr "rCarpal2.rotateZ" 0.0')
-
-        mel.eval('setAttr "lMid1.rotateX" -0.0')
-        mel.eval('setAttr "lMid1.rotateY" -0.0')
-        mel.eval('setAttr "lMid1.rotateZ" -0.0')
-
-        mel.eval('setAttr "rMid1.rotateX" -0.0')
-        mel.eval('setAttr "rMid1.rotateY" 0.0')
-        mel.eval('setAttr "rMid1.rotateZ" 0.0')
-
-        mel.eval('setAttr "lMid2.rotateX" -0.0')
-        mel.eval('setAttr "lMid2.rotateY" -0.0')
-        mel.eval('setAttr "lMid2.rotateZ" 0.0')
-
-        mel.eval('setAttr "rMid2.rotateX" -0.0')
-        mel.eval('setAttr "rMid2.rotateY" 0.0')
-        mel.eval('setAttr "rMid2.rotateZ" -0.0')
-
-        mel.eval('setAttr "lMid3.rotateX" -0.0')
-        mel.eval('setAttr "lMid3.rotateY" -0.0')
-        mel.eval('setAttr "lMid3.rotateZ" -0.0')
-
-        mel.eval('setAttr "rMid3.rotateX" -0.0')
-        mel.eval('setAttr "rMid3.rotateY" 0.0')
-        mel.eval('setAttr "rMid3.rotateZ" 0.0')
-
-        mel.eval('setAttr "lCarpal3.rotateX" -0.0')
-        mel.eval('setAttr "lCarpal3.rotateY" 0.0')
-        mel.eval('setAttr "lCarpal3.rotateZ" -0.0')
-
-        mel.eval('setAttr "rCarpal3.rotateX" -0.0')
-        mel.eval('setAttr "rCarpal3.rotateY" -0.0')
-        mel.eval('setAttr "rCarpal3.rotateZ" 0.0')
-
-        mel.eval('setAttr "lRing1.rotateX" -0.0')
-        mel.eval('setAttr "lRing1.rotateY" 0.0')
-        mel.eval('setAttr "lRing1.rotateZ" -0.0')
-
-        mel.eval('setAttr "rRing1.rotateX" -0.0')
-        mel.eval('setAttr "rRing1.rotateY" -0.0')
-        mel.eval('setAttr "rRing1.rotateZ" 0.0')
-
-        mel.eval('setAttr "lRing2.rotateX" -0.0')
-        mel.eval('setAttr "lRing2.rotateY" 0.0')
-        mel.eval('setAttr "lRing2.rotateZ" -0.0')
-
-        mel.eval('setAttr "rRing2.rotateX" -0.0')
-        mel.eval('setAttr "rRing2.rotateY" -0.0')
-        mel.eval('setAttr "rRing2.rotateZ" 0.0')
-
-        mel.eval('setAttr "lRing3.rotateX" -0.0')
-        mel.eval('setAttr "lRing3.rotateY" 0.0')
-        mel.eval('setAttr "lRing3.rotateZ" -0.0')
-
-        mel.eval('setAttr "rRing3.rotateX" -0.0')
-        mel.eval('setAttr "rRing3.rotateY" -0.0')
-        mel.eval('setAttr "rRing3.rotateZ" 0.0')
-
-        mel.eval('setAttr "lCarpal4.rotateX" -0.0')
-        mel.eval('setAttr "lCarpal4.rotateY" 0.0')
-        mel.eval('setAttr "lCarpal4.rotateZ" -0.0')
-
-        mel.eval('setAttr "rCarpal4.rotateX" -0.0')
-        mel.eval('setAttr "rCarpal4.rotateY" -0.0')
-        mel.eval('setAttr "rCarpal4.rotateZ" 0.0')
-
-        mel.eval('setAttr "lPinky1.rotateX" -0.0')
-        mel.eval('setAttr "lPinky1.rotateY" -0.0')
-        mel.eval('setAttr "lPinky1.rotateZ" -0.0')
-
-        mel.eval('setAttr "rPinky1.rotateX" -0.0')
-        mel.eval('setAttr "rPinky1.rotateY" 0.0')
-        mel.eval('setAttr "rPinky1.rotateZ" 0.0')
-
-        mel.eval('setAttr "lPinky2.rotateX" -0.0')
-        mel.eval('setAttr "lPinky2.rotateY" -0.0')
-        mel.eval('setAttr "lPinky2.rotateZ" 0.0')
-
-        mel.eval('setAttr "rPinky2.rotateX" -0.0')
-        mel.eval('setAttr "rPinky2.rotateY" 0.0')
-        mel.eval('setAttr "rPinky2.rotateZ" -0.0')
-
-        mel.eval('setAttr "lPinky3.rotateX" -0.0')
-        mel.eval('setAttr "lPinky3.rotateY" -0.0')
-        mel.eval('setAttr "lPinky3.rotateZ" 0.0')
-
-        mel.eval('setAttr "rPinky3.rotateX" -0.0')
-        mel.eval('setAttr "rPinky3.rotateY" 0.0')
-        mel.eval('setAttr "rPinky3.rotateZ" -0.0')
-
-        mel.eval('setAttr "lShin.rotateX" 0.0')
-        mel.eval('setAttr "lShin.rotateY" -9.66')
-        mel.eval('setAttr "lShin.rotateZ" 0.0')
-
-        mel.eval('setAttr "rShin.rotateX" 0.0')
-        mel.eval('setAttr "rShin.rotateY" 9.66')
-        mel.eval('setAttr "rShin.rotateZ" -0.0')
-
-        mel.eval('setAttr "lThighBend.rotateX" 0.54')
-        mel.eval('setAttr "lThighBend.rotateY" -0.16')
-        mel.eval('setAttr "lThighBend.rotateZ" -6.23')
-
-        mel.eval('setAttr "rThighBend.rotateX" 0.54')
-        mel.eval('setAttr "rThighBend.rotateY" 0.16')
-        mel.eval('setAttr "rThighBend.rotateZ" 6.23')
-        '''
-        mel.eval('setAttr "lFoot.rotateX" -1.96')
-        mel.eval('setAttr "lFoot.rotateY" -4.88')
-        mel.eval('setAttr "lFoot.rotateZ" 3.53')
-
-        mel.eval('setAttr "rFoot.rotateX" -1.96')
-        mel.eval('setAttr "rFoot.rotateY" 4.88')
-        mel.eval('setAttr "rFoot.rotateZ" -3.53')
-        '''
-    except:
-        print("Gen8RotsFix...")
-
-
-def moisture_mat_fix(material_name):
-    try:
-        cmds.setAttr(material_name + '.transparency', 1, 1, 1, type='double3')
-    except:
-        pass
-    try:
-        cmds.setAttr(material_name + '.specularColor', 0.279221, 0.279221, 0.279221, type='double3')
-    except:
-        pass
-    try:
-        cmds.setAttr(material_name + '.cosinePower', 91.727273)
-    except:
-        pass
-    try:
-        cmds.setAttr(material_name + '.color', 1, 1, 1, type='double3')
-    except:
-        pass
-
+    apply_rest_pose("genesis3")
 
-def moisture_texture_fix(material_name):
-    # Query the connection between the material's transparency attribute and the texture's outColor attribute
-    try:
-        connections = cmds.listConnections(material_name + '.transparency', source=True, destination=False, plugs=True)
-    except:
-        return
-    # If a connection is found, extract the texture's name and set the "Alpha Gain" parameter to 0.5
-    if connections:
-        texture_connection = connections[0]
-        texture_name = texture_connection.split('.')[0]
-        cmds.setAttr(texture_name + '.alphaGain', 0.25)
-
-def gen9_mat_fix():
-    moisture_mat_fix("EyeMoisture_Left")
-    moisture_mat_fix("EyeMoisture_Right")
-
-def gen8_mat_fix():
-    # try:
-    #     mel.eval('setAttr "EyeMoisture.transparency" -type double3 1 1 1')
-    # except:
-    #     pass
-    # try:
-    #     mel.eval(
-    #         'setAttr "EyeMoisture.specularColor" -type double3 0.279221 0.279221 0.279221')
-    # except:
-    #     pass
-    # try:
-    #     mel.eval('setAttr "EyeMoisture.cosinePower" 91.727273')
-    # except:
-    #     pass
-    # try:
-    #     mel.eval('setAttr "EyeMoisture.color" -type double3 1 1 1')
-    # except:
-    #     pass
-    moisture_mat_fix("EyeMoisture")
-    moisture_texture_fix("Tear")
 
-    try:
-        mel.eval('setAttr "Cornea.cosinePower" 64.36364')
-    except:
-        pass
-    try:
-        mel.eval(
-            'setAttr "Cornea.specularColor" -type double3 0.75974 0.75974 0.75974')
-    except:
-        pass
-    try:
-        mel.eval('setAttr "Cornea.transparency" -type double3 1 1 1')
-    except:
-        pass
+def gen8_rotations_fix():
+    global global_current_dtu
+    if global_current_dtu is None or global_current_dtu.hasAnimation():
+        return
+    apply_rest_pose("genesis8")
+
 
 
 def sentinel_extra_finger():
@@ -2080,49 +1195,113 @@ def sentinel_extra_finger():
     mel.eval('setAttr "rThumb3.translateX" -1.98')
     mel.eval('setAttr "rThumb3.translateY" -1.62')
     mel.eval('setAttr "rThumb3.translateZ" 0.53')
+    invalidate_scene_index()
 
 
-def remove_limits():
-    meshes_list = mel.eval('ls -type joint')
-    for mesh in meshes_list:
-        mel.eval('transformLimits -rx -20 20 -erx 0 0 %s' % mesh)
-        mel.eval('transformLimits -ry -20 20 -ery 0 0 %s' % mesh)
-        mel.eval('transformLimits -rz -25 25 -erz 0 0 %s' % mesh)
+def get_joint_limits(dtu_loader):
+    """
+    Joint -> (rotation order, [x min, x max, y min, y max, z min, z max]) from the DTU LimitData,
+    entries are [name, rotation order, x min, x max, y min, y max, z min, z max]
+    """
+    if dtu_loader is None:
+        return {}
+    try:
+        bone_limits_dict = dtu_loader.get_bone_limits_dict()
+    except Exception:
+        return {}
+    joint_limits = {}
+    for joint_name, limit_data in bone_limits_dict.items():
+        if len(limit_data) >= 8:
+            rotation_order = str(limit_data[1]).lower()
+            if rotation_order not in ROTATE_ORDERS:
+                rotation_order = ""
+            joint_limits[joint_name] = (rotation_order, [float(value) for value in limit_data[2:8]])
+    return joint_limits
+
+
+def run_mel_batch(mel_cmds, description):
+    """
+    Run mel commands in one call, falling back to one command at a time if the batch fails so
+    one bad command does not stop the others
+    """
+    if not mel_cmds:
+        return
+    try:
+        mel.eval("\n".join(mel_cmds))
+    except Exception as e:
+        print("DazToMaya WARNING: batched " + description + " failed (" + str(e) + "), applying one at a time...")
+        for mel_cmd in mel_cmds:
+            try:
+                mel.eval(mel_cmd)
+            except Exception as e:
+                print("DazToMaya WARNING: " + mel_cmd + " failed: " + str(e))
 
 
-def hide_root_bone():
-    joints_list = mel.eval('ls -type joint')
-    hide_joint = joints_list[0] + ".drawStyle"
-    mel.eval('setAttr %s 2' % hide_joint)
+def get_joint_rotations(joints):
+    return dict((joint, cmds.getAttr(joint + ".rotate")[0]) for joint in joints)
 
 
-def eyelash_fix_gen3():
-    try:
-        mel.eval('disconnectAttr m5philliplashes.outColor Eyelashes.color')
-        mel.eval('setAttr "Eyelashes.color" -type double3 0 0 0')
-    except:
-        pass
+def apply_joint_limits(policy=None, dtu_loader=None):
+    """
+    Set the rotation limits of all the joints in one mel call.  JOINT_LIMITS_CLEAR disables
+    them, JOINT_LIMITS_DTU enables the Daz limits of the joints which have some (full turn
+    ranges stay free) and clears the others, JOINT_LIMITS_KEEP leaves the imported limits.
+    The Daz limits are relative to the Daz rest pose: the joints first get the Daz rotation
+    order (keeping their pose), then each range is offset by the rotation of the joint in the
+    current rest pose, so enabling the limits never clamps that pose.
+    """
+    if policy is None:
+        policy = joint_limits_policy
+    if policy == JOINT_LIMITS_KEEP:
+        return
+    joint_limits = {}
+    if policy == JOINT_LIMITS_DTU:
+        joint_limits = get_joint_limits(dtu_loader)
+        if len(joint_limits) == 0:
+            print("DazToMaya WARNING: no LimitData in the DTU file, joint limits are cleared.")
+
+    joints = get_scene_index().get_joints()
+    limited_joints = [joint for joint in joints if joint in joint_limits]
+    order_cmds = []
+    for joint in limited_joints:
+        rotation_order = joint_limits[joint][0]
+        if rotation_order != "":
+            order_cmds.append('xform -preserve true -rotateOrder %s "%s";' % (rotation_order, joint))
+    run_mel_batch(order_cmds, "joint rotation orders")
+    rest_rotations = get_joint_rotations(limited_joints)
+
+    limit_cmds = []
+    for joint in joints:
+        flags = []
+        limits = None
+        if joint in joint_limits:
+            limits = joint_limits[joint][1]
+        for axis, i in (("x", 0), ("y", 2), ("z", 4)):
+            if limits is not None and limits[i + 1] - limits[i] < 360:
+                rest = rest_rotations[joint][i // 2]
+                flags.append("-r%s %s %s -er%s 1 1" % (axis, repr(limits[i] + rest), repr(limits[i + 1] + rest), axis))
+            else:
+                flags.append("-er%s 0 0" % axis)
+        limit_cmds.append('transformLimits %s "%s";' % (" ".join(flags), joint))
+    run_mel_batch(limit_cmds, "joint limits")
 
+    # enabled limits clamp the rotate values right away, check the rest pose went through
+    clamped_joints = []
+    for joint, rotation in get_joint_rotations(limited_joints).items():
+        if max(abs(a - b) for a, b in zip(rotation, rest_rotations[joint])) > 1e-3:
+            clamped_joints.append(joint)
+    if clamped_joints:
+        print("DazToMaya WARNING: the joint limits moved the rest pose of: " + ", ".join(clamped_joints))
 
-def eyelash_fix():
-    all_objects = mel.eval('ls')
-    for obj in all_objects:
-        try:
-            if "Lashes" in obj:
-                print("Texture: " + obj)
-            if "lash" in obj:
-                lash_mat = obj
-                conn = cmds.listConnections(lash_mat+'.'+"color", type='file')
-        except:
-            pass
 
-    # disconnectAttr M5PhillipLashes.outColor FBXASC054_Eyelash.color;
-    try:
-        mel.eval('disconnectAttr %s.outColor %s.color' % (conn[0], lash_mat))
-        mel.eval('setAttr "%s.color" -type double3 0.051 0.051 0.051'
-                    % lash_mat)
-    except:
-        pass
+def remove_limits():
+    apply_joint_limits(JOINT_LIMITS_CLEAR)
+
+
+def hide_root_bone():
+    joints_list = get_scene_index().get_joints()
+    hide_joint = joints_list[0] + ".drawStyle"
+    mel.eval('setAttr %s 2' % hide_joint)
 
 
 ### DB 2023-July-11 - DO NOT USE. This function only breaks material names since
@@ -2143,7 +1322,7 @@ def clean_mat_names_DO_NOT_USE():
 
 
 def clean_namespace():
-    joints_list = mel.eval('ls -type joint')
+    joints_list = get_scene_index().get_joints()
     for joint in joints_list:
         if ":" in joint:
             try:
@@ -2155,57 +1334,85 @@ def clean_namespace():
                     )
             except:
                 print("namespace msg finished")
+            invalidate_scene_index()
+            invalidate_figure_profile()
     print("namespace fix finished")
 
 
-def scene_renamer():
-    # joints = cmds.ls(type='joint')
-    # mesh_shapes = cmds.ls(type='mesh')
-    # mesh_transforms = cmds.listRelatives(mesh_shapes, parent=True, type='transform', fullPath=False) or []
-    # other_transforms = [x for x in cmds.ls(type='transform', long=True) if x not in mesh_transforms]
-    # fullpath_objs = joints + mesh_transforms + other_transforms
-    # objs = cmds.ls(fullpath_objs, long=False)
-    objs = cmds.ls()
+# FBXASC escapes decoded by scene_renamer(): "-" and "." before the Shape suffix rules,
+# then " ", "!" and the digits
+FBXASC_SEPARATOR_PATTERN = re.compile(r"FBXASC04[56]")
+FBXASC_CHARACTER_PATTERN = re.compile(r"FBXASC0(3[23]|4[89]|5[0-7])")
+FBXASC_CHARACTERS = {"32": "_", "33": "_", "48": "_0", "49": "_1", "50": "_2", "51": "_3",
+                     "52": "_4", "53": "_5", "54": "_6", "55": "_7", "56": "_8", "57": "_9"}
+
+
+def get_renamed_name(name):
+    """
+    Clean node name of scene_renamer(): FBXASC escapes decoded and the Fbx Shape suffixes removed
+    """
+    name = FBXASC_SEPARATOR_PATTERN.sub("_", name)
+    if "ShapeShapeOrig" in name:
+        name = name.replace("ShapeShapeOrig", "ShapeOrig")
+    elif "ShapeShape" in name:
+        name = name.replace("ShapeShape", "Shape")
+    elif "_Shape" in name:
+        name = name.replace("_Shape", "")
+    elif "Shape" in name:
+        name = name.replace("Shape", "")
+    return FBXASC_CHARACTER_PATTERN.sub(lambda match: FBXASC_CHARACTERS[match.group(1)], name)
+
+
+def get_unique_name(name, taken_names):
+    """
+    name, or name followed by the first free number, the way Maya resolves clashing names
+    """
+    if name not in taken_names:
+        return name
+    base_name = name.rstrip("0123456789")
+    number = 1
+    while base_name + str(number) in taken_names:
+        number += 1
+    return base_name + str(number)
 
-    for obj in objs:
-        obj_modified = obj
-        obj_modified = obj.replace("FBXASC045", "_")
-        obj_modified = obj_modified.replace("FBXASC046", "_")
-
-        if "ShapeShapeOrig" in obj_modified:
-            obj_modified = obj_modified.replace("ShapeShapeOrig", "ShapeOrig")
-        elif "ShapeShape" in obj_modified:
-            obj_modified = obj_modified.replace("ShapeShape", "Shape")
-        elif "_Shape" in obj_modified:
-            obj_modified = obj_modified.replace("_Shape", "")
-        elif "Shape" in obj_modified:
-            obj_modified = obj_modified.replace("Shape", "")
-        obj_modified = obj_modified.replace("FBXASC032", "_")
-        obj_modified = obj_modified.replace("FBXASC033", "_")
-        obj_modified = obj_modified.replace("FBXASC048", "_0")
-        obj_modified = obj_modified.replace("FBXASC049", "_1")
-        obj_modified = obj_modified.replace("FBXASC050", "_2")
-        obj_modified = obj_modified.replace("FBXASC051", "_3")
-        obj_modified = obj_modified.replace("FBXASC052", "_4")
-        obj_modified = obj_modified.replace("FBXASC053", "_5")
-        obj_modified = obj_modified.replace("FBXASC054", "_6")
-        obj_modified = obj_modified.replace("FBXASC055", "_7")
-        obj_modified = obj_modified.replace("FBXASC056", "_8")
-        obj_modified = obj_modified.replace("FBXASC057", "_9")
-
-        if "|" in obj_modified:
-            obj_modified = obj_modified.split("|")[-1]
-
-        if obj == obj_modified:
-            pass
-        else:
-            long_name = cmds.ls(obj, long=True)
-            if long_name is not None and len(long_name) > 0:
-                print("Renaming: " + str(long_name) + " to " + obj_modified + "...")
-                try:
-                    cmds.rename(long_name, obj_modified)
-                except Exception as e:
-                    print("Error occured: " + str(e))
+
+def scene_renamer():
+    """
+    Rename the imported nodes with FBXASC escapes or Fbx Shape suffixes.  All new names are worked
+    out first, clashing names get a number, then the nodes are renamed deepest DAG level first so
+    the long names of the nodes still to rename stay valid.
+    """
+    index = get_scene_index()
+    read_only_nodes = set(cmds.ls(readOnly=True) or [])
+
+    # names taken per DAG parent, DG nodes share one namespace under None
+    taken_names = {}
+    candidates = []
+    for long_name in index.get_long_names():
+        parent, name = long_name.rsplit("|", 1) if "|" in long_name else (None, long_name)
+        taken_names.setdefault(parent, set()).add(name)
+        if ("FBXASC" in name or "Shape" in name) and long_name not in read_only_nodes:
+            candidates.append((long_name, parent, name))
+
+    renames = []
+    for long_name, parent, name in candidates:
+        new_name = get_renamed_name(name)
+        if new_name == name or new_name == "":
+            continue
+        siblings = taken_names[parent]
+        siblings.discard(name)
+        new_name = get_unique_name(new_name, siblings)
+        siblings.add(new_name)
+        renames.append((long_name, new_name))
+
+    renames.sort(key=lambda x: x[0].count("|"), reverse=True)
+    for long_name, new_name in renames:
+        print("Renaming: " + long_name + " to " + new_name + "...")
+        try:
+            cmds.rename(long_name, new_name)
+        except Exception as e:
+            print("Error occured: " + str(e))
+    invalidate_scene_index()
 
 
 ## DB 2023-Aug-07: Modify genesis skeletons and generate HIK rig
@@ -2220,20 +1427,24 @@ def auto_ik():
     # cmds.scriptEditorInfo(suppressWarnings=True)
     # cmds.scriptEditorInfo(suppressErrors=True)
 
+    headless = get_import_profile().headless
     try:
         pm.setAttr("defaultRenderGlobals.currentRenderer", "mayaSoftware")
-        mel.eval('FrameAllInAllViews;')
+        if not headless:
+            mel.eval('FrameAllInAllViews;')
     except:
         print("Can't set Software Render")
 
-    joints_list = mel.eval('ls -type joint')
+    joints_list = get_scene_index().get_joints()
 
     count = 0
     for joint in joints_list:
         if "hip" in joint:
             count += 1
 
-    if count > 10000000:
+    if count > 10000000 and headless:
+        print("DazToMaya ERROR: Not valid Scene, when exporting choose 'Merge Clothing Into Figure Skeleton'.")
+    elif count > 10000000:
         error_msg = "Not valid Scene... possible solution: \nWhen export chose 'Merge Clothing Into Figure Skeleton' \nFor more info read the documentation"
 
         result = cmds.confirmDialog(
@@ -2253,131 +1464,97 @@ def auto_ik():
             pass
         clean_namespace()
         # clean_mat_names()
-        eyelash_fix()
-        eyelash_fix_gen3()
+        apply_material_fixes("phong", "lashes")
         hide_root_bone()
-        try:
-            remove_limits()
-        except:
-            pass
+        # the imported limits would clamp the rest pose, clear them unless they are kept
+        if joint_limits_policy != JOINT_LIMITS_KEEP:
+            try:
+                remove_limits()
+            except Exception as e:
+                print("DazToMaya ERROR: unable to clear the joint limits: " + str(e))
 
         # ROTATIONS FIX-----------------------------------
-        #jointsList = mel.eval('ls -type joint')
-        daz_figure = "Not Detected"
-        if "Genesis" in joints_list:
-            daz_figure = "Genesis1"
+        figure_profile = get_figure_profile()
+        print("DazToMaya: " + str(figure_profile))
+        daz_figure = figure_profile.generation
+        if daz_figure == "Sentinel":
+            sentinel_extra_finger()
+            sentinel_rotations_fix()
+        elif daz_figure == "Genesis1":
             gen1_rotations_fix()
-        for joint in joints_list:
-            if "Genesis2" in joint:
-                gen2_rotations_fix()
-                daz_figure = "Genesis2"
-                break
-            if "Genesis3" in joint:
-                gen3_rotations_fix()
-                daz_figure = "Genesis3"
-                break
-            if "SENTINEL" in joint:
-                sentinel_extra_finger()
-                sentinel_rotations_fix()
-                daz_figure = "Sentinel"
-                break
-            if "Genesis8" in joint and not "Genesis8_1" in joint:
-
-                # try:
-                #     gen8_mat_fix()
-                # except:
-                #     pass
-                try:
-                    gen8_rotations_fix()
-                except:
-                    pass
-
-                try:
-                    mel.eval('setAttr "Genesis8Female.drawStyle" 2')
-                except:
-                    pass
-                try:
-                    mel.eval('setAttr "Genesis8Male.drawStyle" 2')
-                except:
-                    pass
-
-                daz_figure = "Genesis8"
-                break
-
-            if "Genesis8" in joint and "Genesis8_1" in joint:
-
-                # try:
-                #     gen8_mat_fix()
-                # except:
-                #     pass
-                try:
-                    gen8_rotations_fix()
-                except:
-                    pass
-
-                try:
-                    mel.eval('setAttr "Genesis8_1Female.drawStyle" 2')
-                except:
-                    pass
-                try:
-                    mel.eval('setAttr "Genesis8_1Male.drawStyle" 2')
-                except:
-                    pass
-
-                daz_figure = "Genesis8_1"
-                break
-
-            if "Genesis9" in joint:
-                try:
-                    gen9_apply_t_pose()
-                except:
-                    pass
-
-                # set DrawStyle for Genesis9 Skeleton to "None"
-                # 2 == None
-                # 0 == Bone
-                try:
-                    mel.eval('setAttr "Genesis9.drawStyle" 2')
-                except:
-                    pass
-
-                daz_figure = "Genesis9"
-                break
+        elif daz_figure == "Genesis2":
+            gen2_rotations_fix()
+        elif daz_figure == "Genesis3":
+            gen3_rotations_fix()
+        elif daz_figure in ("Genesis8", "Genesis8_1"):
+            try:
+                gen8_rotations_fix()
+            except:
+                pass
+        elif daz_figure == "Genesis9":
+            try:
+                gen9_apply_t_pose()
+            except:
+                pass
+        elif use_dtu_rest_pose and global_current_dtu.hasAnimation() == False:
+            # figures without a pose preset can still be T-posed from the DTU data
+            try:
+                tpose.apply_dtu_t_pose(global_current_dtu, figure_profile.root_joint)
+            except Exception as e:
+                print("DazToMaya WARNING: T-pose from DTU data failed: " + str(e))
+
+        # set DrawStyle for Genesis 8, 8.1 and 9 Skeletons to "None"
+        # 2 == None
+        # 0 == Bone
+        if daz_figure in ("Genesis8", "Genesis8_1", "Genesis9") and figure_profile.root_joint != "":
+            try:
+                mel.eval('setAttr "%s.drawStyle" 2' % figure_profile.root_joint)
+            except:
+                pass
 
+        # Daz limits after the rest pose, so the pose fixes are not clamped by them
+        if joint_limits_policy == JOINT_LIMITS_DTU:
+            try:
+                apply_joint_limits(joint_limits_policy, global_current_dtu)
+            except Exception as e:
+                print("DazToMaya ERROR: unable to set the joint limits: " + str(e))
 
         # -----Probar forzar ojos correctos...... agregado para male3 lion-o...
-        if "Genesis8" in daz_figure:
-            gen8_mat_fix()
-        
-        if "Genesis9" in daz_figure:
-            # gen9 needs both
-            gen8_mat_fix()
-            gen9_mat_fix()
+        for fix_name in figure_profile.material_fixes:
+            apply_material_fixes("phong", fix_name)
 
         # ROTATIONS FIX-----------------------------------
         print("------------------------------------")
         print("------------------------------------")
-        clamp_textures()
-        transparency_fix()
+        if not headless:
+            clamp_textures()
+        apply_material_fixes("phong", "transparency")
 
         # try:
         #     morphs.fix_morphs()
         # except:
         #     pass
+        # prune first so lazy morph caches hold sparse deltas too
+        try:
+            blendshapes.prune_sparse_targets()
+        except Exception as e:
+            print("DazToMaya ERROR: blendshape pruning failed: " + str(e))
+        # morphs read the dtu of this import, not the default FIG0 folder
+        morphs.dtu_loader = global_current_dtu
         morphs.fix_morphs()
+        invalidate_scene_index()
 
         scene_modified_check()
         remove_hidden_objs()
 
-        mel.eval('modelEditor -e -displayTextures true modelPanel4')
-
         if daz_figure == "Sentinel":
             sentinel_remove_finger()
 
-        try:
-            mel.eval('modelEditor -e -displayTextures true modelPanel4')
-        except:
-            pass
+        if not headless:
+            try:
+                mel.eval('modelEditor -e -displayTextures true modelPanel4')
+            except:
+                pass
         try:
             mel.eval('setAttr "Genesis3Male.drawStyle" 2')
         except:
@@ -2400,7 +1577,7 @@ def auto_ik():
             pass
         if global_current_dtu.hasAnimation() == False:
             try:
-                if "Genesis9" in daz_figure:
+                if figure_profile.hik_template == "genesis9":
                     map_gen9_to_hik()
                 else:
                     daz_to_ik()
@@ -2408,11 +1585,14 @@ def auto_ik():
             except:
                 pass
 
-            mel.eval('hikCreateControlRig')
+            if hik_control_rig_mode == HIK_RIG_CREATE:
+                mel.eval('hikCreateControlRig')
+            elif hik_control_rig_mode == HIK_RIG_ON_DEMAND:
+                defer_hik_control_rig()
+        # HIK definition, constraints and rig nodes
+        invalidate_scene_index()
 
-        scalp_fix()
-        lash_fix_2()
-        gen8_lagrimal_fix()
+        apply_material_fixes("phong", "extras")
 
         # maya2018_fix()
 
@@ -2420,42 +1600,56 @@ def auto_ik():
         cmds.scriptEditorInfo(suppressErrors=False)
 
 
-def remove_joints_if_prop(parentObj):
-    cacaChilds = cmds.listRelatives(parentObj, allDescendents=True)
-    if "hip" not in cacaChilds:
-        for x in cacaChilds:
-            if cmds.objectType(x) == "joint":
-                try:
-                    cmds.delete(x)
-                except:
-                    pass
-        pass
+def is_in_subtrees(long_name, root_set):
+    """
+    True if a node (long name) is one of the roots in root_set or below one of them
+    """
+    parts = long_name.split("|")
+    return any("|".join(parts[:i]) in root_set for i in range(2, len(parts) + 1))
 
 
-def group_stuff(parent_obj):
-    group_name = parent_obj
-    group_childs = cmds.listRelatives(group_name, allDescendents=True)
-    cmds.spaceLocator(name=group_name+"_Group", p=[0, 0, 0])
-    if len(group_childs) > 1:
-        for o in group_childs:
-            try:
-                cmds.parent(o, world=True)
-                cmds.parent(o, group_name+"_Group")
-            except:
-                pass
+def get_top_level_nodes(long_names):
+    """
+    Nodes of the list which have no ancestor in the list, deleting or moving them takes the others along
+    """
+    name_set = set(long_names)
+    return [long_name for long_name in long_names if not is_in_subtrees(long_name.rsplit("|", 1)[0], name_set)]
 
 
-def get_parents_list():
-    parents_list = []
-    objs_and_joints = mel.eval('ls')
-    for x in objs_and_joints:
-        try:
-            parents = cmds.ls(x, long=True)[0].split('|')[1:-1]
-            if len(parents) == 1:
-                parents_list.append(parents[0])
-        except:
-            pass
-    return parents_list
+def get_prop_hierarchy():
+    """
+    Top level DAG nodes which have children, mapped to their descendants as (long name, type)
+    """
+    hierarchy = dict()
+    for long_name, node_type in get_scene_index().get_dag_nodes():
+        parts = long_name.split("|")
+        if len(parts) > 2:
+            hierarchy.setdefault(parts[1], []).append((long_name, node_type))
+    return hierarchy
+
+
+def group_prop(root, descendants):
+    """
+    Delete the joints of a prop, then move its child subtrees under a new root_Group locator
+    in one parent call and delete the old root
+    """
+    index = get_scene_index()
+    joints = get_top_level_nodes([long_name for long_name, node_type in descendants if node_type == "joint"])
+    if joints:
+        cmds.delete(joints)
+    joint_set = set(joints)
+    remaining = [long_name for long_name, node_type in descendants if not is_in_subtrees(long_name, joint_set)]
+    group = cmds.spaceLocator(name=root + "_Group", p=[0, 0, 0])[0]
+    if len(remaining) > 1:
+        # shapes stay with their transform
+        children = [long_name for long_name in remaining
+                    if long_name.count("|") == 2 and index.get_transform(long_name) is None]
+        if children:
+            cmds.parent(children, group)
+    try:
+        cmds.delete("|" + root)
+    except:
+        pass
 
 
 # DB 2023-July-26: This function is problematic. It's trying to group "props" aka "unrigged meshes" (NOT "properties")
@@ -2465,20 +1659,16 @@ def get_parents_list():
 #    Genesis 2, 3, 8/8.1 and 9.  Everything else will gracefully stop and return False
 #    Actual check for compatible skeleton is done in auto_import_daz().  This function should not be called anywhere else.
 def group_props():
-    parents_list = get_parents_list()
-    for x in parents_list:
+    hierarchy = get_prop_hierarchy()
+    for root, descendants in hierarchy.items():
+        short_names = set(long_name.rsplit("|", 1)[1] for long_name, node_type in descendants)
+        if "hip" in short_names or len(descendants) <= 1:
+            continue
         try:
-            group_childs = cmds.listRelatives(x, allDescendents=True)
-            if "hip" not in group_childs:
-                if len(group_childs) > 1:
-                    remove_joints_if_prop(x)
-                    group_stuff(x)
-                    try:
-                        cmds.delete(x)
-                    except:
-                        pass
+            group_prop(root, descendants)
         except:
             pass
+    invalidate_scene_index()
 
 
 def remove_displacement_maps():
@@ -2514,58 +1704,169 @@ def import_fbx(daz_file_path):
     mel.eval('FBXImportConstraints -v false')
     # mel.eval('FBXImportConvertUnitString dm') --SCALE FIX?....... CHELO
 
-    scale_menu_value = cmds.optionMenu("scaleMenu", query=True, value=True)
-    if scale_menu_value == "Automatic":
-        # FORCE cm Correct Unit....... CHELO
-        mel.eval('FBXImportConvertUnitString cm')
-    if scale_menu_value == "x1 (default)":
-        # FORCE cm Correct Unit....... CHELO
-        mel.eval('FBXImportConvertUnitString cm')
-    if scale_menu_value == "x10 (biger)":
-        # FORCE cm Correct Unit....... CHELO
-        mel.eval('FBXImportConvertUnitString mm')
-    if scale_menu_value == "x0.1 (small)":
-        # FORCE cm Correct Unit....... CHELO
-        mel.eval('FBXImportConvertUnitString dm')
-    if scale_menu_value == "x0.01 (smaller)":
-        # FORCE cm Correct Unit....... CHELO
-        mel.eval('FBXImportConvertUnitString m')
+    mel.eval('FBXImportConvertUnitString %s' % get_import_profile().get_scale_unit())
 
     daz_file_path = daz_file_path.replace('\\', '/')
-    import_cmd = "FBXImport -f \"" + daz_file_path + "\""
-    mel.eval(import_cmd)
+
+    # Morph sidecar: import without shape channels when the deltas of this Fbx are already cached.
+    # Not for animated exports, the shape animation curves come with the Fbx shape channels.
+    sidecar_path = None
+    if use_morph_sidecar and not global_current_dtu.hasAnimation() and blendshapes.has_numpy("Morph sidecar cache"):
+        sidecar_path = blendshapes.get_sidecar_path(daz_file_path)
+    use_sidecar = sidecar_path is not None and os.path.exists(sidecar_path)
+
+    # the sidecar only covers the nodes of this Fbx, not the figures already in a merged scene
+    roots_before = set(cmds.ls(assemblies=True, long=True))
+    blendshapes_before = set(cmds.ls(type="blendShape"))
+
+    import_shapes = mel.eval('FBXImportShapes -q')
+    try:
+        if use_sidecar:
+            mel.eval('FBXImportShapes -v false')
+        else:
+            mel.eval('FBXImportShapes -v true')
+        import_cmd = "FBXImport -f \"" + daz_file_path + "\""
+        mel.eval(import_cmd)
+    finally:
+        mel.eval('FBXImportShapes -v %s' % ("true" if import_shapes else "false"))
+
+    if sidecar_path is not None:
+        new_roots = [root for root in cmds.ls(assemblies=True, long=True) if root not in roots_before]
+        try:
+            if use_sidecar:
+                if not blendshapes.load_sidecar(sidecar_path, new_roots):
+                    print("DazToMaya ERROR: the morph sidecar does not match this import, re-import to get the morphs.")
+            else:
+                new_blendshapes = [node for node in cmds.ls(type="blendShape") if node not in blendshapes_before]
+                blendshapes.save_sidecar(sidecar_path, new_blendshapes, new_roots)
+        except Exception as e:
+            print("DazToMaya ERROR: morph sidecar failed: " + str(e))
+
+
+@contextlib.contextmanager
+def fast_import(keep_undo=True):
+    """
+    Suspend viewport refresh, autosave and the evaluation manager for a block of scene edits,
+    and record them as one undo chunk (keep_undo) or with the undo queue off.  The undo
+    history from before the block is kept either way.  Everything is restored on exit, also
+    when the block raises.
+    """
+    undo_enabled = cmds.undoInfo(query=True, state=True)
+    autosave_enabled = cmds.autoSave(query=True, enable=True)
+    evaluation_mode = cmds.evaluationManager(query=True, mode=True)[0]
+    try:
+        refresh_suspended = cmds.refresh(query=True, suspend=True)
+    except:
+        refresh_suspended = False
+    undo_chunk_open = False
+    try:
+        if autosave_enabled:
+            cmds.autoSave(enable=False)
+        if evaluation_mode != "off":
+            cmds.evaluationManager(mode="off")
+        if undo_enabled and keep_undo:
+            cmds.undoInfo(openChunk=True, chunkName="DazToMaya Import")
+            undo_chunk_open = True
+        elif undo_enabled:
+            cmds.undoInfo(state=False)
+        if not refresh_suspended:
+            cmds.refresh(suspend=True)
+        yield
+    finally:
+        if not refresh_suspended:
+            try:
+                cmds.refresh(suspend=False)
+            except Exception as e:
+                print("DazToMaya ERROR: unable to resume viewport refresh: " + str(e))
+        if undo_chunk_open:
+            try:
+                cmds.undoInfo(closeChunk=True)
+            except Exception as e:
+                print("DazToMaya ERROR: unable to close the import undo chunk: " + str(e))
+        elif undo_enabled:
+            try:
+                cmds.undoInfo(state=True)
+            except Exception as e:
+                print("DazToMaya ERROR: unable to turn undo back on: " + str(e))
+        if evaluation_mode != "off":
+            try:
+                cmds.evaluationManager(mode=evaluation_mode)
+            except Exception as e:
+                print("DazToMaya ERROR: unable to restore the evaluation manager mode: " + str(e))
+        if autosave_enabled:
+            try:
+                cmds.autoSave(enable=True)
+            except Exception as e:
+                print("DazToMaya ERROR: unable to turn autosave back on: " + str(e))
 
 
-def auto_import_daz():
+def auto_import_daz(profile=None):
+    """
+    Import the figure exported by Daz Studio.  The options come from the main window, or from
+    the given ImportProfile for scripted and mayapy runs.
+    """
     global global_current_dtu
+    global import_profile
+
+    if profile is None:
+        profile = get_ui_import_profile()
+    import_profile = profile
+    print("DazToMaya: " + str(profile))
 
-    # Importing only first figure for now
-    daz_file_path = os.path.abspath(Definitions.EXPORT_DIR + "/FIG/FIG0/B_FIG.fbx")
-    dtu_path = os.path.abspath(Definitions.EXPORT_DIR + "/FIG/FIG0/")
-    global_current_dtu = DtuLoader.DtuLoader(dtu_path)
+    daz_file_path = profile.get_fbx_path()
+    global_current_dtu = DtuLoader.DtuLoader(profile.dtu_dir)
 
     # exit if file not found
     if os.path.exists(daz_file_path) == False:
-        open_import_not_found_window()
-        return
+        if profile.headless:
+            print("DazToMaya ERROR: nothing to import, file not found: " + daz_file_path)
+        else:
+            open_import_not_found_window()
+        return False
 
-    # Create a new scene or merge to existing one based on the check box
-    merge_scene = cmds.checkBox(check_box_merge, query=True, value=True)
-    if merge_scene == False:
-        result = mel.eval("saveChanges(\"file -f -new\")")
-        if result == 0:
-            return
+    # Create a new scene or merge to existing one
+    if profile.merge == False:
+        if profile.headless:
+            cmds.file(new=True, force=True)
         else:
-            cmds.NewScene()
+            result = mel.eval("saveChanges(\"file -f -new\")")
+            if result == 0:
+                return False
+            else:
+                cmds.NewScene()
 
     # Load and show wait dialog
-    wait_dialog = WaitDialog()
-    wait_dialog.show()
+    wait_dialog = None
+    if not profile.headless:
+        wait_dialog = WaitDialog()
+        wait_dialog.show()
+        cmds.refresh()
+
+    if use_fast_import:
+        # headless runs have no history to keep, skip recording the import
+        with fast_import(keep_undo=not profile.headless):
+            import_daz_figure(daz_file_path, wait_dialog)
+    else:
+        import_daz_figure(daz_file_path, wait_dialog)
+
+    # Show remember to save with textures...
+    if profile.ask_to_save:
+        open_ask_to_save_window()
+
+    print("DazToMaya Complete!")
+    return True
 
-    # Refresh and import Fbx
+
+def import_daz_figure(daz_file_path, wait_dialog=None):
+    """
+    Import the Fbx and run the figure and material fixes on it
+    """
+    profile = get_import_profile()
+    # Import Fbx
     print("Importing Daz...")
-    cmds.refresh()
     import_fbx(daz_file_path)
+    invalidate_scene_index()
+    invalidate_figure_profile()
     try:
         pm.setAttr("defaultRenderGlobals.currentRenderer", "mayaSoftware")
     except:
@@ -2575,20 +1876,20 @@ def auto_import_daz():
     remove_displacement_maps()
 
     # Auto IK if figure in the scene, else it is a Prop
-    all_joints = mel.eval('ls -type joint')
+    all_joints = get_scene_index().joint_set
     # DB 2023-July-24: group_props() is deleting everything that is not a humanoid rig, please see group_props() header for work-around notes
     if is_genesis_9_skeleton() or is_genesis_3_or_8_skeleton() or is_genesis_2_skeleton():
         group_props()
-        if all_joints != None and "head" in all_joints:
+        if "head" in all_joints:
             #print("DEBUG: about to run auto_ik() because all_joints=" + str(all_joints) + ", type = " + str(type(all_joints)) + "\n")
             print("AutoIK...")
             auto_ik()
-    else:
-        # DB 2024-Sep-11: viewFit crashes mayapy in headless mode. TODO: replace with conditional check for headless mode
+    elif not profile.headless:
+        # DB 2024-Sep-11: viewFit crashes mayapy in headless mode, it is skipped by headless profiles
         try:
             mel.eval('viewFit -all')  # View Fit All
         except Exception as e:
-            print("Exception occured during viewFit command.  This is known to occur with mayapy in headless mode.  Continuing...")
+            print("Exception occured during viewFit command.  Continuing...")
             print("Exception: " + str(e))
 
         clamp_textures()
@@ -2597,40 +1898,53 @@ def auto_import_daz():
         except:
             pass
 
-    try:
-        wait_dialog.close()
-    except:
-        pass
-
-    cmds.refresh()
+    if wait_dialog is not None:
+        try:
+            wait_dialog.close()
+        except:
+            pass
 
     scene_renamer()
     # DB 2023-03-23: work-around, needs to be called after mat_refresh_fix
     # DB 2023-08-04: additional fix for Daz Dog (requires gen8 mat fix)
-    gen8_mat_fix()
-    gen9_mat_fix()
+    apply_material_fixes("phong", "gen8")
+    apply_material_fixes("phong", "gen9")
 
-    mat_refresh_fix()
+    daz_materials = dzm.DazMaterials(True, profile.dtu_dir)
+    daz_materials.refresh_phongs()
 
     # DB 2023-July-17: work-around for HD Makeup missing face textures
-    daz_materials = dzm.DazMaterials(True)
     user_choice_apply_makeup = False
     if daz_materials.has_hd_makeup():
-        ## ask user if they want to apply hd makeup
-        user_choice_apply_makeup = ask_user_to_apply_hd_makeup()
+        if profile.apply_makeup is None:
+            ## ask user if they want to apply hd makeup
+            user_choice_apply_makeup = ask_user_to_apply_hd_makeup()
+        else:
+            user_choice_apply_makeup = profile.apply_makeup
     if user_choice_apply_makeup:
         daz_materials.update_phong_shaders_with_makeup()
     else:
         daz_materials.update_phong_shaders_safe()
 
-    # Show remember to save with textures...
-    try:
-        if cmds.checkBox(check_box_save, query=True, value=True) == True:
-            open_ask_to_save_window()
-    except:
-        pass
+    if profile.shader_target is not None:
+        convert_materials_to(profile.shader_target)
 
-    print("DazToMaya Complete!")
+
+def convert_materials_to(shader_target, keep_phong=False):
+    """
+    Convert the phong materials for a shader target of an ImportProfile: "arnold", "standard" or "stingray"
+    """
+    dtu_dir = get_import_profile().dtu_dir
+    if shader_target == "arnold":
+        dzm.DazMaterials(keep_phong, dtu_dir).convert_to_arnold()
+    elif shader_target == "standard":
+        dzm.DazMaterials(keep_phong, dtu_dir).convert_to_standard_surface()
+    elif shader_target == "stingray":
+        dzm.DazMaterials(keep_phong, dtu_dir).convert_to_stingray_pbs()
+    else:
+        print("DazToMaya WARNING: unknown shader target " + str(shader_target) + ", keeping the phong materials.")
+        return
+    invalidate_scene_index()
 
 
 def ask_user_to_apply_hd_makeup():
@@ -2649,12 +1963,12 @@ def ask_user_to_apply_hd_makeup():
 
 def d2mstart():
     cmds.showWindow(window_daz_main)
-    cmds.window(window_name, edit=True, widthHeight=(343, 495))
+    cmds.window(window_name, edit=True, widthHeight=(343, 625))
 
 
-def initialize():
+def initialize(headless=False):
     """
-    Initialize and lauch UI window
+    Initialize and lauch UI window, headless (mayapy) runs skip the window
     """
     global cfg_settings
     global figure
@@ -2669,7 +1983,7 @@ def initialize():
         cfg_settings = output.read()
 
     # Detect figure Gen2 male or female
-    objs = mel.eval('ls')
+    objs = cmds.ls()
     for o in objs:
         if o.find("Genesis2Female") == 0:
             figure = "Genesis2MaleFBXASC046Shape"
@@ -2686,8 +2000,9 @@ def initialize():
         except:
             pass
 
-    open_main_window()
-    d2mstart()
+    if not headless:
+        open_main_window()
+        d2mstart()
     # d2m58-mac
     print("DazToMaya: has successfully loaded, version {}.".format(DZBRIDGE_VERSION_STRING))
     print("DazToMaya: Intermediate folder location is \"{0}\".".format(Definitions.EXPORT_DIR))
@@ -2696,6 +2011,21 @@ def initialize():
 # ----------- UI --------------
 
 
+def set_hik_control_rig_mode(value):
+    global hik_control_rig_mode
+    hik_control_rig_mode = value
+
+
+def set_joint_limits_policy(value):
+    global joint_limits_policy
+    joint_limits_policy = value
+
+
+def set_use_morph_sidecar(value):
+    global use_morph_sidecar
+    use_morph_sidecar = value
+
+
 def open_main_window():
     """
     Open main dialogue window for Daz to Maya
@@ -2743,6 +2073,26 @@ def open_main_window():
     cmds.menuItem(label="x0.1 (small)")
     cmds.menuItem(label="x0.01 (smaller)")
     cmds.setParent('..')
+    cmds.columnLayout("HikRigMenuColumn", columnOffset=("left", 6))
+    cmds.optionMenu(
+                        "hikRigMenu",
+                        w=200,
+                        label="HIK Control Rig:",
+                        changeCommand=lambda value: set_hik_control_rig_mode(value)
+                    )
+    for mode in (HIK_RIG_CREATE, HIK_RIG_ON_DEMAND, HIK_RIG_SKIP):
+        cmds.menuItem(label=mode)
+    cmds.optionMenu("hikRigMenu", edit=True, value=hik_control_rig_mode)
+    cmds.optionMenu(
+                        "jointLimitsMenu",
+                        w=200,
+                        label="Joint Limits:",
+                        changeCommand=lambda value: set_joint_limits_policy(value)
+                    )
+    for policy in (JOINT_LIMITS_CLEAR, JOINT_LIMITS_DTU, JOINT_LIMITS_KEEP):
+        cmds.menuItem(label=policy)
+    cmds.optionMenu("jointLimitsMenu", edit=True, value=joint_limits_policy)
+    cmds.setParent('..')
     cmds.separator(height=5, style='none')
 
     cmds.button(
@@ -2809,6 +2159,39 @@ def open_main_window():
     cmds.setParent('..')
     cmds.separator(height=20, style='in')
 
+    # Morph controls panel
+    cmds.rowColumnLayout(
+                            numberOfColumns=2,
+                            columnWidth=[(1, 225), (2, 103)],
+                            columnSpacing=[(1, 6), (2, 8)]
+                        )
+    cmds.button(
+                    label='Morph Controls...',
+                    height=25,
+                    c=lambda *args: morphs.open_morph_panel()
+                )
+    cmds.button(
+                    label='Freeze Morphs',
+                    height=25,
+                    c=lambda *args: morphs.freeze_morphs_dialog()
+                )
+    cmds.setParent('..')
+    cmds.separator(height=5, style='none')
+    cmds.columnLayout("CheckBox_LazyMorphs_Column", columnOffset=("left", 10))
+    lazy_morphs_label = "Load morphs on demand (keep only joint-controlled morphs)"
+    cmds.checkBox(
+                    label=lazy_morphs_label,
+                    value=morphs.lazy_morphs,
+                    changeCommand=lambda value: setattr(morphs, "lazy_morphs", value)
+                )
+    cmds.checkBox(
+                    label="Cache morph deltas for faster re-imports",
+                    value=use_morph_sidecar,
+                    changeCommand=lambda value: set_use_morph_sidecar(value)
+                )
+    cmds.setParent('..')
+    cmds.separator(height=10, style='in')
+
     # Global skin paramters section
     cmds.text(label='  Global Skin Parameters:', align='left')
     cmds.separator(height=5, style='none')
@@ -2947,6 +2330,7 @@ def btn_convert_callback():
 
         if mat_conv == "Vray":
             ConvertToVray().start_convert()
+            invalidate_scene_index()
             eyelashes_fix1()
             eyelashes_fix2()
             extra_eye_fixes()
@@ -3504,89 +2888,9 @@ class ConvertToVray:
         self.convert_ui()
 
 def map_gen9_to_hik():
+    joints_list = get_scene_index().joint_set
 
-    # unirBones(DazBone,HumanIkBone) -------------------------------------
-    joints_list = mel.eval('ls -type joint')
-
-    mel.eval('setCharacterObject("hip","Character1",1,0)')
-    mel.eval('setCharacterObject("spine1","Character1",8,0)')
-    mel.eval('setCharacterObject("spine2","Character1",23,0)')
-    mel.eval('setCharacterObject("spine3","Character1",24,0)')
-    mel.eval('setCharacterObject("spine4","Character1",25,0)')
-    mel.eval('setCharacterObject("neck1","Character1",20,0)')
-    mel.eval('setCharacterObject("neck2","Character1",32,0)')
-    mel.eval('setCharacterObject("head","Character1",15,0)')
-
-    # Left
-    mel.eval('setCharacterObject("l_thigh","Character1",2,0)')
-    mel.eval('setCharacterObject("l_shin","Character1",3,0)')
-    mel.eval('setCharacterObject("l_foot","Character1",4,0)')
-    mel.eval('setCharacterObject("l_toes","Character1",16,0)')
-
-    mel.eval('setCharacterObject("l_shoulder","Character1",18,0)')
-    mel.eval('setCharacterObject("l_upperarm","Character1",9,0)')
-    mel.eval('setCharacterObject("l_forearm","Character1",10,0)')
-
-    mel.eval('setCharacterObject("l_hand","Character1",11,0)')
-    mel.eval('setCharacterObject("l_thumb1","Character1",50,0)')
-    mel.eval('setCharacterObject("l_thumb2","Character1",51,0)')
-    mel.eval('setCharacterObject("l_thumb3","Character1",52,0)')
-    mel.eval('setCharacterObject("l_index1","Character1",54,0)')
-    mel.eval('setCharacterObject("l_index2","Character1",55,0)')
-    mel.eval('setCharacterObject("l_index3","Character1",56,0)')
-    mel.eval('setCharacterObject("l_mid1","Character1",58,0)')
-    mel.eval('setCharacterObject("l_mid2","Character1",59,0)')
-    mel.eval('setCharacterObject("l_mid3","Character1",60,0)')
-    mel.eval('setCharacterObject("l_ring1","Character1",62,0)')
-    mel.eval('setCharacterObject("l_ring2","Character1",63,0)')
-    mel.eval('setCharacterObject("l_ring3","Character1",64,0)')
-    mel.eval('setCharacterObject("l_pinky1","Character1",66,0)')
-    mel.eval('setCharacterObject("l_pinky2","Character1",67,0)')
-    mel.eval('setCharacterObject("l_pinky3","Character1",68,0)')
-
-    # Right
-    mel.eval('setCharacterObject("r_thigh","Character1",5,0)')
-    mel.eval('setCharacterObject("r_shin","Character1",6,0)')
-    mel.eval('setCharacterObject("r_foot","Character1",7,0)')
-    mel.eval('setCharacterObject("r_toes","Character1",17,0)')
-
-    mel.eval('setCharacterObject("r_shoulder","Character1",19,0)')
-    mel.eval('setCharacterObject("r_upperarm","Character1",12,0)')
-    mel.eval('setCharacterObject("r_forearm","Character1",13,0)')
-
-    mel.eval('setCharacterObject("r_hand","Character1",14,0)')
-
-    mel.eval('setCharacterObject("r_thumb1","Character1",74,0)')
-    mel.eval('setCharacterObject("r_thumb2","Character1",75,0)')
-    mel.eval('setCharacterObject("r_thumb3","Character1",76,0)')
-    mel.eval('setCharacterObject("r_index1","Character1",78,0)')
-    mel.eval('setCharacterObject("r_index2","Character1",79,0)')
-    mel.eval('setCharacterObject("r_index3","Character1",80,0)')
-    mel.eval('setCharacterObject("r_mid1","Character1",82,0)')
-    mel.eval('setCharacterObject("r_mid2","Character1",83,0)')
-    mel.eval('setCharacterObject("r_mid3","Character1",84,0)')
-    mel.eval('setCharacterObject("r_ring1","Character1",86,0)')
-    mel.eval('setCharacterObject("r_ring2","Character1",87,0)')
-    mel.eval('setCharacterObject("r_ring3","Character1",88,0)')
-    mel.eval('setCharacterObject("r_pinky1","Character1",90,0)')
-    mel.eval('setCharacterObject("r_pinky2","Character1",91,0)')
-    mel.eval('setCharacterObject("r_pinky3","Character1",92,0)')
-
-    mel.eval('setCharacterObject("l_forearmtwist1","Character1",177,0)')
-    mel.eval('setCharacterObject("l_forearmtwist2","Character1",185,0)')
-    mel.eval('setCharacterObject("l_upperarmtwist1","Character1",176,0)')
-    mel.eval('setCharacterObject("l_upperarmtwist2","Character1",184,0)')
-    mel.eval('setCharacterObject("l_thightwist1","Character1",172,0)')
-    mel.eval('setCharacterObject("l_thightwist2","Character1",180,0)')
-    # parentar("lMetatarsals","Character1_LeftFoot")
-
-    mel.eval('setCharacterObject("r_forearmtwist1","Character1",179,0)')
-    mel.eval('setCharacterObject("r_forearmtwist2","Character1",187,0)')
-    mel.eval('setCharacterObject("r_upperarmtwist1","Character1",178,0)')
-    mel.eval('setCharacterObject("r_upperarmtwist2","Character1",186,0)')
-    mel.eval('setCharacterObject("r_thightwist1","Character1",174,0)')
-    mel.eval('setCharacterObject("r_thightwist2","Character1",182,0)')
-    # parentar("rMetatarsals","Character1_RightFoot")
+    apply_hik_template("genesis9")
 
     toe_bones_left = ("l_bigtoe1", "l_indextoe1", "l_midtoe1",
                     "l_ringtoe1", "l_pinkytoe1")
@@ -3604,265 +2908,24 @@ def gen9_apply_t_pose():
     global global_current_dtu
     if global_current_dtu is None or global_current_dtu.hasAnimation():
         return
-    # ---------------------------------------------------------
-    try:
-        mel.eval('setAttr "l_upperarm.rotateX" 0.0')
-        mel.eval('setAttr "l_upperarm.rotateY" 0.0')
-        mel.eval('setAttr "l_upperarm.rotateZ" 48.24')
-        # 45.75
-
-        mel.eval('setAttr "r_upperarm.rotateX" 0.0')
-        mel.eval('setAttr "r_upperarm.rotateY" -0.0')
-        mel.eval('setAttr "r_upperarm.rotateZ" -48.24')
-
-        mel.eval('setAttr "l_forearm.rotateX" 1.16')
-        mel.eval('setAttr "l_forearm.rotateY" 15.49')
-        mel.eval('setAttr "l_forearm.rotateZ" -4.2')
-
-        mel.eval('setAttr "r_forearm.rotateX" 1.16')
-        mel.eval('setAttr "r_forearm.rotateY" -15.49')
-        mel.eval('setAttr "r_forearm.rotateZ" 4.2')
-
-        mel.eval('setAttr "l_hand.rotateX" 0.0')
-        mel.eval('setAttr "l_hand.rotateY" -13.76')
-        mel.eval('setAttr "l_hand.rotateZ" 0.0')
-
-        mel.eval('setAttr "r_hand.rotateX" 0.0')
-        mel.eval('setAttr "r_hand.rotateY" 13.76')
-        mel.eval('setAttr "r_hand.rotateZ" -0.0')
-
-        mel.eval('setAttr "l_thumb1.rotateX" -0.0')
-        mel.eval('setAttr "l_thumb1.rotateY" -0.0')
-        mel.eval('setAttr "l_thumb1.rotateZ" -0.0')
-
-        mel.eval('setAttr "r_thumb1.rotateX" -0.0')
-        mel.eval('setAttr "r_thumb1.rotateY" 0.0')
-        mel.eval('setAttr "r_thumb1.rotateZ" 0.0')
-
-        mel.eval('setAttr "l_thumb2.rotateX" -0.0')
-        mel.eval('setAttr "l_thumb2.rotateY" -0.0')
-        mel.eval('setAttr "l_thumb2.rotateZ" -0.0')
-
-        mel.eval('setAttr "r_thumb2.rotateX" -0.0')
-        mel.eval('setAttr "r_thumb2.rotateY" 0.0')
-        mel.eval('setAttr "r_thumb2.rotateZ" 0.0')
-
-        mel.eval('setAttr "l_thumb3.rotateX" -0.0')
-        mel.eval('setAttr "l_thumb3.rotateY" -0.0')
-        mel.eval('setAttr "l_thumb3.rotateZ" -0.0')
-
-        mel.eval('setAttr "r_thumb3.rotateX" -0.0')
-        mel.eval('setAttr "r_thumb3.rotateY" 0.0')
-        mel.eval('setAttr "r_thumb3.rotateZ" 0.0')
-
-        mel.eval('setAttr "l_indexmetacarpal.rotateX" -0.0')
-        mel.eval('setAttr "l_indexmetacarpal.rotateY" -0.0')
-        mel.eval('setAttr "l_indexmetacarpal.rotateZ" -0.0')
+    apply_rest_pose("genesis9")
 
-        mel.eval('setAttr "r_indexmetacarpal.rotateX" -0.0')
-        mel.eval('setAttr "r_indexmetacarpal.rotateY" 0.0')
-        mel.eval('setAttr "r_indexmetacarpal.rotateZ" 0.0')
-
-        mel.eval('setAttr "l_index1.rotateX" -0.0')
-        mel.eval('setAttr "l_index1.rotateY" 0.0')
-        mel.eval('setAttr "l_index1.rotateZ" -0.0')
-
-        mel.eval('setAttr "r_index1.rotateX" -0.0')
-        mel.eval('setAttr "r_index1.rotateY" -0.0')
-        mel.eval('setAttr "r_index1.rotateZ" 0.0')
-
-        mel.eval('setAttr "l_index2.rotateX" -0.0')
-        mel.eval('setAttr "l_index2.rotateY" -0.0')
-        mel.eval('setAttr "l_index2.rotateZ" -0.0')
-
-        mel.eval('setAttr "r_index2.rotateX" -0.0')
-        mel.eval('setAttr "r_index2.rotateY" 0.0')
-        mel.eval('setAttr "r_index2.rotateZ" 0.0')
-
-        mel.eval('setAttr "l_index3.rotateX" -0.0')
-        mel.eval('setAttr "l_index3.rotateY" -0.0')
-        mel.eval('setAttr "l_index3.rotateZ" -0.0')
-
-        mel.eval('setAttr "r_index3.rotateX" -0.0')
-        mel.eval('setAttr "r_index3.rotateY" 0.0')
-        mel.eval('setAttr "r_index3.rotateZ" 0.0')
-
-        mel.eval('setAttr "l_midmetacarpal.rotateX" -0.0')
-        mel.eval('setAttr "l_midmetacarpal.rotateY" 0.0')
-        mel.eval('setAttr "l_midmetacarpal.rotateZ" -0.0')
-
-        mel.eval('setAttr "r_midmetacarpal.rotateX" -0.0')
-        mel.eval('setAttr "r_midmetacarpal.rotateY" -0.0')
-        mel.eval('setAttr "r_midmetacarpal.rotateZ" 0.0')
-
-        mel.eval('setAttr "l_mid1.rotateX" -0.0')
-        mel.eval('setAttr "l_mid1.rotateY" -0.0')
-        mel.eval('setAttr "l_mid1.rotateZ" -0.0')
-
-        mel.eval('setAttr "r_mid1.rotateX" -0.0')
-        mel.eval('setAttr "r_mid1.rotateY" 0.0')
-        mel.eval('setAttr "r_mid1.rotateZ" 0.0')
-
-        mel.eval('setAttr "l_mid2.rotateX" -0.0')
-        mel.eval('setAttr "l_mid2.rotateY" -0.0')
-        mel.eval('setAttr "l_mid2.rotateZ" 0.0')
-
-        mel.eval('setAttr "r_mid2.rotateX" -0.0')
-        mel.eval('setAttr "r_mid2.rotateY" 0.0')
-        mel.eval('setAttr "r_mid2.rotateZ" -0.0')
-
-        mel.eval('setAttr "l_mid3.rotateX" -0.0')
-        mel.eval('setAttr "l_mid3.rotateY" -0.0')
-        mel.eval('setAttr "l_mid3.rotateZ" -0.0')
-
-        mel.eval('setAttr "r_mid3.rotateX" -0.0')
-        mel.eval('setAttr "r_mid3.rotateY" 0.0')
-        mel.eval('setAttr "r_mid3.rotateZ" 0.0')
-
-        mel.eval('setAttr "l_ringmetacarpal.rotateX" -0.0')
-        mel.eval('setAttr "l_ringmetacarpal.rotateY" 0.0')
-        mel.eval('setAttr "l_ringmetacarpal.rotateZ" -0.0')
-
-        mel.eval('setAttr "r_ringmetacarpal.rotateX" -0.0')
-        mel.eval('setAttr "r_ringmetacarpal.rotateY" -0.0')
-        mel.eval('setAttr "r_ringmetacarpal.rotateZ" 0.0')
-
-        mel.eval('setAttr "l_ring1.rotateX" -0.0')
-        mel.eval('setAttr "l_ring1.rotateY" 0.0')
-        mel.eval('setAttr "l_ring1.rotateZ" -0.0')
-
-        mel.eval('setAttr "r_ring1.rotateX" -0.0')
-        mel.eval('setAttr "r_ring1.rotateY" -0.0')
-        mel.eval('setAttr "r_ring1.rotateZ" 0.0')
-
-        mel.eval('setAttr "l_ring2.rotateX" -0.0')
-        mel.eval('setAttr "l_ring2.rotateY" 0.0')
-        mel.eval('setAttr "l_ring2.rotateZ" -0.0')
-
-        mel.eval('setAttr "r_ring2.rotateX" -0.0')
-        mel.eval('setAttr "r_ring2.rotateY" -0.0')
-        mel.eval('setAttr "r_ring2.rotateZ" 0.0')
-
-        mel.eval('setAttr "l_ring3.rotateX" -0.0')
-        mel.eval('setAttr "l_ring3.rotateY" 0.0')
-        mel.eval('setAttr "l_ring3.rotateZ" -0.0')
-
-        mel.eval('setAttr "r_ring3.rotateX" -0.0')
-        mel.eval('setAttr "r_ring3.rotateY" -0.0')
-        mel.eval('setAttr "r_ring3.rotateZ" 0.0')
-
-        mel.eval('setAttr "l_pinkymetacarpal.rotateX" -0.0')
-        mel.eval('setAttr "l_pinkymetacarpal.rotateY" 0.0')
-        mel.eval('setAttr "l_pinkymetacarpal.rotateZ" -0.0')
-
-        mel.eval('setAttr "r_pinkymetacarpal.rotateX" -0.0')
-        mel.eval('setAttr "r_pinkymetacarpal.rotateY" -0.0')
-        mel.eval('setAttr "r_pinkymetacarpal.rotateZ" 0.0')
-
-        mel.eval('setAttr "l_pinky1.rotateX" -0.0')
-        mel.eval('setAttr "l_pinky1.rotateY" -0.0')
-        mel.eval('setAttr "l_pinky1.rotateZ" -0.0')
-
-        mel.eval('setAttr "r_pinky1.rotateX" -0.0')
-        mel.eval('setAttr "r_pinky1.rotateY" 0.0')
-        mel.eval('setAttr "r_pinky1.rotateZ" 0.0')
-
-        mel.eval('setAttr "l_pinky2.rotateX" -0.0')
-        mel.eval('setAttr "l_pinky2.rotateY" -0.0')
-        mel.eval('setAttr "l_pinky2.rotateZ" 0.0')
-
-        mel.eval('setAttr "r_pinky2.rotateX" -0.0')
-        mel.eval('setAttr "r_pinky2.rotateY" 0.0')
-        mel.eval('setAttr "r_pinky2.rotateZ" -0.0')
-
-        mel.eval('setAttr "l_pinky3.rotateX" -0.0')
-        mel.eval('setAttr "l_pinky3.rotateY" -0.0')
-        mel.eval('setAttr "l_pinky3.rotateZ" 0.0')
-
-        mel.eval('setAttr "r_pinky3.rotateX" -0.0')
-        mel.eval('setAttr "r_pinky3.rotateY" 0.0')
-        mel.eval('setAttr "r_pinky3.rotateZ" -0.0')
-
-        mel.eval('setAttr "l_shin.rotateX" 0.0')
-        mel.eval('setAttr "l_shin.rotateY" -9.66')
-        mel.eval('setAttr "l_shin.rotateZ" 0.0')
-
-        mel.eval('setAttr "r_shin.rotateX" 0.0')
-        mel.eval('setAttr "r_shin.rotateY" 9.66')
-        mel.eval('setAttr "r_shin.rotateZ" -0.0')
-
-#        mel.eval('setAttr "l_thigh.rotateX" 0.54')
-#        mel.eval('setAttr "l_thigh.rotateY" -0.16')
-#        mel.eval('setAttr "l_thigh.rotateZ" -6.23')
-        mel.eval('setAttr "l_thigh.rotateX" 0.44')
-        mel.eval('setAttr "l_thigh.rotateY" 2.84')
-        mel.eval('setAttr "l_thigh.rotateZ" -0.23')
-
-#        mel.eval('setAttr "r_thigh.rotateX" 0.54')
-#        mel.eval('setAttr "r_thigh.rotateY" 0.16')
-#        mel.eval('setAttr "r_thigh.rotateZ" 6.23')
-        mel.eval('setAttr "r_thigh.rotateX" 0.44')
-        mel.eval('setAttr "r_thigh.rotateY" -2.84')
-        mel.eval('setAttr "r_thigh.rotateZ" 0.23')
-
-        # '''
-        # mel.eval('setAttr "l_foot.rotateX" -1.96')
-        # mel.eval('setAttr "l_foot.rotateY" -4.88')
-        # mel.eval('setAttr "l_foot.rotateZ" 3.53')
-
-        # mel.eval('setAttr "r_foot.rotateX" -1.96')
-        # mel.eval('setAttr "r_foot.rotateY" 4.88')
-        # mel.eval('setAttr "r_foot.rotateZ" -3.53')
-        # '''
-    except Exception as e:
-        print("Error trying to apply Genesis 9 t-Pose:\n" + str(e) + ", skipping...")
 
 ## DB 2023-Aug-07: is_genesis_XXX_skeleton() were created to as a work-around for group_props() and auto_ik() issues.
 ##   Please see group_props() header for more info.
 def is_genesis_9_skeleton():
-    all_joints = cmds.ls(type='joint')
-    if "hip" in all_joints and "pelvis" in all_joints:
-        if "spine1" in all_joints and "spine2" in all_joints and "spine3" in all_joints and "spine4" in all_joints:
-            if "l_thigh" in all_joints and "l_shin" in all_joints and "l_foot" in all_joints and "l_toes" in all_joints:
-                if "l_pectoral" in all_joints:
-                    if "l_shoulder" in all_joints and "l_upperarm" in all_joints and "l_forearm" in all_joints and "l_hand" in all_joints:
-                        if "l_forearmtwist1" in all_joints and "l_forearmtwist2" in all_joints:
-                            #print("DEBUG: is_genesis_9() = True")
-                            return True
-    return False
+    return get_figure_profile().skeleton == "Genesis9"
 
 def is_genesis_3_or_8_skeleton():
-    all_joints = cmds.ls(type='joint')
-    if "hip" in all_joints and "pelvis" in all_joints:
-        if "abdomenLower" in all_joints and "abdomenUpper" in all_joints and "chestLower" in all_joints and "chestUpper" in all_joints:
-            if "lThighBend" in all_joints and "lShin" in all_joints and "lFoot" in all_joints and "lToe" in all_joints:
-                if "lCollar" in all_joints and "lShldrBend" in all_joints and "lForearmBend" in all_joints and "lHand" in all_joints:
-                    if "lForearmTwist" in all_joints:
-                        #print("DEBUG: is_genesis_3_or_8() = True")
-                        return True
-    return False
+    return get_figure_profile().skeleton == "Genesis3_8"
 
 def is_genesis_3_skeleton():
-    if is_genesis_3_or_8_skeleton():
-        all_joints = cmds.ls(type='joint')
-        if "Genesis3" in all_joints:
-            return True
-    return False
+    figure_profile = get_figure_profile()
+    return figure_profile.skeleton == "Genesis3_8" and figure_profile.generation == "Genesis3"
 
 def is_genesis_8_skeleton():
-    if is_genesis_3_or_8_skeleton():
-        all_joints = cmds.ls(type='joint')
-        if "Genesis8" in all_joints:
-            return True
-    return False
+    figure_profile = get_figure_profile()
+    return figure_profile.skeleton == "Genesis3_8" and figure_profile.generation in ("Genesis8", "Genesis8_1")
 
 def is_genesis_2_skeleton():
-    all_joints = cmds.ls(type='joint')
-    if "hip" in all_joints and "pelvis" in all_joints:
-        if "abdomen" in all_joints and "abdomen2" in all_joints and "chest" in all_joints:
-            if "lThigh" in all_joints and "lShin" in all_joints and "lFoot" in all_joints and "lToe" in all_joints:
-                if "lCollar" in all_joints and "lShldr" in all_joints and "lForeArm" in all_joints and "lHand" in all_joints:
-                    if "lForearmTwist" not in all_joints:
-                        #print("DEBUG: is_genesis_2() = True")
-                        return True
-    return False
+    return get_figure_profile().skeleton == "Genesis2"
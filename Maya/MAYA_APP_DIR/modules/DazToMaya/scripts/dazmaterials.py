@@ -3,6 +3,7 @@ import math
 
 import pymel.core as pm
 import maya.cmds  as cmds
+import maya.mel as mel
 
 from Definitions import EXPORT_DIR
 from DtuLoader import DtuLoader
@@ -22,9 +23,13 @@ def roughnessToCosinePower(roughness):
 class DazMaterials:
     material_dict = {}
     keep_phong = False
+    dtu_dir = ""
 
-    def __init__(self, keep_phong):
+    def __init__(self, keep_phong, dtu_dir=""):
         self.keep_phong = keep_phong
+        self.dtu_dir = dtu_dir
+        if self.dtu_dir == "":
+            self.dtu_dir = os.path.abspath(EXPORT_DIR + "/FIG/FIG0")
 
     def convert_color(self, color):
         '''Takes a hex rgb string (e.g. #ffffff) and returns an RGB tuple (float, float, float).'''
@@ -34,8 +39,7 @@ class DazMaterials:
         """
         Load materials from Dtu file
         """
-        dtu_path = os.path.abspath(EXPORT_DIR + "/FIG/FIG0")
-        dtu_loader = DtuLoader(dtu_path)
+        dtu_loader = DtuLoader(self.dtu_dir)
         mats = dtu_loader.get_materials_list()
         for mat in mats:
             asset_name = mat["Asset Name"]
@@ -71,6 +75,31 @@ class DazMaterials:
             properties[prop["Name"]] = prop
         return properties
 
+    def refresh_phongs(self):
+        """
+        Replace every phong by a new phong taking over its connections and name, so the values
+        left by the Fbx import are back to the phong defaults.  All the phongs are rebuilt in one
+        mel call, one phong at a time if that fails.  Returns the rebuilt names.
+        """
+        phongs = cmds.ls(type="phong") or []
+        rebuild_cmds = []
+        for phong in phongs:
+            rebuild_cmds.append('{ string $new_phong = `createNode phong`; replaceNode "%s" $new_phong; '
+                                'delete "%s"; rename $new_phong "%s"; }' % (phong, phong, phong))
+        if not rebuild_cmds:
+            return []
+        try:
+            mel.eval("\n".join(rebuild_cmds))
+        except Exception as e:
+            print("DazToMaya WARNING: batched phong rebuild failed (" + str(e) + "), rebuilding per phong...")
+            for rebuild_cmd in rebuild_cmds:
+                try:
+                    mel.eval(rebuild_cmd)
+                except Exception as e:
+                    print("DazToMaya WARNING: " + rebuild_cmd + " failed: " + str(e))
+        print("DazToMaya: rebuilt " + str(len(phongs)) + " phong shaders.")
+        return phongs
+
     ## DB 2024-09-21: update to work with new Bake Makeup feature in Daz Bridge Library, check for existence of weight and base color maps
     ## DB 2023-July-17: find if any HD makeup properties are present
     def has_hd_makeup(self):
@@ -1,5 +1,10 @@
 import os
+import re
 import sys
+import json
+import math
+import hashlib
+import xml.etree.ElementTree as ET
 
 import maya.cmds as cmds
 import maya.api.OpenMaya as om2
@@ -7,24 +12,45 @@ import maya.mel as mel
 
 import Definitions
 import DtuLoader
+import blendshapes
 
 if int(cmds.about(v=True)) > 2020:
     import importlib
     importlib.reload(Definitions)
     importlib.reload(DtuLoader)
+    importlib.reload(blendshapes)
 else:
     reload(Definitions)
     reload(DtuLoader)
+    reload(blendshapes)
 
 dtu_loader = None
 
-def fix_morphs():
+# Split morph controls across child controller nodes, one per top-level Path category, with at
+# most this many morphs per node. 0 keeps every control on the single Morphs node.
+morphs_per_controller = 0
+# Number of morph widgets built at a time by the Morph Controls panel
+morph_panel_page_size = 50
+
+# Lazy morphs: only joint-controlled morphs stay live after import. The other targets are moved
+# to a delta cache file and listed on the MorphCatalog node until the user enables them.
+lazy_morphs = False
+morph_catalog_node = "MorphCatalog"
+# cache file path -> loaded delta dict
+loaded_delta_caches = {}
+
+def fix_morphs(lazy=None):
     """
     Add centralized morph controls using exported Dtu data and clean blendshapes
     """
+    if lazy is None:
+        lazy = lazy_morphs
     morph_links = load_morph_links()
-    create_morphs_node(morph_links)
-    create_custom_template(morph_links)
+    if lazy and blendshapes.has_numpy("Lazy morph import"):
+        controllers = create_morph_catalog(morph_links)
+    else:
+        controllers = create_morphs_node(morph_links)
+    create_custom_template(morph_links, controllers)
     clean_morphs()
 
 
@@ -146,20 +172,81 @@ def create_autojcm(morph_link, blendshape_target_dest):
 
     return False
 
-def create_morphs_node(morph_links):
+def get_morph_groups(morph_link):
     """
-    Create a node for adding controls to blendshapes.
+    Split the Daz Path of a morph (e.g. "/Pose Controls/Head/Eyes") into its group names
     """
-    morph_node = cmds.createNode("transform", n="Morphs")
-    cmds.select(morph_node)
+    if "Path" not in morph_link:
+        return []
+    return list(filter(None, morph_link["Path"].split('/')))
+
 
+def split_morph_controllers(morph_links, morph_node):
+    """
+    Assign morph links to controller node names.  Returns a dict of controller name -> list of links.
+    """
+    if morphs_per_controller <= 0:
+        return {morph_node: list(morph_links.keys())}
+
+    categories = {}
     for link in morph_links:
-        morph_label = morph_links[link]["Label"]
-        morph_label_ns = morph_label.replace(" ", "").replace("-", "FBXASC045")
-        morph_min = morph_links[link]["Minimum"]
-        morph_max = morph_links[link]["Maximum"]
-        cmds.addAttr(longName=morph_label_ns, niceName=morph_label, min=morph_min, max=morph_max)
-        cmds.setAttr(morph_node + "." + morph_label_ns, e=True, k=True)
+        groups = get_morph_groups(morph_links[link])
+        category = groups[0] if len(groups) > 0 else "Other"
+        categories.setdefault(category, []).append(link)
+
+    controllers = {}
+    for category, links in categories.items():
+        controller_name = morph_node + "_" + re.sub(r"[^A-Za-z0-9_]", "", category.replace(" ", "_"))
+        pages = range(0, len(links), morphs_per_controller)
+        for page_index, page_start in enumerate(pages):
+            page_name = controller_name
+            if len(pages) > 1:
+                page_name += "_" + str(page_index + 1)
+            controllers[page_name] = links[page_start:page_start + morphs_per_controller]
+    return controllers
+
+
+def add_morph_attr(controller, morph_label, morph_min, morph_max):
+    """
+    Add the keyable control attribute of a morph to a controller node
+    """
+    morph_label_ns = get_morph_attr_name(morph_label)
+    cmds.addAttr(controller, longName=morph_label_ns, niceName=morph_label, min=morph_min, max=morph_max)
+    cmds.setAttr(controller + "." + morph_label_ns, e=True, k=True)
+    return controller + "." + morph_label_ns
+
+
+def create_morph_controllers(morph_links):
+    """
+    Create the Morphs node and any controller nodes under it.  Returns a dict of
+    controller node -> list of morph links on that node.
+    """
+    morph_node = cmds.createNode("transform", n="Morphs")
+
+    controllers = {}
+    for controller_name, links in split_morph_controllers(morph_links, morph_node).items():
+        if controller_name == morph_node:
+            controller = morph_node
+        else:
+            controller = cmds.createNode("transform", n=controller_name, parent=morph_node)
+        controllers[controller] = links
+    return controllers
+
+
+def create_morphs_node(morph_links):
+    """
+    Create a node for adding controls to blendshapes.  Returns a dict of the controller
+    node(s) holding the morph attributes -> list of morph links on that node.
+    """
+    controllers = create_morph_controllers(morph_links)
+    morph_node = list(controllers.keys())[0].split("|")[0]
+
+    link_controller = {}
+    for controller, links in controllers.items():
+        for link in links:
+            link_controller[link] = controller
+            add_morph_attr(controller, morph_links[link]["Label"], morph_links[link]["Minimum"], morph_links[link]["Maximum"])
+    cmds.select(morph_node)
 
     blendshapes = cmds.ls(type="blendShape")
     for blendshape in blendshapes:
@@ -167,8 +254,8 @@ def create_morphs_node(morph_links):
         for blend_target in blend_targets:
             link = clean_name(blend_target)
             if link not in morph_links.keys(): continue
-            morph_label_ns = morph_links[link]["Label"].replace(" ", "").replace("-", "FBXASC045")
-            source = morph_node + "." + morph_label_ns
+            morph_label_ns = get_morph_attr_name(morph_links[link]["Label"])
+            source = link_controller[link] + "." + morph_label_ns
             dest = blendshape + "." + blend_target
 
             if (create_autojcm(morph_links[link], dest)):
@@ -185,46 +272,124 @@ def create_morphs_node(morph_links):
             except Exception as e:
                 print("DazToMaya ERROR: unable to connect morph, " + source + ", to Morphs node target, " + dest + ":" + str(e))
 
+    return controllers
+
 
-def create_custom_template(morph_links):
+def get_morph_attr_name(morph_label):
     """
-    Create custom template to be used for morphList node
+    Convert a Daz morph label into the attribute name used on the Morphs node
     """
-    template_text = "<?xml version='1.0' encoding='UTF-8'?>\n"
-    template_text += "<templates>\n"
+    return morph_label.replace(" ", "").replace("-", "FBXASC045")
 
-    template_text += "<template name='AEtransform'>\n"
-    for link in morph_links:
-        morph_label = morph_links[link]["Label"]
-        morph_label_ns = morph_label.replace(" ", "")
-        template_text += "<attribute name='" + morph_label_ns + "' type='maya.double'>\n"
-        template_text += "<label>" + morph_label + "</label>\n"
-        template_text += "</attribute>\n"
-    template_text += "</template>\n"
 
-    template_text += "<view name='Morphs' template='AEtransform'>\n"
+def build_custom_template(morph_links, controllers):
+    """
+    Build the AE template xml text for the Morphs node(s).  Every controller node gets a view
+    whose morphs are nested in collapsible groups following the Daz Path of each morph.
+    """
+    root = ET.Element("templates")
+
+    template = ET.SubElement(root, "template", name="AEtransform")
     for link in morph_links:
-        groups = morph_links[link]["Path"].split('/')
-        groups = list(filter(None, groups))
-        for group in groups:
-            group = group.replace(" ", "")
-            #template_text += "<group name='" + group + "'>\n"
         morph_label = morph_links[link]["Label"]
-        morph_label_ns = morph_label.replace(" ", "")
-        template_text += "<property name='" + morph_label_ns + "'/>\n"
-        for group in groups:
-            template_text += "" #"</group>\n"
-    template_text += "</view>\n"
+        attribute = ET.SubElement(template, "attribute", name=get_morph_attr_name(morph_label), type="maya.double")
+        ET.SubElement(attribute, "label").text = morph_label
+
+    for controller, links in controllers.items():
+        view = ET.SubElement(root, "view", name=controller, template="AEtransform")
+        group_elements = {(): view}
+        for link in links:
+            group_path = ()
+            for group in get_morph_groups(morph_links[link]):
+                parent_element = group_elements[group_path]
+                group_path += (group.replace(" ", ""),)
+                if group_path not in group_elements:
+                    group_elements[group_path] = ET.SubElement(parent_element, "group", name=group_path[-1])
+            morph_label = morph_links[link]["Label"]
+            ET.SubElement(group_elements[group_path], "property", name=get_morph_attr_name(morph_label))
+
+    return "<?xml version='1.0' encoding='UTF-8'?>\n" + ET.tostring(root, encoding="unicode") + "\n"
+
+
+def get_template_path(template_hash):
+    """
+    Template file named after the hash of its content, so identical morph sets share one file
+    and the templates of other assets are never overwritten
+    """
+    return Definitions.AE_TEMPLATES_DIR + "/AEtransform.Morphs" + template_hash[:16] + "Template.xml"
 
-    template_text += "</templates>\n"
 
-    template_path = Definitions.DAZTOMAYA_MODULE_DIR + "/scripts/AETemplates/AEtransform.MorphsTemplate.xml"
-    template_file = open(template_path, "w")
-    template_file.write(template_text)
-    template_file.close()
+def clear_custom_templates():
+    """
+    Delete every Morphs template written by create_custom_template().  Scenes imported before
+    lose their grouped Morphs view until they are imported again.  Returns the removed files.
+    """
+    removed_files = []
+    if not os.path.exists(Definitions.AE_TEMPLATES_DIR):
+        return removed_files
+    for file_name in os.listdir(Definitions.AE_TEMPLATES_DIR):
+        if file_name.startswith("AEtransform.Morphs") and file_name.endswith("Template.xml"):
+            os.remove(Definitions.AE_TEMPLATES_DIR + "/" + file_name)
+            removed_files.append(file_name)
+    if removed_files:
+        mel.eval("refreshCustomTemplate")
+    return removed_files
+
+
+def add_template_dir_to_search_path():
+    """
+    Add the per-asset template folder to MAYA_CUSTOM_TEMPLATE_PATH.  Returns True if it was added.
+    Also run at Maya start up by userSetup.py, for the scenes saved with Morphs nodes.
+    """
+    search_path = os.environ.get("MAYA_CUSTOM_TEMPLATE_PATH", "")
+    if Definitions.AE_TEMPLATES_DIR in search_path.split(os.pathsep):
+        return False
+    if search_path == "":
+        os.environ["MAYA_CUSTOM_TEMPLATE_PATH"] = Definitions.AE_TEMPLATES_DIR
+    else:
+        os.environ["MAYA_CUSTOM_TEMPLATE_PATH"] = search_path + os.pathsep + Definitions.AE_TEMPLATES_DIR
+    return True
 
-    #cmds.refreshEditorTemplates()
-    mel.eval("refreshCustomTemplate")
+
+def create_custom_template(morph_links, controllers):
+    """
+    Create custom template to be used for morphList node.  The template file is only
+    written, and the editor templates only refreshed, when no file has the same content yet.
+    """
+    template_text = build_custom_template(morph_links, controllers)
+    template_hash = hashlib.md5(template_text.encode("utf-8")).hexdigest()
+    template_path = get_template_path(template_hash)
+
+    needs_refresh = add_template_dir_to_search_path()
+    if not os.path.exists(template_path):
+        if not os.path.exists(Definitions.AE_TEMPLATES_DIR):
+            os.makedirs(Definitions.AE_TEMPLATES_DIR)
+        with open(template_path, "w", encoding="utf-8", newline="\n") as template_file:
+            template_file.write(template_text)
+        needs_refresh = True
+
+    if needs_refresh:
+        #cmds.refreshEditorTemplates()
+        mel.eval("refreshCustomTemplate")
+
+
+def get_clean_target_name(blend_target):
+    """
+    Blend shape target name without the unenecessary parts
+    """
+    bs_fixed = blend_target.replace("head__eCTRL", "")
+    if (bs_fixed.find("__") > 1):
+        bs_split = bs_fixed.split("__")
+        bs_fixed = bs_fixed.replace(bs_split[0]+"__", "")
+    bs_fixed = bs_fixed.replace("headInner__", "")
+    bs_fixed = bs_fixed.replace("head_eCTRL", "")
+    bs_fixed = bs_fixed.replace("head__", "")
+    bs_fixed = bs_fixed.replace("head_", "")
+    bs_fixed = bs_fixed.replace("PHM", "")
+    bs_fixed = bs_fixed.replace("CTRL", "")
+    bs_fixed = bs_fixed.replace("QT1", "")
+    bs_fixed = bs_fixed.replace("Shape", "")
+    return bs_fixed
 
 
 def clean_morphs():
@@ -234,20 +399,11 @@ def clean_morphs():
     blendshapes = cmds.ls(type="blendShape")
     for blendShape in blendshapes:
         blend_target_list = cmds.listAttr(blendShape + '.w', m=True)
+        if blend_target_list is None:
+            continue
 
         for blend_target in blend_target_list:
-            bs_fixed = blend_target.replace("head__eCTRL", "")
-            if (bs_fixed.find("__") > 1):
-                bs_split = bs_fixed.split("__")
-                bs_fixed = bs_fixed.replace(bs_split[0]+"__", "")
-            bs_fixed = bs_fixed.replace("headInner__", "")
-            bs_fixed = bs_fixed.replace("head_eCTRL", "")
-            bs_fixed = bs_fixed.replace("head__", "")
-            bs_fixed = bs_fixed.replace("head_", "")
-            bs_fixed = bs_fixed.replace("PHM", "")
-            bs_fixed = bs_fixed.replace("CTRL", "")
-            bs_fixed = bs_fixed.replace("QT1", "")
-            bs_fixed = bs_fixed.replace("Shape", "")
+            bs_fixed = get_clean_target_name(blend_target)
 
             oldMorph = blendShape + "." + blend_target
             try:
@@ -255,3 +411,453 @@ def clean_morphs():
                 cmds.aliasAttr(bs_fixed, oldMorph)
             except:
                 pass
+
+
+def get_delta_cache_path(morph_node):
+    """
+    Delta cache file for the current asset, keyed by the hash of its Fbx file
+    """
+    global dtu_loader
+    asset_name = dtu_loader.get_asset_name()
+    fbx_path = dtu_loader.get_fbx_path()
+    if os.path.exists(fbx_path):
+        cache_key = blendshapes.get_file_hash(fbx_path)
+    else:
+        cache_key = cmds.ls(morph_node, uuid=True)[0]
+    asset_name_ns = re.sub(r"[^A-Za-z0-9_]", "_", asset_name)
+    return Definitions.MORPH_CACHE_DIR + "/" + asset_name_ns + "_" + cache_key + ".npz"
+
+
+def create_morph_catalog(morph_links):
+    """
+    Lazy version of create_morphs_node().  Joint-controlled morphs are connected as usual, every
+    other morph target is saved to a delta cache file, removed from its blendShape node and
+    recorded on the MorphCatalog node.  Use set_morph_active() to bring a morph back.
+    """
+    controllers = create_morph_controllers(morph_links)
+    morph_node = list(controllers.keys())[0].split("|")[0]
+    link_controller = {}
+    for controller, links in controllers.items():
+        for link in links:
+            link_controller[link] = controller
+
+    catalog = {}
+    delta_dict = {}
+    for blendshape in cmds.ls(type="blendShape"):
+        mesh = blendshapes.get_base_mesh(blendshape)
+        for target_index, blend_target in blendshapes.get_target_aliases(blendshape).items():
+            link = clean_name(blend_target)
+            if link not in morph_links.keys(): continue
+            dest = blendshape + "." + blend_target
+            if (create_autojcm(morph_links[link], dest)):
+                continue
+
+            target_name = get_clean_target_name(blend_target)
+            delta_dict[blendshapes.get_delta_key(mesh, target_name)] = blendshapes.read_target_deltas(blendshape, target_index)
+            blendshapes.remove_target(blendshape, target_index)
+
+            if link not in catalog:
+                catalog[link] = {
+                    "Label": morph_links[link]["Label"],
+                    "Minimum": morph_links[link]["Minimum"],
+                    "Maximum": morph_links[link]["Maximum"],
+                    "Controller": link_controller[link],
+                    "Active": False,
+                    "Targets": []
+                }
+            # the uuids survive the renames done after the import (e.g. scene_renamer)
+            catalog[link]["Targets"].append({"BlendShape": blendshape, "Mesh": mesh, "Target": target_name,
+                                             "BlendShapeUuid": cmds.ls(blendshape, uuid=True)[0]})
+
+    cache_path = get_delta_cache_path(morph_node)
+    blendshapes.save_delta_cache(cache_path, delta_dict)
+    loaded_delta_caches[cache_path] = delta_dict
+
+    catalog_node = cmds.createNode("network", n=morph_catalog_node)
+    cmds.addAttr(catalog_node, longName="cacheFile", dataType="string")
+    cmds.addAttr(catalog_node, longName="morphNode", dataType="string")
+    cmds.addAttr(catalog_node, longName="catalog", dataType="string")
+    cmds.setAttr(catalog_node + ".cacheFile", cache_path, type="string")
+    cmds.setAttr(catalog_node + ".morphNode", morph_node, type="string")
+    save_morph_catalog(catalog_node, catalog)
+    print("DazToMaya: " + str(len(catalog)) + " morphs recorded in " + catalog_node + ", delta cache: " + cache_path)
+
+    return controllers
+
+
+def find_morph_catalog(morph_node):
+    """
+    Return the MorphCatalog node belonging to a Morphs node, or None
+    """
+    for catalog_node in cmds.ls(type="network"):
+        if cmds.attributeQuery("morphNode", node=catalog_node, exists=True):
+            if cmds.getAttr(catalog_node + ".morphNode") == morph_node:
+                return catalog_node
+    return None
+
+
+def get_morph_nodes():
+    """
+    Morphs nodes of the scene: the ones recorded by a morph catalog, then the top level
+    transforms named Morphs, Morphs1...
+    """
+    morph_nodes = []
+    for catalog_node in cmds.ls(type="network"):
+        if cmds.attributeQuery("morphNode", node=catalog_node, exists=True):
+            morph_node = cmds.getAttr(catalog_node + ".morphNode")
+            if morph_node and cmds.objExists(morph_node) and morph_node not in morph_nodes:
+                morph_nodes.append(morph_node)
+    for node in cmds.ls(assemblies=True):
+        if re.match(r"^Morphs\d*$", node) and node not in morph_nodes:
+            morph_nodes.append(node)
+    return morph_nodes
+
+
+def resolve_morph_node(morph_node=None):
+    """
+    The Morphs node to work on when none is given: the one holding or driving the selection,
+    else the first one of the scene.  None if the scene has no Morphs node.
+    """
+    if morph_node is not None:
+        return morph_node
+    morph_nodes = get_morph_nodes()
+    if not morph_nodes:
+        return None
+    selection = cmds.ls(selection=True, long=True) or []
+    if selection:
+        selected_roots = set(node.split("|")[1] for node in selection if node.startswith("|"))
+        for node in morph_nodes:
+            if node in selected_roots:
+                return node
+        selected_blendshapes = set(cmds.ls(cmds.listHistory(selection) or [], type="blendShape"))
+        if selected_blendshapes:
+            for node in morph_nodes:
+                if selected_blendshapes.intersection(get_driven_blendshapes(node)):
+                    return node
+    return morph_nodes[0]
+
+
+def load_morph_catalog(catalog_node):
+    return json.loads(cmds.getAttr(catalog_node + ".catalog"))
+
+
+def save_morph_catalog(catalog_node, catalog):
+    cmds.setAttr(catalog_node + ".catalog", json.dumps(catalog), type="string")
+
+
+def get_catalog_deltas(catalog_node):
+    cache_path = cmds.getAttr(catalog_node + ".cacheFile")
+    if cache_path not in loaded_delta_caches:
+        loaded_delta_caches[cache_path] = blendshapes.load_delta_cache(cache_path)
+    return loaded_delta_caches[cache_path]
+
+
+def get_catalog_blendshape(target):
+    """
+    Current name of the blendShape node of a catalog target, found from its uuid
+    """
+    if "BlendShapeUuid" in target:
+        nodes = cmds.ls(target["BlendShapeUuid"])
+        if nodes:
+            return nodes[0]
+    return target["BlendShape"]
+
+
+def set_morph_active(link, active=True, morph_node=None):
+    """
+    Materialize (or remove) the blendShape targets and the Morphs control of a lazily imported
+    morph.  Without a morph_node, the Morphs node of the selection or the scene is used.
+    """
+    morph_node = resolve_morph_node(morph_node)
+    if morph_node is None:
+        print("DazToMaya ERROR: no Morphs node found in the scene")
+        return False
+    catalog_node = find_morph_catalog(morph_node)
+    if catalog_node is None:
+        print("DazToMaya ERROR: no morph catalog found for " + morph_node)
+        return False
+    catalog = load_morph_catalog(catalog_node)
+    if link not in catalog:
+        print("DazToMaya ERROR: morph " + link + " not found in " + catalog_node)
+        return False
+    entry = catalog[link]
+    if entry["Active"] == active:
+        return True
+
+    if active:
+        delta_dict = get_catalog_deltas(catalog_node)
+        source = add_morph_attr(entry["Controller"], entry["Label"], entry["Minimum"], entry["Maximum"])
+        for target in entry["Targets"]:
+            blendshape = get_catalog_blendshape(target)
+            vertex_indices, deltas = delta_dict[blendshapes.get_delta_key(target["Mesh"], target["Target"])]
+            target_index = blendshapes.add_target(blendshape, target["Target"], vertex_indices, deltas)
+            cmds.connectAttr(source, "%s.weight[%d]" % (blendshape, target_index))
+    else:
+        for target in entry["Targets"]:
+            blendshape = get_catalog_blendshape(target)
+            aliases = blendshapes.get_target_aliases(blendshape)
+            for target_index, target_name in aliases.items():
+                if target_name == target["Target"]:
+                    blendshapes.remove_target(blendshape, target_index)
+                    break
+        source = entry["Controller"] + "." + get_morph_attr_name(entry["Label"])
+        if cmds.objExists(source):
+            cmds.deleteAttr(source)
+
+    entry["Active"] = active
+    save_morph_catalog(catalog_node, catalog)
+    return True
+
+
+def remove_dead_morph_attrs(morph_node=None):
+    """
+    Remove the Morphs attributes that do not drive anything, e.g. links that never matched a
+    blendshape target.  Returns the list of removed attributes.
+    """
+    morph_node = resolve_morph_node(morph_node)
+    if morph_node is None:
+        return []
+    removed_attrs = []
+    for controller in get_morph_controllers(morph_node):
+        attrs = cmds.listAttr(controller, userDefined=True, keyable=True)
+        if attrs is None:
+            continue
+        for attr in attrs:
+            if cmds.listConnections(controller + "." + attr, source=False, destination=True) is None:
+                cmds.deleteAttr(controller + "." + attr)
+                removed_attrs.append(controller + "." + attr)
+    return removed_attrs
+
+
+def freeze_blendshape(blendshape, keep_jcm=False):
+    """
+    Bake the weighted targets of one blendShape node into its original shape and remove them,
+    deleting the node once it has no target left
+    """
+    envelope = cmds.getAttr(blendshape + ".envelope")
+    baked_targets = []
+    jcm_targets = []
+    for target_index in blendshapes.get_target_aliases(blendshape).keys():
+        if blendshapes.is_jcm_target(blendshape, target_index):
+            jcm_targets.append(target_index)
+        else:
+            baked_targets.append(target_index)
+
+    original_mesh = blendshapes.get_original_mesh(blendshape)
+    if original_mesh is not None:
+        points = blendshapes.get_mesh_points(original_mesh)
+        baked_count = 0
+        for target_index in baked_targets:
+            weight = cmds.getAttr("%s.weight[%d]" % (blendshape, target_index)) * envelope
+            if weight == 0:
+                continue
+            vertex_indices, deltas = blendshapes.read_target_deltas(blendshape, target_index)
+            points[vertex_indices] += weight * deltas
+            baked_count += 1
+        if baked_count > 0:
+            blendshapes.set_mesh_points(original_mesh, points)
+            print("DazToMaya: baked " + str(baked_count) + " morph targets of " + blendshape + " into " + original_mesh)
+
+    removed_targets = baked_targets
+    if not keep_jcm:
+        removed_targets = baked_targets + jcm_targets
+        jcm_nodes = []
+        for target_index in jcm_targets:
+            jcm_nodes += cmds.listConnections("%s.weight[%d]" % (blendshape, target_index), source=True, destination=False, type="setRange") or []
+        if jcm_nodes:
+            cmds.delete(jcm_nodes)
+    for target_index in removed_targets:
+        blendshapes.remove_target(blendshape, target_index)
+    if len(removed_targets) == len(baked_targets) + len(jcm_targets):
+        cmds.delete(blendshape)
+
+
+def freeze_morphs(keep_jcm=False, morph_node=None):
+    """
+    Bake the current morph weights into the base meshes for static deliveries.  Every target
+    that is not joint-controlled is evaluated into the original shape points and removed, then
+    the Morphs driver network is deleted.  JCM targets are kept only if keep_jcm is set.
+    The whole freeze is one undo step.
+    """
+    if not blendshapes.has_numpy("Freeze Morphs"):
+        return False
+    morph_node = resolve_morph_node(morph_node)
+    if morph_node is None:
+        print("DazToMaya ERROR: no Morphs node found in the scene")
+        return False
+
+    cmds.undoInfo(openChunk=True, chunkName="DazToMaya Freeze Morphs")
+    try:
+        for blendshape in get_driven_blendshapes(morph_node):
+            freeze_blendshape(blendshape, keep_jcm)
+        catalog_node = find_morph_catalog(morph_node)
+        if catalog_node is not None:
+            cmds.delete(catalog_node)
+        if cmds.objExists(morph_node):
+            cmds.delete(morph_node)
+    finally:
+        cmds.undoInfo(closeChunk=True)
+    return True
+
+
+def freeze_morphs_dialog():
+    """
+    Ask whether joint-controlled morphs should be kept, then freeze the morphs
+    """
+    morph_node = resolve_morph_node()
+    if morph_node is None:
+        cmds.confirmDialog(title="DazToMaya", message="No Morphs node found in the scene.", button=["Ok"])
+        return
+    message = "Bake the current morph values into the meshes and delete the " + morph_node + " controls?"
+    result = cmds.confirmDialog(title="DazToMaya: Freeze Morphs", message=message,
+                                button=["Freeze", "Freeze, keep JCMs", "Cancel"],
+                                defaultButton="Freeze", cancelButton="Cancel", dismissString="Cancel")
+    if result == "Cancel":
+        return
+    freeze_morphs(keep_jcm=(result == "Freeze, keep JCMs"), morph_node=morph_node)
+
+
+def get_morph_controllers(morph_node):
+    """
+    Return the Morphs node and any controller nodes parented under it
+    """
+    if not cmds.objExists(morph_node):
+        return []
+    controllers = [morph_node]
+    children = cmds.listRelatives(morph_node, children=True, type="transform", fullPath=True)
+    if children:
+        controllers += children
+    return controllers
+
+
+def get_driven_blendshapes(morph_node):
+    """
+    Return the blendShape nodes with weights driven from the Morphs node or its controllers,
+    plus the ones holding the targets of its morph catalog
+    """
+    driven_blendshapes = []
+    controllers = get_morph_controllers(morph_node)
+    if controllers:
+        history = cmds.listHistory(controllers, future=True) or []
+        driven_blendshapes = cmds.ls(history, type="blendShape")
+    catalog_node = find_morph_catalog(morph_node)
+    if catalog_node is not None:
+        for entry in load_morph_catalog(catalog_node).values():
+            for target in entry["Targets"]:
+                blendshape = get_catalog_blendshape(target)
+                if blendshape not in driven_blendshapes and cmds.objExists(blendshape):
+                    driven_blendshapes.append(blendshape)
+    return driven_blendshapes
+
+
+class MorphPanel(object):
+    """
+    Searchable Morph Controls window.  Only the morphs matching the filter, one page at a
+    time, get a slider widget, so the window stays responsive with thousands of morphs.
+    Morphs of a lazy import that are not active yet get a checkbox to enable them.
+    """
+    morph_panel_window_name = "DazToMayaMorphPanel3"
+    morph_node = None
+    morph_attrs = []
+    filtered_attrs = []
+    page = 0
+
+    def __init__(self, morph_node):
+        self.morph_node = morph_node
+        self.load_morph_attrs()
+        self.page = 0
+
+        if cmds.window(self.morph_panel_window_name, exists=True):
+            cmds.deleteUI(self.morph_panel_window_name)
+        cmds.window(self.morph_panel_window_name, title="DazToMaya: Morph Controls", widthHeight=(420, 600))
+        self.form = cmds.formLayout()
+        self.filter_field = cmds.textFieldGrp(label="Search:", columnWidth2=(50, 350), textChangedCommand=lambda *args: self.set_filter())
+        self.page_row = cmds.rowLayout(numberOfColumns=3, columnWidth3=(60, 280, 60))
+        cmds.button(label="< Prev", c=lambda *args: self.set_page(self.page - 1))
+        self.page_text = cmds.text(label="", align="center", width=280)
+        cmds.button(label="Next >", c=lambda *args: self.set_page(self.page + 1))
+        cmds.setParent('..')
+        self.scroll = cmds.scrollLayout(childResizable=True)
+        self.column = cmds.columnLayout(adjustableColumn=True)
+        cmds.setParent(self.form)
+        cmds.formLayout(self.form, edit=True,
+                        attachForm=[(self.filter_field, "top", 5), (self.filter_field, "left", 5),
+                                    (self.page_row, "left", 5), (self.scroll, "left", 5),
+                                    (self.scroll, "right", 5), (self.scroll, "bottom", 5)],
+                        attachControl=[(self.page_row, "top", 5, self.filter_field),
+                                       (self.scroll, "top", 5, self.page_row)])
+
+    def load_morph_attrs(self):
+        """
+        List of (controller, attribute name, inactive catalog link or None), sorted by attribute name
+        """
+        self.morph_attrs = []
+        for controller in get_morph_controllers(self.morph_node):
+            attrs = cmds.listAttr(controller, userDefined=True, keyable=True)
+            if attrs:
+                self.morph_attrs += [(controller, attr, None) for attr in attrs]
+        catalog_node = find_morph_catalog(self.morph_node)
+        if catalog_node is not None:
+            for link, entry in load_morph_catalog(catalog_node).items():
+                if not entry["Active"]:
+                    self.morph_attrs.append((entry["Controller"], get_morph_attr_name(entry["Label"]), link))
+        self.morph_attrs.sort(key=lambda x: x[1].lower())
+        self.filtered_attrs = self.morph_attrs
+
+    def show(self):
+        self.build_page()
+        cmds.showWindow(self.morph_panel_window_name)
+
+    def set_filter(self):
+        search_text = cmds.textFieldGrp(self.filter_field, query=True, text=True)
+        search_text = search_text.replace(" ", "").lower()
+        self.filtered_attrs = [x for x in self.morph_attrs if search_text in x[1].lower()]
+        self.page = 0
+        self.build_page()
+
+    def activate_morph(self, link):
+        cmds.waitCursor(state=True)
+        try:
+            set_morph_active(link, True, self.morph_node)
+        finally:
+            cmds.waitCursor(state=False)
+        page = self.page
+        self.load_morph_attrs()
+        self.set_filter()
+        self.set_page(page)
+
+    def set_page(self, page):
+        page_count = max(1, int(math.ceil(len(self.filtered_attrs) / float(morph_panel_page_size))))
+        self.page = min(max(page, 0), page_count - 1)
+        self.build_page()
+
+    def build_page(self):
+        children = cmds.columnLayout(self.column, query=True, childArray=True)
+        if children:
+            cmds.deleteUI(children)
+        page_start = self.page * morph_panel_page_size
+        page_attrs = self.filtered_attrs[page_start:page_start + morph_panel_page_size]
+        cmds.setParent(self.column)
+        for controller, attr, link in page_attrs:
+            if link is None:
+                cmds.attrFieldSliderGrp(attribute=controller + "." + attr, columnWidth=(1, 150))
+            else:
+                cmds.checkBox(label=attr + " (not loaded)", value=False,
+                              changeCommand=lambda value, link=link: self.activate_morph(link))
+        page_count = max(1, int(math.ceil(len(self.filtered_attrs) / float(morph_panel_page_size))))
+        label = "Page " + str(self.page + 1) + " of " + str(page_count) + "  (" + str(len(self.filtered_attrs)) + " morphs)"
+        cmds.text(self.page_text, edit=True, label=label)
+
+
+def open_morph_panel(morph_node=None):
+    """
+    Open the searchable Morph Controls window for the given Morphs node, else for the one of
+    the selection or the scene
+    """
+    morph_node = resolve_morph_node(morph_node)
+    if morph_node is None or not cmds.objExists(morph_node):
+        cmds.confirmDialog(title="DazToMaya", message="No Morphs node found in the scene.", button=["Ok"])
+        return None
+    morph_panel = MorphPanel(morph_node)
+    morph_panel.show()
+    return morph_panel
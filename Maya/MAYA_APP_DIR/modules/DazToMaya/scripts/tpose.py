@@ -0,0 +1,194 @@
+import math
+
+import maya.cmds as cmds
+import maya.mel as mel
+import maya.api.OpenMaya as om2
+
+try:
+    import numpy as np
+except Exception as e:
+    print("DazToMaya WARNING: numpy could not be loaded, the T-pose will use the generation presets: " + str(e))
+    np = None
+
+# Bones whose head is within this fraction of the figure height from the center line are
+# on the spine, the others belong to a side (arms, legs)
+center_tolerance_ratio = 0.01
+
+# Daz rotation order -> twist axis (the first axis) as a unit vector of the oriented bone frame
+TWIST_AXES = {"X": (1, 0, 0), "Y": (0, 1, 0), "Z": (0, 0, 1)}
+EULER_ORDERS = {
+    "XYZ": om2.MEulerRotation.kXYZ, "YZX": om2.MEulerRotation.kYZX, "ZXY": om2.MEulerRotation.kZXY,
+    "XZY": om2.MEulerRotation.kXZY, "YXZ": om2.MEulerRotation.kYXZ, "ZYX": om2.MEulerRotation.kZYX,
+}
+
+
+def has_head_tail_data(dtu_loader):
+    if dtu_loader is None:
+        return False
+    try:
+        return len(dtu_loader.get_bone_head_tail_dict().keys()) > 0
+    except Exception:
+        return False
+
+
+def get_bone_data(head_tail_dict, joint_names):
+    """
+    Heads, unit directions and lengths of the bones as numpy arrays, from the HeadTailData
+    entries [head x, head y, head z, tail x, tail y, tail z]
+    """
+    data = np.array([head_tail_dict[name][0:6] for name in joint_names], dtype=np.float64).reshape(-1, 6)
+    heads = data[:, 0:3]
+    vectors = data[:, 3:6] - heads
+    lengths = np.linalg.norm(vectors, axis=1)
+    directions = vectors / np.maximum(lengths, 1e-8)[:, np.newaxis]
+    return heads, directions, lengths
+
+
+def get_joint_orientations(dtu_loader, joint_names):
+    """
+    Joint -> (rotation order, MQuaternion of the oriented bone frame) from the DTU JointOrientation
+    entries [rotation order, orient x, orient y, orient z] (degrees), joints without data are left out
+    """
+    try:
+        orientation_dict = dtu_loader.get_joint_orientation_dict()
+    except Exception:
+        return {}
+    orientations = {}
+    for name in joint_names:
+        entry = orientation_dict.get(name)
+        if entry is None:
+            continue
+        orders = [value for value in entry if isinstance(value, str) and value.upper() in EULER_ORDERS]
+        angles = [float(value) for value in entry if not isinstance(value, str)]
+        if len(orders) == 0 or len(angles) < 3:
+            continue
+        order = orders[0].upper()
+        euler = om2.MEulerRotation([math.radians(angle) for angle in angles[0:3]], EULER_ORDERS[order])
+        orientations[name] = (order, euler.asQuaternion())
+    return orientations
+
+
+def get_chain_targets(joints, short_names, heads, directions, orientations):
+    """
+    Joint -> T-pose direction of its twist axis for the bones of the limb chains.  Off-center
+    bones twisting around X below a bone of the same kind (the arms from the upper arm down,
+    past the clavicle) go along their side axis, off-center bones twisting around Y and
+    pointing down (the legs) go along -Y.
+    """
+    height = max(heads[:, 1].max() - heads[:, 1].min(), 1e-8)
+    offsets = heads[:, 0] - np.median(heads[:, 0])
+    sides = np.sign(offsets)
+    off_center = np.abs(offsets) > height * center_tolerance_ratio
+
+    lateral_joints = set()
+    for i, joint in enumerate(joints):
+        if off_center[i] and short_names[i] in orientations and orientations[short_names[i]][0][0] == "X":
+            lateral_joints.add(joint)
+
+    targets = {}
+    for i, joint in enumerate(joints):
+        if not off_center[i] or short_names[i] not in orientations:
+            continue
+        twist = orientations[short_names[i]][0][0]
+        if twist == "X" and joint.rsplit("|", 1)[0] in lateral_joints:
+            targets[joint] = om2.MVector(float(sides[i]), 0, 0)
+        elif twist == "Y" and directions[i][1] < 0:
+            targets[joint] = om2.MVector(0, -1, 0)
+    return targets
+
+
+def get_twist_direction(orientation, bone_direction):
+    """
+    World direction of the twist axis of an oriented bone frame, pointing from head to tail
+    """
+    order, rotation = orientation
+    twist = om2.MVector(*TWIST_AXES[order[0]]).rotateBy(rotation)
+    if twist * om2.MVector(*bone_direction) < 0:
+        twist = -twist
+    return twist
+
+
+def get_world_matrix(joint):
+    selection = om2.MSelectionList()
+    selection.add(joint)
+    return selection.getDagPath(0).inclusiveMatrix()
+
+
+def get_skeleton_joints(root_joint=""):
+    """
+    Long names of the joints under root_joint, root included, or of every joint if it is not set
+    """
+    if root_joint == "":
+        return cmds.ls(type="joint", long=True) or []
+    joints = []
+    for root in cmds.ls(root_joint, type="joint", long=True) or []:
+        joints.append(root)
+        joints += cmds.listRelatives(root, allDescendents=True, type="joint", fullPath=True) or []
+    return joints
+
+
+def get_parent_joint(joint, joint_set):
+    """
+    Nearest ancestor of a joint (long name) in joint_set, or None
+    """
+    path = joint.rsplit("|", 1)[0]
+    while path != "":
+        if path in joint_set:
+            return path
+        path = path.rsplit("|", 1)[0]
+    return None
+
+
+def apply_dtu_t_pose(dtu_loader, root_joint=""):
+    """
+    Put the figure in T-pose from the DTU data.  The twist axis of each limb bone comes from its
+    JointOrientation, taken to the bind pose direction of the HeadTailData, and is turned onto
+    the side axis (arms) or -Y (legs) on top of the turns of its parents.  The turns are sent as
+    relative world space rotations, parents first, in one mel call, so the rest of each chain
+    follows.  Only the joints under root_joint are posed when it is set.  Returns False if the
+    data or numpy is missing.
+    """
+    if np is None or not has_head_tail_data(dtu_loader):
+        return False
+    head_tail_dict = dtu_loader.get_bone_head_tail_dict()
+
+    # parents before children
+    joints = get_skeleton_joints(root_joint)
+    joints = sorted(joints, key=lambda x: x.count("|"))
+    joints = [joint for joint in joints if joint.split("|")[-1] in head_tail_dict]
+    if len(joints) == 0:
+        return False
+    short_names = [joint.split("|")[-1] for joint in joints]
+    orientations = get_joint_orientations(dtu_loader, short_names)
+    if len(orientations) == 0:
+        return False
+
+    heads, directions, lengths = get_bone_data(head_tail_dict, short_names)
+    targets = get_chain_targets(joints, short_names, heads, directions, orientations)
+
+    # world space turn of every joint so far, its own and the one inherited from its parents
+    joint_set = set(joints)
+    accumulated = {}
+    rotate_cmds = []
+    for i, joint in enumerate(joints):
+        parent = get_parent_joint(joint, joint_set)
+        parent_rotation = accumulated.get(parent, om2.MQuaternion())
+        accumulated[joint] = parent_rotation
+        if joint not in targets:
+            continue
+        current = get_twist_direction(orientations[short_names[i]], directions[i]).rotateBy(parent_rotation)
+        delta = om2.MQuaternion(current, targets[joint])
+        accumulated[joint] = parent_rotation * delta
+        euler = delta.asEulerRotation()
+        # X, then Y, then Z about the world axes, the order of a kXYZ euler rotation
+        for axis, angle in enumerate((euler.x, euler.y, euler.z)):
+            if abs(angle) < 1e-8:
+                continue
+            values = ["0", "0", "0"]
+            values[axis] = repr(math.degrees(angle))
+            rotate_cmds.append('rotate -r -ws %s "%s";' % (" ".join(values), joint))
+
+    if rotate_cmds:
+        mel.eval("\n".join(rotate_cmds))
+    print("DazToMaya: T-pose from DTU data turned " + str(len(targets)) + " limb joints.")
+    return True
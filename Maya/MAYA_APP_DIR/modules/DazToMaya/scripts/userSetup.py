@@ -0,0 +1,25 @@
+"""
+DazToMaya start up: register the Morphs Attribute Editor templates folder, so the Morphs nodes of
+saved scenes get their grouped view before anything is imported in the session, and watch the
+HIK panel for the control rigs left pending in opened scenes
+"""
+import maya.cmds as cmds
+
+try:
+    import morphs
+    morphs.add_template_dir_to_search_path()
+except Exception as e:
+    print("DazToMaya WARNING: unable to register the Morphs AE templates folder: " + str(e))
+
+
+def watch_pending_control_rigs():
+    try:
+        if cmds.ls("*.dazToMayaPendingControlRig", recursive=True):
+            import d2m
+            d2m.watch_hik_panel()
+    except Exception as e:
+        print("DazToMaya WARNING: unable to watch the HIK panel: " + str(e))
+
+
+if not cmds.about(batch=True):
+    cmds.scriptJob(event=["SceneOpened", watch_pending_control_rigs])